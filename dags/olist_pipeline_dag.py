@@ -1,60 +1,48 @@
 import sys
-import os
+from datetime import datetime, timedelta
+
+from airflow import DAG
+from airflow.operators.python import PythonOperator
 
 # Añadimos la ruta contenedora de 'src' al sys.path
 parent_path = '/opt/airflow'
 if parent_path not in sys.path:
     sys.path.append(parent_path)
 
-# Depuración: imprimir el sys.path y el contenido de la carpeta src
-print("sys.path:", sys.path)
-print("Contenido de /opt/airflow/src:", os.listdir('/opt/airflow/src'))
+# El scheduler vuelve a leer este archivo cada pocos segundos, así que leerlo solo debe
+# importar Airflow: "src" es una fachada perezosa y src.config solo usa la librería
+# estándar. pandas, SQLAlchemy y las librerías de gráficos se importan dentro de las
+# tareas, y ninguna tarea toca la base de datos ni el disco hasta ejecutarse.
+import src
+from src.config import get_csv_to_table_mapping, get_query_tables, get_summary_tables
 
-# Verificamos que __init__.py existe en la carpeta src
-if '__init__.py' not in os.listdir('/opt/airflow/src'):
-    raise FileNotFoundError("El archivo __init__.py no existe en /opt/airflow/src")
+# Tabla de días festivos, cargada por su propia tarea (ver src.pipeline.extract_load_holidays)
+HOLIDAYS_TABLE = 'public_holidays'
 
-# Ahora podemos importar desde el paquete src
-from src import something
 
-from datetime import datetime, timedelta
-from airflow import DAG
-from airflow.operators.python import PythonOperator
-from pathlib import Path
-import matplotlib
-
-# Configuramos backend no interactivo para matplotlib
-matplotlib.use('Agg')
-
-try:
-    from sqlalchemy import create_engine
-    from src.config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, SQLITE_BD_ABSOLUTE_PATH, get_csv_to_table_mapping
-    from src.extract import extract
-    from src.load import load
-    from src.transform import run_queries
-    from src.plots import (
-        plot_freight_value_weight_relationship,
-        plot_global_amount_order_status,
-        plot_real_vs_predicted_delivered_time,
-        plot_revenue_by_month_year,
-        plot_revenue_per_state,
-        plot_top_10_least_revenue_categories,
-        plot_top_10_revenue_categories,
-        plot_top_10_revenue_categories_ammount,
-        plot_delivery_date_difference,
-        plot_order_amount_per_day_with_holidays,
-    )
-except Exception as e:
-    print(f"Error al importar módulos: {e}")
-    raise
+def extract_load_table(table_name, csv_file, **context):
+    return src.extract_load_table(table_name, csv_file)
+
+
+def extract_load_holidays(**context):
+    return src.extract_load_holidays()
+
+
+def refresh_summary(summary_name, **context):
+    return src.refresh_summary(summary_name)
+
 
-# Creamos la base de datos SQLite si no existe
-db_path = Path(SQLITE_BD_ABSOLUTE_PATH)
-db_path.parent.mkdir(parents=True, exist_ok=True)
-db_path.touch(exist_ok=True)
+def run_query(query_name, **context):
+    return src.run_query(query_name, context['run_id'])
+
+
+def generate_plots(query_names, **context):
+    manifest = {
+        query_name: context['task_instance'].xcom_pull(task_ids=f'query_{query_name}')
+        for query_name in query_names
+    }
+    return src.render_query_results(manifest, context['run_id'])
 
-# Creamos la conexión a la base de datos
-ENGINE = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}", echo=False)
 
 # Definimos los argumentos por defecto del DAG
 default_args = {
@@ -76,63 +64,57 @@ with DAG(
     catchup=False,
 ) as dag:
 
-    # Tarea 1: Extraer datos
-    def extract_data():
-        csv_folder = DATASET_ROOT_PATH
-        public_holidays_url = PUBLIC_HOLIDAYS_URL
-        csv_table_mapping = get_csv_to_table_mapping()
-        dataframes = extract(csv_folder, csv_table_mapping, public_holidays_url)
-        return dataframes
-
-    extract_task = PythonOperator(
-        task_id='extract_data',
-        python_callable=extract_data,
-    )
-
-    # Tarea 2: Cargar datos en la base de datos
-    def load_data(**context):
-        dataframes = context['task_instance'].xcom_pull(task_ids='extract_data')
-        load(data_frames=dataframes, database=ENGINE)
-
-    load_task = PythonOperator(
-        task_id='load_data',
-        python_callable=load_data,
-        provide_context=True,
-    )
-
-    # Tarea 3: Transformar datos
-    def transform_data():
-        query_results = run_queries(database=ENGINE)
-        return query_results
-
-    transform_task = PythonOperator(
-        task_id='transform_data',
-        python_callable=transform_data,
+    # Cada tabla, resumen y consulta es una tarea propia: las tablas independientes se
+    # cargan en paralelo, cada consulta espera solo a las tablas que lee y una tarea que
+    # falla se reintenta sola. Las consultas intercambian por XCom solo el manifiesto
+    # (ruta y tamaño) de su resultado, que se guarda como archivo Arrow de la ejecución.
+    # Las tareas se generan al leer el DAG (y no con .expand()) porque las dependencias
+    # de cada consulta apuntan a tablas concretas.
+
+    # Tareas 1: extraer y cargar cada archivo CSV en su tabla
+    table_tasks = {}
+    for csv_file, table_name in get_csv_to_table_mapping().items():
+        table_tasks[table_name] = PythonOperator(
+            task_id=f'extract_load_{table_name}',
+            python_callable=extract_load_table,
+            op_kwargs={'table_name': table_name, 'csv_file': csv_file},
+        )
+
+    # Tarea 2: descargar y cargar los días festivos de los años presentes en los pedidos
+    table_tasks[HOLIDAYS_TABLE] = PythonOperator(
+        task_id=f'extract_load_{HOLIDAYS_TABLE}',
+        python_callable=extract_load_holidays,
     )
-
-    # Tarea 4: Generar gráficos
-    def generate_plots(**context):
-        query_results = context['task_instance'].xcom_pull(task_ids='transform_data')
-        
-        plot_revenue_by_month_year(query_results['revenue_by_month_year'], 2017)
-        plot_real_vs_predicted_delivered_time(query_results['real_vs_estimated_delivered_time'], 2017)
-        plot_global_amount_order_status(query_results['global_ammount_order_status'])
-        plot_revenue_per_state(query_results['revenue_per_state'])
-        plot_top_10_least_revenue_categories(query_results['top_10_least_revenue_categories'])
-        plot_top_10_revenue_categories(query_results['top_10_revenue_categories'])
-        plot_top_10_revenue_categories_ammount(query_results['top_10_revenue_categories'])
-        plot_freight_value_weight_relationship(query_results['get_freight_value_weight_relationship'])
-        plot_delivery_date_difference(query_results['delivery_date_difference'])
-        plot_order_amount_per_day_with_holidays(query_results['orders_per_day_and_holidays_2017'])
-
+    table_tasks['olist_orders'] >> table_tasks[HOLIDAYS_TABLE]
+
+    # Tareas 3: reconstruir cada tabla de resumen apenas se cargan sus tablas de origen
+    # (get_summary_tables() las declara en orden de dependencia)
+    for summary_name, (_, sources) in get_summary_tables().items():
+        table_tasks[summary_name] = PythonOperator(
+            task_id=f'refresh_{summary_name}',
+            python_callable=refresh_summary,
+            op_kwargs={'summary_name': summary_name},
+        )
+        [table_tasks[source] for source in sources] >> table_tasks[summary_name]
+
+    # Tareas 4: ejecutar cada consulta cuando sus tablas están listas
+    query_tasks = {}
+    for query_name, tables in get_query_tables().items():
+        query_tasks[query_name] = PythonOperator(
+            task_id=f'query_{query_name}',
+            python_callable=run_query,
+            op_kwargs={'query_name': query_name},
+            provide_context=True,
+        )
+        [table_tasks[table] for table in tables] >> query_tasks[query_name]
+
+    # Tarea 5: generar los gráficos en PLOTS_ROOT_PATH en procesos paralelos; los gráficos
+    # cuyos datos no cambiaron desde la última ejecución no se vuelven a generar
     plot_task = PythonOperator(
         task_id='generate_plots',
         python_callable=generate_plots,
+        op_kwargs={'query_names': list(query_tasks)},
         provide_context=True,
     )
 
-    # Definimos el orden de ejecución de las tareas
-    extract_task >> load_task >> transform_task >> plot_task
-
-# Imprimimos el valor importado de something
-print("Valor de something:", something)
+    list(query_tasks.values()) >> plot_task
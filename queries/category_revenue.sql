@@ -0,0 +1,23 @@
+SELECT
+    Category,
+    Num_order,
+    Revenue
+FROM (
+    SELECT
+        category AS Category,
+        order_count AS Num_order,
+        CASE WHEN :allocated THEN revenue ELSE item_revenue END AS Revenue
+    FROM
+        summary_category_revenue
+)
+ORDER BY
+    CASE WHEN :ascending THEN Revenue ELSE -Revenue END,
+    Category
+LIMIT :n;
+
+
+-- Esta consulta devolverá las :n categorías con mayores ingresos (o con menores, si
+-- :ascending = 1), con las columnas Category, Num_order y Revenue.
+-- Con :allocated = 1 los pagos de cada pedido se reparten entre sus categorías según el
+-- precio de sus ítems; con 0 cuentan una vez por ítem, como en los resultados históricos
+-- de top_10_revenue_categories y top_10_least_revenue_categories.
@@ -0,0 +1,54 @@
+WITH order_categories AS (
+    SELECT
+        i.order_id,
+        t.product_category_name_english AS category,
+        COUNT(*) AS item_count,
+        SUM(COALESCE(CAST(i.price AS DOUBLE), 0)) AS item_price
+    FROM olist_order_items i
+    JOIN olist_orders o ON o.order_id = i.order_id
+    JOIN olist_products pr ON pr.product_id = i.product_id
+    JOIN product_category_name_translation t ON t.product_category_name = pr.product_category_name
+    WHERE o.order_status = 'delivered'
+      AND o.order_delivered_customer_date IS NOT NULL
+    GROUP BY i.order_id, t.product_category_name_english
+),
+order_category_shares AS (
+    SELECT
+        *,
+        CASE
+            WHEN SUM(item_price) OVER (PARTITION BY order_id) > 0
+                THEN item_price / SUM(item_price) OVER (PARTITION BY order_id)
+            ELSE item_count / SUM(item_count) OVER (PARTITION BY order_id)
+        END AS revenue_share
+    FROM order_categories
+),
+order_payments AS (
+    SELECT order_id, SUM(CAST(payment_value AS DOUBLE)) AS payment_total
+    FROM olist_order_payments
+    GROUP BY order_id
+),
+category_revenue AS (
+    SELECT
+        oc.category AS Category,
+        COUNT(*) AS Num_order,
+        CASE
+            WHEN $allocated THEN SUM(oc.revenue_share * op.payment_total)
+            ELSE SUM(oc.item_count * op.payment_total)
+        END AS Revenue
+    FROM order_category_shares oc
+    JOIN order_payments op ON op.order_id = oc.order_id
+    GROUP BY oc.category
+)
+SELECT
+    Category,
+    Num_order,
+    Revenue
+FROM category_revenue
+ORDER BY
+    CASE WHEN $ascending THEN Revenue ELSE -Revenue END,
+    Category
+LIMIT $n;
+
+
+-- Versión DuckDB de queries/category_revenue.sql, calculada directamente sobre las tablas
+-- de origen en lugar de summary_category_revenue.
@@ -0,0 +1,17 @@
+SELECT
+    c.customer_state AS State,
+    CAST(trunc(AVG(
+        (epoch(o.order_estimated_delivery_date) -
+         epoch(date_trunc('day', o.order_delivered_customer_date))) / 86400.0
+    )) AS BIGINT) AS Delivery_Difference
+FROM olist_orders o
+JOIN olist_customers c
+    ON o.customer_id = c.customer_id
+WHERE o.order_status = 'delivered'
+  AND o.order_delivered_customer_date IS NOT NULL
+GROUP BY c.customer_state
+ORDER BY Delivery_Difference, State;
+
+
+-- Versión DuckDB de queries/delivery_date_difference.sql. CAST redondea en DuckDB, por
+-- lo que se trunca con trunc() como hace CAST(... AS INTEGER) en SQLite.
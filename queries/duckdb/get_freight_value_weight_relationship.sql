@@ -0,0 +1,20 @@
+SELECT
+    i.order_id,
+    COALESCE(SUM(CAST(i.freight_value AS DOUBLE)), 0.0) AS freight_value,
+    COALESCE(SUM(CAST(p.product_weight_g AS DOUBLE)), 0.0) AS product_weight_g
+FROM
+    olist_order_items i
+JOIN
+    olist_orders o ON i.order_id = o.order_id
+JOIN
+    olist_products p ON i.product_id = p.product_id
+WHERE
+    o.order_status = 'delivered'
+GROUP BY
+    i.order_id
+ORDER BY
+    i.order_id;
+
+
+-- Versión DuckDB de queries/get_freight_value_weight_relationship.sql. COALESCE(SUM(...),
+-- 0.0) equivale a TOTAL() de SQLite.
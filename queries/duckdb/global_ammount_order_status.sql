@@ -0,0 +1,13 @@
+SELECT
+    order_status,
+    COUNT(*) AS Ammount
+FROM
+    olist_orders
+GROUP BY
+    order_status
+ORDER BY
+    order_status;
+
+
+-- Versión DuckDB de queries/global_ammount_order_status.sql. DuckDB agrupa con tablas
+-- hash, así que se ordena explícitamente como lo hace SQLite al agrupar.
@@ -0,0 +1,24 @@
+WITH holidays AS (
+    SELECT DISTINCT CAST(date AS DATE) AS holiday_date
+    FROM public_holidays
+),
+daily_orders AS (
+    SELECT
+        CAST(order_purchase_timestamp AS DATE) AS purchase_date,
+        COUNT(*) AS order_count
+    FROM olist_orders
+    WHERE year(order_purchase_timestamp) BETWEEN $start_year AND $end_year
+    GROUP BY purchase_date
+)
+SELECT
+    d.order_count,
+    year(d.purchase_date) AS year,
+    month(d.purchase_date) AS month,
+    day(d.purchase_date) AS day,
+    h.holiday_date IS NOT NULL AS holiday
+FROM daily_orders d
+LEFT JOIN holidays h ON h.holiday_date = d.purchase_date
+ORDER BY d.purchase_date;
+
+
+-- Versión DuckDB de queries/orders_per_day_and_holidays.sql.
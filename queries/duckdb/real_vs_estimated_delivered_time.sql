@@ -0,0 +1,14 @@
+SELECT
+    year(order_purchase_timestamp) AS year,
+    month(order_purchase_timestamp) AS month,
+    AVG((epoch(order_delivered_customer_date) - epoch(order_purchase_timestamp)) / 86400.0) AS real_time,
+    AVG((epoch(order_estimated_delivery_date) - epoch(order_purchase_timestamp)) / 86400.0) AS estimated_time
+FROM olist_orders
+WHERE order_status = 'delivered'
+  AND order_delivered_customer_date IS NOT NULL
+  AND order_purchase_timestamp IS NOT NULL
+GROUP BY year, month
+ORDER BY year, month;
+
+
+-- Versión DuckDB de queries/real_vs_estimated_delivered_time.sql (formato largo).
@@ -0,0 +1,23 @@
+WITH order_income AS (
+    SELECT
+        year(o.order_delivered_customer_date) AS year,
+        month(o.order_delivered_customer_date) AS month,
+        MIN(CAST(p.payment_value AS DOUBLE)) AS payment_value
+    FROM olist_orders o
+    JOIN olist_order_payments p
+        ON o.order_id = p.order_id
+    WHERE o.order_delivered_customer_date IS NOT NULL
+      AND o.order_status = 'delivered'
+    GROUP BY o.order_id, o.order_delivered_customer_date
+)
+SELECT
+    year,
+    month,
+    SUM(payment_value) AS Revenue
+FROM order_income
+GROUP BY year, month
+ORDER BY year, month;
+
+
+-- Versión DuckDB de queries/revenue_by_month_year.sql: formato largo (year, month,
+-- Revenue) con el menor pago de cada pedido, igual que summary_orders.payment_value.
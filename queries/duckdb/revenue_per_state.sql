@@ -0,0 +1,20 @@
+SELECT
+    c.customer_state AS customer_state,
+    SUM(CAST(p.payment_value AS DOUBLE)) AS Revenue
+FROM
+    olist_orders o
+JOIN
+    olist_customers c ON o.customer_id = c.customer_id
+JOIN
+    olist_order_payments p ON o.order_id = p.order_id
+WHERE
+    o.order_status = 'delivered'
+    AND o.order_delivered_customer_date IS NOT NULL
+GROUP BY
+    c.customer_state
+ORDER BY
+    Revenue DESC
+LIMIT 10;
+
+
+-- Versión DuckDB de queries/revenue_per_state.sql.
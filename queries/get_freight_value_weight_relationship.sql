@@ -0,0 +1,23 @@
+SELECT
+    i.order_id,
+    TOTAL(i.freight_value) AS freight_value,
+    TOTAL(p.product_weight_g) AS product_weight_g
+FROM
+    olist_order_items i
+JOIN
+    olist_orders o ON i.order_id = o.order_id
+JOIN
+    olist_products p ON i.product_id = p.product_id
+WHERE
+    o.order_status = 'delivered'
+GROUP BY
+    i.order_id
+ORDER BY
+    i.order_id;
+
+
+-- Esta consulta devolverá una tabla con tres columnas: order_id, freight_value y
+-- product_weight_g. Para cada pedido con estado 'delivered' se suman el valor del
+-- flete y el peso de todos sus productos.
+-- TOTAL() devuelve 0.0 en lugar de NULL cuando todos los valores son nulos, igual
+-- que la suma de pandas.
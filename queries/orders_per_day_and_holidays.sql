@@ -0,0 +1,24 @@
+WITH holidays AS (
+    SELECT DISTINCT date_year * 10000 + date_month * 100 + date_day AS holiday_day
+    FROM public_holidays
+)
+SELECT
+    d.order_count,
+    d.purchase_day / 10000 AS year,
+    d.purchase_day / 100 % 100 AS month,
+    d.purchase_day % 100 AS day,
+    h.holiday_day IS NOT NULL AS holiday
+FROM
+    summary_daily_orders d
+LEFT JOIN
+    holidays h ON h.holiday_day = d.purchase_day
+WHERE
+    d.purchase_year BETWEEN :start_year AND :end_year
+ORDER BY
+    d.purchase_day;
+
+
+-- Esta consulta devolverá una tabla con las columnas order_count, year, month, day y holiday
+-- (src.transform arma la columna date a partir de year, month y day).
+-- Para cada día con pedidos entre los años :start_year y :end_year (inclusive) cuenta
+-- los pedidos comprados ese día e indica con 1/0 si el día es festivo.
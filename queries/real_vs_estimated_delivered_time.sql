@@ -1,41 +1,13 @@
-WITH months AS (
-  SELECT '01' AS month_no, 'Jan' AS month UNION ALL
-  SELECT '02', 'Feb' UNION ALL
-  SELECT '03', 'Mar' UNION ALL
-  SELECT '04', 'Apr' UNION ALL
-  SELECT '05', 'May' UNION ALL
-  SELECT '06', 'Jun' UNION ALL
-  SELECT '07', 'Jul' UNION ALL
-  SELECT '08', 'Aug' UNION ALL
-  SELECT '09', 'Sep' UNION ALL
-  SELECT '10', 'Oct' UNION ALL
-  SELECT '11', 'Nov' UNION ALL
-  SELECT '12', 'Dec'
-),
-orders_filtered AS (
-  SELECT DISTINCT order_id,
-         order_purchase_timestamp,
-         order_delivered_customer_date,
-         order_estimated_delivery_date,
-         strftime('%m', order_purchase_timestamp) AS month_no,
-         strftime('%Y', order_purchase_timestamp) AS year
-  FROM olist_orders
-  WHERE order_status = 'delivered'
-    AND order_delivered_customer_date IS NOT NULL
-)
-SELECT 
-  m.month_no,
-  m.month,
-  AVG(CASE WHEN of.year = '2016' THEN julianday(order_delivered_customer_date) - julianday(order_purchase_timestamp) END) AS Year2016_real_time,
-  AVG(CASE WHEN of.year = '2017' THEN julianday(order_delivered_customer_date) - julianday(order_purchase_timestamp) END) AS Year2017_real_time,
-  AVG(CASE WHEN of.year = '2018' THEN julianday(order_delivered_customer_date) - julianday(order_purchase_timestamp) END) AS Year2018_real_time,
-  AVG(CASE WHEN of.year = '2016' THEN julianday(order_estimated_delivery_date) - julianday(order_purchase_timestamp) END) AS Year2016_estimated_time,
-  AVG(CASE WHEN of.year = '2017' THEN julianday(order_estimated_delivery_date) - julianday(order_purchase_timestamp) END) AS Year2017_estimated_time,
-  AVG(CASE WHEN of.year = '2018' THEN julianday(order_estimated_delivery_date) - julianday(order_purchase_timestamp) END) AS Year2018_estimated_time
-FROM months m
-LEFT JOIN orders_filtered of ON m.month_no = of.month_no
-GROUP BY m.month_no, m.month
-ORDER BY m.month_no;
+SELECT
+  purchase_year AS year,
+  purchase_month AS month,
+  AVG(real_days) AS real_time,
+  AVG(estimated_days) AS estimated_time
+FROM summary_orders
+WHERE is_delivered
+  AND purchase_year IS NOT NULL
+GROUP BY purchase_year, purchase_month
+ORDER BY year, month;
 
 
 --------------------------------------------REALIZADO--------------------------------------------------------
@@ -56,3 +28,8 @@ ORDER BY m.month_no;
 -- 1. Puedes usar la función julianday para convertir una fecha a un número.
 -- 2. order_status == 'delivered' AND order_delivered_customer_date IS NOT NULL
 -- 3. Considera tomar order_id distintos.
+
+-- La consulta devuelve el formato largo (year, month, real_time, estimated_time) en una
+-- sola agrupación sobre las columnas enteras de summary_orders;
+-- src.transform.query_real_vs_estimated_delivered_time la pivota a las columnas
+-- Year<año>_real_time y Year<año>_estimated_time de cada año presente en los datos.
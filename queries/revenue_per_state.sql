@@ -1,17 +1,14 @@
 SELECT 
-    c.customer_state AS customer_state,
-    SUM(p.payment_value) AS Revenue
+    customer_state AS customer_state,
+    SUM(payment_total) AS Revenue
 FROM 
-    olist_orders o
-JOIN 
-    olist_customers c ON o.customer_id = c.customer_id
-JOIN 
-    olist_order_payments p ON o.order_id = p.order_id
+    summary_orders
 WHERE 
-    o.order_status = 'delivered' 
-    AND o.order_delivered_customer_date IS NOT NULL
+    is_delivered
+    AND customer_state IS NOT NULL
+    AND payment_count > 0
 GROUP BY 
-    c.customer_state
+    customer_state
 ORDER BY 
     Revenue DESC
 LIMIT 10;
@@ -0,0 +1,24 @@
+SELECT
+    oc.category,
+    COUNT(*) AS order_count,
+    SUM(oc.revenue_share * so.payment_total) AS revenue,
+    SUM(oc.item_count * so.payment_total) AS item_revenue
+FROM
+    summary_order_categories oc
+JOIN
+    summary_orders so ON so.order_id = oc.order_id
+WHERE
+    so.payment_count > 0
+    AND (:refresh_all OR oc.category IN (SELECT key FROM temp.etl_summary_keys))
+GROUP BY
+    oc.category;
+
+
+-- Ingresos por categoría, calculados una sola vez para servir cualquier top-N o bottom-N.
+-- revenue reparte los pagos de cada pedido entre sus categorías según revenue_share (la
+-- parte del precio de sus ítems), así que la suma de todas las categorías es el ingreso
+-- total de los pedidos con categoría. item_revenue cuenta los pagos una vez por ítem,
+-- igual que el JOIN de ítems con pagos que usaban las consultas top_10_revenue_categories
+-- y top_10_least_revenue_categories.
+-- :refresh_all = 1 reconstruye la tabla completa; con 0 solo se calculan las categorías
+-- de temp.etl_summary_keys (ver src.summaries.refresh_summaries).
@@ -0,0 +1,16 @@
+SELECT
+    s.purchase_day,
+    MIN(s.purchase_year) AS purchase_year,
+    COUNT(*) AS order_count
+FROM
+    summary_orders s
+WHERE
+    s.purchase_day IS NOT NULL
+    AND (:refresh_all OR s.purchase_day IN (SELECT key FROM temp.etl_summary_keys))
+GROUP BY
+    s.purchase_day;
+
+
+-- Cantidad de pedidos comprados por día (entero AAAAMMDD), calculada sobre summary_orders.
+-- :refresh_all = 1 reconstruye la tabla completa; con 0 solo se calculan los días de
+-- temp.etl_summary_keys (ver src.summaries.refresh_summaries).
@@ -0,0 +1,35 @@
+SELECT
+    i.order_id,
+    t.product_category_name_english AS category,
+    COUNT(*) AS item_count,
+    TOTAL(i.price) AS item_price,
+    CASE
+        WHEN SUM(TOTAL(i.price)) OVER (PARTITION BY i.order_id) > 0
+            THEN TOTAL(i.price) / SUM(TOTAL(i.price)) OVER (PARTITION BY i.order_id)
+        ELSE COUNT(*) * 1.0 / SUM(COUNT(*)) OVER (PARTITION BY i.order_id)
+    END AS revenue_share
+FROM
+    olist_order_items i
+JOIN
+    olist_orders o ON o.order_id = i.order_id
+JOIN
+    olist_products pr ON pr.product_id = i.product_id
+JOIN
+    product_category_name_translation t ON t.product_category_name = pr.product_category_name
+WHERE
+    o.order_status = 'delivered'
+    AND o.order_delivered_customer_date IS NOT NULL
+    AND (:refresh_all OR i.order_id IN (SELECT key FROM temp.etl_summary_keys))
+GROUP BY
+    i.order_id,
+    t.product_category_name_english;
+
+
+-- Una fila por pedido entregado y categoría (en inglés) de sus productos, con la cantidad
+-- de ítems de esa categoría en el pedido, la suma de sus precios y revenue_share, la
+-- parte del pedido que le corresponde: su precio sobre el precio de todos los ítems con
+-- categoría del pedido (o su cantidad de ítems si los precios suman 0). Las partes de un
+-- pedido suman 1; las ventanas por pedido son correctas en la actualización incremental
+-- porque se recalculan pedidos completos.
+-- :refresh_all = 1 reconstruye la tabla completa; con 0 solo se calculan los pedidos de
+-- temp.etl_summary_keys (ver src.summaries.refresh_summaries).
@@ -0,0 +1,41 @@
+SELECT
+    o.order_id,
+    o.customer_id,
+    c.customer_state,
+    o.order_status,
+    o.order_purchase_timestamp_year * 10000 + o.order_purchase_timestamp_month * 100
+        + o.order_purchase_timestamp_day AS purchase_day,
+    o.order_purchase_timestamp_year AS purchase_year,
+    o.order_purchase_timestamp_month AS purchase_month,
+    o.order_delivered_customer_date_year AS delivered_year,
+    o.order_delivered_customer_date_month AS delivered_month,
+    o.order_status = 'delivered' AND o.order_delivered_customer_date_epoch IS NOT NULL AS is_delivered,
+    (o.order_delivered_customer_date_epoch - o.order_purchase_timestamp_epoch) / 86400.0 AS real_days,
+    (o.order_estimated_delivery_date_epoch - o.order_purchase_timestamp_epoch) / 86400.0 AS estimated_days,
+    (o.order_estimated_delivery_date_epoch -
+        (o.order_delivered_customer_date_epoch - o.order_delivered_customer_date_epoch % 86400))
+        / 86400.0 AS delivery_difference,
+    COUNT(p.order_id) AS payment_count,
+    SUM(p.payment_value) AS payment_total,
+    MIN(p.payment_value) AS payment_value
+FROM
+    olist_orders o
+LEFT JOIN
+    olist_customers c ON c.customer_id = o.customer_id
+LEFT JOIN
+    olist_order_payments p ON p.order_id = o.order_id
+WHERE
+    :refresh_all OR o.order_id IN (SELECT key FROM temp.etl_summary_keys)
+GROUP BY
+    o.order_id;
+
+
+-- Tabla de hechos por pedido: una fila por pedido con su estado del cliente, el día de
+-- compra (entero AAAAMMDD), el año y mes de compra y de entrega, los días de entrega real
+-- y estimada, y el pago agregado. Todo se calcula con aritmética entera sobre las columnas
+-- *_epoch, *_year, *_month y *_day que guarda src.load.load(), sin julianday() ni strftime().
+-- payment_total suma todos los pagos del pedido. payment_value es el menor de sus pagos:
+-- revenue_by_month_year tomaba un único payment_value por pedido (columna sin agregar en
+-- un GROUP BY) y SQLite devolvía el menor; MIN lo hace determinista.
+-- :refresh_all = 1 reconstruye la tabla completa; con 0 solo se calculan los pedidos de
+-- temp.etl_summary_keys (ver src.summaries.refresh_summaries).
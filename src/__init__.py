@@ -1,5 +1,35 @@
-# Definimos la variable "something" para que pueda importarse con "from src import something"
-something = "Este es el valor de something"
+# Fachada perezosa del paquete: importar "src" no importa ningún submódulo. Cada nombre
+# de _LAZY_ATTRIBUTES se importa desde su módulo la primera vez que se accede a él
+# (PEP 562), de modo que leer el DAG no carga pandas, SQLAlchemy ni las librerías de
+# gráficos; solo las tareas que los usan pagan ese costo al ejecutarse.
+import importlib
 
-# Reexportamos algunas variables y funciones desde config.py
-from .config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, SQLITE_BD_ABSOLUTE_PATH, get_csv_to_table_mapping
+_LAZY_ATTRIBUTES = {
+    # Reexportamos algunas variables y funciones desde config.py
+    "DATASET_ROOT_PATH": "src.config",
+    "PUBLIC_HOLIDAYS_URL": "src.config",
+    "SQLITE_BD_ABSOLUTE_PATH": "src.config",
+    "get_csv_to_table_mapping": "src.config",
+    # Tareas del DAG (ver src.pipeline)
+    "extract_load_table": "src.pipeline",
+    "extract_load_holidays": "src.pipeline",
+    "refresh_summary": "src.pipeline",
+    "run_query": "src.pipeline",
+    "render_query_results": "src.pipeline",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """Importamos el atributo desde su módulo al primer acceso y lo guardamos en el paquete."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,92 @@
+import os
+import re
+import shutil
+from typing import Dict, Union
+
+import pyarrow as pa
+from pandas import DataFrame
+from pyarrow import feather
+
+from src.config import ARTIFACTS_ROOT_PATH
+
+
+def _safe_file_name(name: str) -> str:
+    """Replace every character that could leave the run folder (such as "/" or "..")."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name).lstrip(".") or "_"
+
+
+class ArtifactStore:
+    """Run-scoped store of DataFrames written as uncompressed Arrow IPC files.
+
+    Tasks exchange small manifests (paths, row counts and sizes) instead of the
+    DataFrames themselves. The downstream task memory-maps the files, so the Arrow
+    table is read without first copying the file into memory; converting it to pandas
+    then makes the one copy into the DataFrame's own blocks.
+    """
+
+    def __init__(self, run_id: str, root_path: str = ARTIFACTS_ROOT_PATH):
+        """
+        Args:
+            run_id (str): Identifier of the run (for example the Airflow run_id).
+            root_path (str): Folder under which every run gets its own directory.
+        """
+        self.run_path = os.path.join(root_path, _safe_file_name(run_id))
+
+    def put(self, name: str, df: DataFrame) -> Dict[str, Union[str, int]]:
+        """Write a DataFrame and return its manifest entry.
+
+        Args:
+            name (str): Name of the artifact (table or query name).
+            df (DataFrame): The data.
+
+        Returns:
+            Dict[str, Union[str, int]]: Manifest entry with "path", "rows" and "bytes".
+        """
+        os.makedirs(self.run_path, exist_ok=True)
+        path = os.path.join(self.run_path, f"{_safe_file_name(name)}.arrow")
+        feather.write_feather(df, path, compression="uncompressed")
+        return {"path": path, "rows": len(df), "bytes": os.path.getsize(path)}
+
+    def put_many(self, data_frames: Dict[str, DataFrame]) -> Dict[str, Dict[str, Union[str, int]]]:
+        """Write several DataFrames and return the manifest.
+
+        Args:
+            data_frames (Dict[str, DataFrame]): DataFrames keyed by name.
+
+        Returns:
+            Dict[str, Dict[str, Union[str, int]]]: Manifest with one entry per DataFrame.
+        """
+        return {name: self.put(name, df) for name, df in data_frames.items()}
+
+    @staticmethod
+    def get(entry: Union[str, Dict[str, Union[str, int]]]) -> DataFrame:
+        """Read an artifact through a memory map into a DataFrame.
+
+        Args:
+            entry (Union[str, Dict[str, Union[str, int]]]): Manifest entry or file path.
+
+        Returns:
+            DataFrame: The stored DataFrame.
+        """
+        path = entry if isinstance(entry, str) else entry["path"]
+        with pa.memory_map(path, "r") as source:
+            # The conversion runs while the map is open, since the table's buffers point into it
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    @classmethod
+    def get_many(
+        cls, manifest: Dict[str, Dict[str, Union[str, int]]]
+    ) -> Dict[str, DataFrame]:
+        """Read every artifact of a manifest.
+
+        Args:
+            manifest (Dict[str, Dict[str, Union[str, int]]]): Manifest returned by put_many().
+
+        Returns:
+            Dict[str, DataFrame]: DataFrames keyed by name.
+        """
+        return {name: cls.get(entry) for name, entry in (manifest or {}).items()}
+
+    def cleanup(self):
+        """Delete every artifact of the run."""
+        shutil.rmtree(self.run_path, ignore_errors=True)
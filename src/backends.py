@@ -0,0 +1,212 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Union
+
+from pandas import DataFrame, read_sql
+from sqlalchemy.engine.base import Engine
+
+from src.config import (
+    DATASET_ROOT_PATH,
+    QUERIES_ROOT_PATH,
+    STAGING_ROOT_PATH,
+    get_csv_to_table_mapping,
+)
+from src.load import load
+
+
+class Backend(ABC):
+    """Analytical engine the transform queries run on.
+
+    A backend loads the extracted tables, reads the SQL of a query in its own dialect
+    and runs it. The query functions of src.transform accept a backend wherever they
+    accept a SQLite Engine, so the same QueryEnum names and QueryResult outputs are
+    produced by every backend.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def load(self, data_frames: Dict[str, DataFrame], **kwargs):
+        """Load the extracted tables into the backend."""
+
+    @abstractmethod
+    def read_query(self, query_name: str) -> str:
+        """Read the SQL of a query in the dialect of the backend."""
+
+    @abstractmethod
+    def run_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> DataFrame:
+        """Run a SQL query and return the result as a dataframe."""
+
+    def close(self):
+        """Release the resources held by the backend."""
+
+
+class SQLiteBackend(Backend):
+    """SQLite through a SQLAlchemy Engine, with the summary tables built by src.load."""
+
+    name = "sqlite"
+
+    def __init__(self, engine: Engine):
+        """
+        Args:
+            engine (Engine): SQLAlchemy engine of the SQLite database.
+        """
+        self.engine = engine
+
+    def load(self, data_frames: Dict[str, DataFrame], **kwargs):
+        """Load the tables with src.load.load(); kwargs are passed through."""
+        load(data_frames, self.engine, **kwargs)
+
+    def read_query(self, query_name: str) -> str:
+        with open(f"{QUERIES_ROOT_PATH}/{query_name}.sql", "r") as f:
+            return f.read()
+
+    def run_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> DataFrame:
+        with self.engine.connect() as connection:
+            return read_sql(query, connection.connection, params=params)
+
+    def close(self):
+        self.engine.dispose()
+
+
+class DuckDBBackend(Backend):
+    """Embedded DuckDB over the dataset files or the extracted DataFrames.
+
+    CSV and Parquet files are exposed as views that DuckDB scans directly with its
+    columnar, multi-threaded engine, so no load step is needed. The queries in
+    queries/duckdb/ join the source tables directly instead of reading the SQLite
+    summary tables, and return the same columns as their SQLite counterparts.
+    """
+
+    name = "duckdb"
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, Union[str, DataFrame]]] = None,
+        database: str = ":memory:",
+        threads: Optional[int] = None,
+    ):
+        """
+        Args:
+            tables (Optional[Dict[str, Union[str, DataFrame]]]): Table names mapped to a
+                CSV or Parquet path (a glob or a partitioned folder for Parquet) or to a
+                DataFrame.
+            database (str): DuckDB database file, in memory by default.
+            threads (Optional[int]): Number of DuckDB threads. Defaults to all cores.
+        """
+        import duckdb
+
+        self.connection = duckdb.connect(database)
+        if threads:
+            self.connection.execute(f"SET threads TO {int(threads)}")
+        for table_name, source in (tables or {}).items():
+            self.register(table_name, source)
+
+    @classmethod
+    def from_dataset(
+        cls,
+        csv_folder: str = DATASET_ROOT_PATH,
+        csv_table_mapping: Optional[Dict[str, str]] = None,
+        public_holidays: Optional[DataFrame] = None,
+        **kwargs,
+    ) -> "DuckDBBackend":
+        """Create a backend that scans the dataset CSVs in place.
+
+        Args:
+            csv_folder (str): Folder of the CSV files.
+            csv_table_mapping (Optional[Dict[str, str]]): CSV file names mapped to table
+                names. Defaults to get_csv_to_table_mapping().
+            public_holidays (Optional[DataFrame]): Public holidays, as returned by
+                src.extract.get_public_holidays_for_years().
+
+        Returns:
+            DuckDBBackend: The backend.
+        """
+        mapping = csv_table_mapping or get_csv_to_table_mapping()
+        tables: Dict[str, Union[str, DataFrame]] = {
+            table_name: os.path.join(csv_folder, csv_file)
+            for csv_file, table_name in mapping.items()
+        }
+        if public_holidays is not None:
+            tables["public_holidays"] = public_holidays
+        return cls(tables, **kwargs)
+
+    @classmethod
+    def from_staging(
+        cls,
+        staging_folder: str = STAGING_ROOT_PATH,
+        table_names: Optional[List[str]] = None,
+        public_holidays: Optional[DataFrame] = None,
+        **kwargs,
+    ) -> "DuckDBBackend":
+        """Create a backend over the Parquet staging area built by src.staging.stage().
+
+        DuckDB reads only the columns a query uses and skips the partitions its filters
+        exclude, so a query touching two order columns never reads the others.
+
+        Args:
+            staging_folder (str): Root folder of the staging area.
+            table_names (Optional[List[str]]): Staged tables to expose. Defaults to the
+                tables of get_csv_to_table_mapping().
+            public_holidays (Optional[DataFrame]): Public holidays, as returned by
+                src.extract.get_public_holidays_for_years().
+
+        Returns:
+            DuckDBBackend: The backend.
+        """
+        table_names = table_names or list(get_csv_to_table_mapping().values())
+        tables: Dict[str, Union[str, DataFrame]] = {
+            table_name: os.path.join(staging_folder, table_name) for table_name in table_names
+        }
+        if public_holidays is not None:
+            tables["public_holidays"] = public_holidays
+        return cls(tables, **kwargs)
+
+    def register(self, table_name: str, source: Union[str, DataFrame]):
+        """Expose a file or a DataFrame as a table.
+
+        Args:
+            table_name (str): Table name used by the queries.
+            source (Union[str, DataFrame]): CSV or Parquet path, or a DataFrame.
+        """
+        existing = self.connection.execute(
+            "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [table_name]
+        ).fetchone()
+        if existing:
+            kind = "VIEW" if existing[0] == "VIEW" else "TABLE"
+            self.connection.execute(f'DROP {kind} "{table_name}"')
+        if isinstance(source, DataFrame):
+            # Categorical columns are stored as plain values, as in SQLite
+            frame = source.astype(
+                {column: object for column in source.columns if source[column].dtype == "category"}
+            )
+            self.connection.register("_source_frame", frame)
+            self.connection.execute(f'CREATE TABLE "{table_name}" AS SELECT * FROM _source_frame')
+            self.connection.unregister("_source_frame")
+            return
+
+        path = source.replace("'", "''")
+        if os.path.isdir(source):
+            scan = f"read_parquet('{path}/**/*.parquet', hive_partitioning = true)"
+        elif source.endswith(".parquet"):
+            scan = f"read_parquet('{path}', hive_partitioning = true)"
+        else:
+            scan = f"read_csv('{path}', header = true)"
+        self.connection.execute(f'CREATE VIEW "{table_name}" AS SELECT * FROM {scan}')
+
+    def load(self, data_frames: Dict[str, DataFrame], **kwargs):
+        """Copy the extracted DataFrames into DuckDB tables."""
+        for table_name, df in data_frames.items():
+            self.register(table_name, df)
+
+    def read_query(self, query_name: str) -> str:
+        with open(f"{QUERIES_ROOT_PATH}/duckdb/{query_name}.sql", "r") as f:
+            return f.read()
+
+    def run_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> DataFrame:
+        # DuckDB only accepts the parameters that the query uses
+        params = {name: value for name, value in (params or {}).items() if f"${name}" in query}
+        return self.connection.execute(query, params).df()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,329 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+
+from src.config import (
+    BENCHMARK_BASELINE_PATH,
+    BENCHMARK_RESULTS_PATH,
+    PUBLIC_HOLIDAYS_FIXTURES_URL,
+    get_csv_to_table_mapping,
+)
+from src.extract import extract
+from src.load import load
+from src.synthetic import generate_dataset
+from src.telemetry import PeakMemorySampler
+from src.transform import QueryEnum, get_all_queries
+
+# Number of orders of the 1x scale factor
+BASE_ORDERS = 10_000
+SCALE_FACTORS = [1, 10, 100]
+
+# A stage regresses when it is this much slower (or uses this much more memory) than the
+# baseline, and the difference is above the noise floor below
+DEFAULT_THRESHOLD = 0.25
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA = 1 << 20
+# Timings are only comparable between runs on the same kind of machine and the same data.
+# "platform" is not among them: it names the exact kernel build, which changes on updates
+COMPARABLE_METADATA = ("system", "machine", "cpu_count", "base_orders", "seed")
+
+
+def measure(stage: str, function: Callable[[], Any], repeat: int = 1) -> Tuple[Dict[str, Any], Any]:
+    """Time a stage and measure its peak memory.
+
+    The wall time is the best of "repeat" runs. Memory is the peak growth of the
+    resident set size (RSS) during a run, sampled from a background thread, so it
+    includes the allocations of SQLite, pyarrow and other native libraries.
+
+    Args:
+        stage (str): Stage name.
+        function (Callable[[], Any]): The stage, without arguments.
+        repeat (int): Number of runs.
+
+    Returns:
+        Tuple[Dict[str, Any], Any]: The measurement and the value returned by the last run.
+    """
+    timings, peaks = [], []
+    result = None
+    for _ in range(repeat):
+        # The previous result is released first so it does not count against this run
+        result = None
+        gc.collect()
+        sampler = PeakMemorySampler()
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            result = function()
+        finally:
+            timings.append(time.perf_counter() - start)
+            peaks.append(sampler.stop())
+
+    return {"stage": stage, "seconds": min(timings), "peak_memory_bytes": max(peaks)}, result
+
+
+def get_plot_stages(results: Dict[str, Any]) -> Dict[str, Callable[[], None]]:
+    """Bind every plot function of src.plots to the query result it draws."""
+    from src import plots
+
+    year = 2017
+    return {
+        "plot_revenue_by_month_year": lambda: plots.plot_revenue_by_month_year(
+            results[QueryEnum.REVENUE_BY_MONTH_YEAR.value], year
+        ),
+        "plot_real_vs_predicted_delivered_time": lambda: plots.plot_real_vs_predicted_delivered_time(
+            results[QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value], year
+        ),
+        "plot_global_amount_order_status": lambda: plots.plot_global_amount_order_status(
+            results[QueryEnum.GLOBAL_AMMOUNT_ORDER_STATUS.value]
+        ),
+        "plot_revenue_per_state": lambda: plots.plot_revenue_per_state(
+            results[QueryEnum.REVENUE_PER_STATE.value]
+        ),
+        "plot_top_10_least_revenue_categories": lambda: plots.plot_top_10_least_revenue_categories(
+            results[QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES.value]
+        ),
+        "plot_top_10_revenue_categories_ammount": lambda: plots.plot_top_10_revenue_categories_ammount(
+            results[QueryEnum.TOP_10_REVENUE_CATEGORIES.value]
+        ),
+        "plot_top_10_revenue_categories": lambda: plots.plot_top_10_revenue_categories(
+            results[QueryEnum.TOP_10_REVENUE_CATEGORIES.value]
+        ),
+        "plot_freight_value_weight_relationship": lambda: plots.plot_freight_value_weight_relationship(
+            results[QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value]
+        ),
+        "plot_delivery_date_difference": lambda: plots.plot_delivery_date_difference(
+            results[QueryEnum.DELIVERY_DATE_DIFFERECE.value]
+        ),
+        "plot_order_amount_per_day_with_holidays": lambda: plots.plot_order_amount_per_day_with_holidays(
+            results[QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value].copy()
+        ),
+    }
+
+
+def _run_plot(plot: Callable[[], None]):
+    import matplotlib.pyplot as plt
+
+    with warnings.catch_warnings():
+        # plt.show() warns that the Agg backend is non-interactive
+        warnings.simplefilter("ignore", UserWarning)
+        plot()
+    plt.close("all")
+
+
+def run_scale(
+    scale: int,
+    base_orders: int = BASE_ORDERS,
+    seed: int = 0,
+    repeat: int = 1,
+    plots: bool = True,
+) -> List[Dict[str, Any]]:
+    """Benchmark every stage of the pipeline on a synthetic dataset of the given scale.
+
+    The stages are extract, load, every query of get_all_queries() and, when plots is
+    True, every plot function. Each stage runs on the output of the previous one, in a
+    temporary folder that is removed at the end.
+
+    Args:
+        scale (int): Scale factor; the dataset has scale * base_orders orders.
+        base_orders (int): Number of orders of the 1x scale factor.
+        seed (int): Seed of the synthetic data generator.
+        repeat (int): Number of timed runs of each stage.
+        plots (bool): Also benchmark the plot functions.
+
+    Returns:
+        List[Dict[str, Any]]: One measurement per stage.
+    """
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix="olist_benchmark_") as folder:
+        csv_folder = os.path.join(folder, "dataset")
+        rows = generate_dataset(csv_folder, scale * base_orders, seed)
+
+        measurement, data_frames = measure(
+            "extract",
+            lambda: extract(csv_folder, get_csv_to_table_mapping(), PUBLIC_HOLIDAYS_FIXTURES_URL),
+            repeat,
+        )
+        measurements.append(measurement)
+
+        database = create_engine(f"sqlite:///{os.path.join(folder, 'olist.db')}")
+        measurement, _ = measure("load", lambda: load(data_frames, database), repeat)
+        measurements.append(measurement)
+        del data_frames
+
+        results = {}
+        for query in get_all_queries():
+            measurement, query_result = measure(query.__name__, lambda: query(database), repeat)
+            measurements.append(measurement)
+            results[query_result.query] = query_result.result
+        database.dispose()
+
+        if plots:
+            import matplotlib
+            import plotly.io as pio
+
+            matplotlib.use("Agg")
+            renderer = pio.renderers.default
+            # An empty renderer builds the plotly figures without opening a browser
+            pio.renderers.default = ""
+            try:
+                for name, plot in get_plot_stages(results).items():
+                    measurement, _ = measure(name, lambda: _run_plot(plot), repeat)
+                    measurements.append(measurement)
+            finally:
+                pio.renderers.default = renderer
+
+    for measurement in measurements:
+        measurement.update({"scale": scale, "orders": rows["olist_orders"]})
+    return measurements
+
+
+def run_benchmarks(
+    scales: List[int] = SCALE_FACTORS,
+    base_orders: int = BASE_ORDERS,
+    seed: int = 0,
+    repeat: int = 1,
+    plots: bool = True,
+) -> Dict[str, Any]:
+    """Benchmark the pipeline at every scale factor.
+
+    Returns:
+        Dict[str, Any]: The machine the benchmark ran on and the measurements of every
+        stage at every scale.
+    """
+    measurements = []
+    for scale in scales:
+        measurements.extend(run_scale(scale, base_orders, seed, repeat, plots))
+    return {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "system": platform.system(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "base_orders": base_orders,
+            "seed": seed,
+        },
+        "results": measurements,
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    force: bool = False,
+) -> List[str]:
+    """Find the stages that regressed against a baseline.
+
+    A stage regresses when its time or its peak memory grows by more than "threshold"
+    (0.25 is 25%) and by more than the noise floor (MIN_SECONDS_DELTA seconds,
+    MIN_MEMORY_DELTA bytes). Stages or scales missing from either run are ignored.
+
+    The runs must match in every key of COMPARABLE_METADATA (operating system, CPU
+    architecture and count, data size and seed): timings from another kind of machine
+    would say more about the machines than the code, so a mismatch is an error rather
+    than a pass.
+
+    Args:
+        current (Dict[str, Any]): Output of run_benchmarks().
+        baseline (Dict[str, Any]): A previous output of run_benchmarks().
+        threshold (float): Allowed relative growth.
+        force (bool): Compare even when the metadata of the runs differs.
+
+    Raises:
+        ValueError: If the runs are not comparable and force is False.
+
+    Returns:
+        List[str]: A description of every regression, empty if there is none.
+    """
+    current_metadata = current.get("metadata", {})
+    baseline_metadata = baseline.get("metadata", {})
+    mismatches = [
+        f"{key} {baseline_metadata.get(key)!r} -> {current_metadata.get(key)!r}"
+        for key in COMPARABLE_METADATA
+        if baseline_metadata.get(key) != current_metadata.get(key)
+    ]
+    if mismatches and not force:
+        raise ValueError("Baseline not comparable with this run: " + ", ".join(mismatches))
+
+    previous = {(row["scale"], row["stage"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = previous.get((row["scale"], row["stage"]))
+        if before is None:
+            continue
+        for metric, noise in (("seconds", MIN_SECONDS_DELTA), ("peak_memory_bytes", MIN_MEMORY_DELTA)):
+            delta = row[metric] - before[metric]
+            if delta > noise and row[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{row['stage']} at {row['scale']}x: {metric} {before[metric]:.4g} -> {row[metric]:.4g}"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the Olist ETL pipeline.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALE_FACTORS)
+    parser.add_argument("--base-orders", type=int, default=BASE_ORDERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-plots", action="store_true")
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_PATH)
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store this run as the new baseline."
+    )
+    parser.add_argument(
+        "--force-compare",
+        action="store_true",
+        help="Compare to the baseline even if it ran on another kind of machine or data size.",
+    )
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.scales, args.base_orders, args.seed, args.repeat, not args.no_plots)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    for row in current["results"]:
+        print(
+            f"{row['scale']:>4}x {row['stage']:<45} {row['seconds']:>9.3f} s "
+            f"{row['peak_memory_bytes'] / (1 << 20):>9.1f} MiB"
+        )
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one.")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    try:
+        regressions = compare_to_baseline(
+            current, baseline, args.threshold, force=args.force_compare
+        )
+    except ValueError as error:
+        raise SystemExit(
+            f"{error}.\nStore a baseline for this machine with --update-baseline, or compare "
+            "anyway with --force-compare."
+        )
+    if regressions:
+        raise SystemExit("Performance regressions:\n" + "\n".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
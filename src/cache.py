@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pandas import DataFrame, read_parquet
+
+from src.config import QUERY_CACHE_ROOT_PATH
+
+MANIFEST_FILE = "manifest.json"
+
+
+class QueryResultCache:
+    """On-disk, size-bounded LRU cache of query results stored as Parquet files.
+
+    Entries are keyed on the SQL text of the query and on a fingerprint of the tables it
+    reads (see src.transform.get_table_fingerprints), so a result is reused only while
+    those tables are unchanged. A manifest keeps, for every entry, the query name, the
+    tables it depends on, its size and its last access time.
+    """
+
+    def __init__(
+        self,
+        root_path: str = QUERY_CACHE_ROOT_PATH,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            root_path (str): Folder where the Parquet files and the manifest are stored.
+            max_bytes (int): Maximum total size of the cached files.
+            max_entries (Optional[int]): Maximum number of cached results.
+        """
+        self.root_path = root_path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query_name: str, sql: str, fingerprint: Dict[str, List]) -> str:
+        """Build the cache key of a query result.
+
+        Args:
+            query_name (str): Name of the query result.
+            sql (str): SQL text of the query.
+            fingerprint (Dict[str, List]): Fingerprint of every table the query reads.
+
+        Returns:
+            str: A hex digest identifying the result.
+        """
+        payload = json.dumps(
+            {"query": query_name, "sql": sql, "tables": fingerprint}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[DataFrame]:
+        """Return the cached result for the key, or None on a miss."""
+        with self._lock:
+            manifest = self._read_manifest()
+            entry = manifest.get(key)
+            if entry is None:
+                return None
+            path = os.path.join(self.root_path, entry["file"])
+            if not os.path.exists(path):
+                del manifest[key]
+                self._write_manifest(manifest)
+                return None
+            entry["last_access"] = time.time()
+            self._write_manifest(manifest)
+        return read_parquet(path)
+
+    def put(self, key: str, query_name: str, tables: Iterable[str], result: DataFrame):
+        """Store a result and evict the least recently used entries over the limits."""
+        os.makedirs(self.root_path, exist_ok=True)
+        file_name = f"{key}.parquet"
+        path = os.path.join(self.root_path, file_name)
+        result.to_parquet(path, index=False)
+        with self._lock:
+            manifest = self._read_manifest()
+            manifest[key] = {
+                "query": query_name,
+                "tables": sorted(tables),
+                "file": file_name,
+                "size": os.path.getsize(path),
+                "last_access": time.time(),
+            }
+            self._evict(manifest)
+            self._write_manifest(manifest)
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> int:
+        """Drop the entries that depend on any of the given tables.
+
+        Args:
+            tables (Optional[Iterable[str]]): Tables that changed. None drops every entry.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if not os.path.isdir(self.root_path):
+            return 0
+        changed = None if tables is None else set(tables)
+        with self._lock:
+            manifest = self._read_manifest()
+            stale = [
+                key
+                for key, entry in manifest.items()
+                if changed is None or changed.intersection(entry["tables"])
+            ]
+            for key in stale:
+                self._remove(manifest.pop(key))
+            self._write_manifest(manifest)
+        return len(stale)
+
+    def _evict(self, manifest: Dict[str, dict]):
+        """Remove least recently used entries until the size and count limits hold."""
+        by_age = sorted(manifest, key=lambda key: manifest[key]["last_access"])
+        total = sum(entry["size"] for entry in manifest.values())
+        for key in by_age:
+            over_size = total > self.max_bytes
+            over_count = self.max_entries is not None and len(manifest) > self.max_entries
+            if not (over_size or over_count):
+                break
+            total -= manifest[key]["size"]
+            self._remove(manifest.pop(key))
+
+    def _remove(self, entry: dict):
+        path = os.path.join(self.root_path, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        path = os.path.join(self.root_path, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, dict]):
+        os.makedirs(self.root_path, exist_ok=True)
+        path = os.path.join(self.root_path, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,330 @@
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from pandas.api import types
+
+logger = logging.getLogger(__name__)
+
+# DataFrame.attrs key listing the columns replaced by integer surrogate keys
+SURROGATE_KEYS_ATTR = "surrogate_keys"
+
+# Columns always stored as categoricals, whatever their cardinality in a given frame
+CATEGORICAL_COLUMNS = {
+    "order_status",
+    "customer_state",
+    "customer_city",
+    "seller_state",
+    "seller_city",
+    "geolocation_state",
+    "geolocation_city",
+    "product_category_name",
+    "product_category_name_english",
+    "payment_type",
+    "State",
+    "Category",
+}
+
+# Other string columns become categoricals when they have at most this many distinct
+# values per row (free text such as review comments stays as strings)
+MAX_CATEGORICAL_RATIO = 0.5
+
+
+def is_id_column(column: str) -> bool:
+    """Whether a column holds Olist identifiers (order_id, customer_unique_id, ...)."""
+    return column.endswith("_id")
+
+
+class KeyDictionary:
+    """Dictionary encoding of identifiers as integer surrogate keys.
+
+    There is one dictionary per column name, shared by every frame encoded with the same
+    instance, so a product_id gets the same code in olist_products and in
+    olist_order_items and joins on the codes match joins on the original strings. The
+    codes are only stable within one instance: encode again and the same ID may get
+    another code.
+
+    With categorical=True the codes are wrapped in a categorical whose categories are the
+    dictionary itself, so the frame keeps the identifiers (and writes them to SQLite as
+    strings) while storing one integer code per row.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, pd.Index] = {}
+        self._dtypes: Dict[str, pd.CategoricalDtype] = {}
+
+    def add(self, column: str, values: Series):
+        """Add the identifiers of a column to its dictionary without encoding them.
+
+        Adding every frame first gives all of them the same categorical dtype per column.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            self._extend(column, values.cat.categories)
+        else:
+            self._extend(column, pd.Index(values.dropna().unique()))
+
+    def encode(self, column: str, values: Series, categorical: bool = False) -> Series:
+        """Replace the identifiers of a column with their integer codes.
+
+        Args:
+            column (str): Column name, which selects the dictionary.
+            values (Series): Identifiers, as strings or a categorical.
+            categorical (bool): Return a categorical over the whole dictionary instead of
+                the bare codes.
+
+        Returns:
+            Series: int32 codes, Int32 when there are missing values, or a categorical.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Encode the (fewer) categories and map the codes of every row through them
+            keys = self._extend(column, values.cat.categories)
+            category_codes = keys.get_indexer(values.cat.categories)
+            row_codes = values.cat.codes.to_numpy()
+            codes = np.where(row_codes >= 0, category_codes[row_codes], -1)
+        else:
+            keys = self._extend(column, pd.Index(values.dropna().unique()))
+            codes = keys.get_indexer(values)
+
+        if categorical:
+            dtype = self._dtypes.get(column)
+            if dtype is None:
+                dtype = self._dtypes[column] = pd.CategoricalDtype(keys)
+            return Series(
+                pd.Categorical.from_codes(codes, dtype=dtype), index=values.index, name=values.name
+            )
+        if (codes < 0).any():
+            return Series(
+                pd.arrays.IntegerArray(codes.astype(np.int32), codes < 0),
+                index=values.index,
+                name=values.name,
+            )
+        return Series(codes.astype(np.int32), index=values.index, name=values.name)
+
+    def decode(self, column: str, codes: Series) -> Series:
+        """Translate integer codes back to the original identifiers.
+
+        Args:
+            column (str): Column name the codes were encoded with.
+            codes (Series): Codes returned by encode().
+
+        Returns:
+            Series: The identifiers, with missing codes as NaN.
+        """
+        keys = self._keys[column]
+        positions = codes.to_numpy(dtype=np.int64, na_value=-1)
+        result = keys.to_numpy(dtype=object)[np.where(positions >= 0, positions, 0)]
+        result[positions < 0] = np.nan
+        return Series(result, index=codes.index, name=codes.name)
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys.values())
+
+    def _extend(self, column: str, values: pd.Index) -> pd.Index:
+        keys = self._keys.get(column)
+        if keys is None:
+            keys = pd.Index(values, dtype=object)
+        else:
+            new = values[~values.isin(keys)]
+            if len(new):
+                keys = keys.append(pd.Index(new, dtype=object))
+                self._dtypes.pop(column, None)
+        self._keys[column] = keys
+        return keys
+
+
+def _is_string_or_categorical(dtype) -> bool:
+    return types.is_object_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+
+
+def _downcast_integers(series: Series) -> Series:
+    """Smallest integer dtype that holds the values, keeping nullable dtypes nullable."""
+    if series.empty or series.isna().all():
+        return series
+    low, high = series.min(), series.max()
+    nullable = types.is_extension_array_dtype(series.dtype)
+    for dtype in ("int8", "int16", "int32"):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            if np.dtype(dtype).itemsize >= series.dtype.itemsize:
+                return series
+            return series.astype(dtype.capitalize() if nullable else dtype)
+    return series
+
+
+def _downcast_floats(series: Series) -> Series:
+    """float32 when every value survives the round trip, so results do not change."""
+    if series.dtype != np.float64:
+        return series
+    values = series.to_numpy()
+    narrowed = values.astype(np.float32)
+    same = (narrowed.astype(np.float64) == values) | np.isnan(values)
+    return series.astype(np.float32) if same.all() else series
+
+
+def compact_frame(
+    df: DataFrame, keys: Optional[KeyDictionary] = None, categorical_ids: bool = False
+) -> DataFrame:
+    """Return a compact copy of a DataFrame.
+
+    - Identifier columns ("*_id") are dictionary-encoded when a KeyDictionary is given:
+      replaced by integer surrogate keys, listed in df.attrs["surrogate_keys"], or with
+      categorical_ids kept as categoricals over the shared dictionary.
+    - The columns of CATEGORICAL_COLUMNS, and other string columns with few distinct
+      values, become categoricals when that takes less memory.
+    - Integers are downcast to the smallest dtype that holds them, and float64 columns to
+      float32 only when no value changes.
+
+    Args:
+        df (DataFrame): The data.
+        keys (Optional[KeyDictionary]): Dictionary for the identifiers. None leaves them
+            as they are.
+        categorical_ids (bool): Keep the identifiers as categoricals instead of replacing
+            them with their codes.
+
+    Returns:
+        DataFrame: The compacted frame, with the same columns and index. Only integer
+        surrogate keys change value; decode them with keys.decode().
+    """
+    columns = {}
+    surrogate_keys = []
+    for column in df.columns:
+        series = df[column]
+        dtype = series.dtype
+        if keys is not None and is_id_column(column) and _is_string_or_categorical(dtype):
+            series = keys.encode(column, series, categorical=categorical_ids)
+            if not categorical_ids:
+                surrogate_keys.append(column)
+        elif types.is_object_dtype(dtype) or types.is_string_dtype(dtype):
+            if len(series) and (
+                column in CATEGORICAL_COLUMNS
+                or series.nunique(dropna=True) <= MAX_CATEGORICAL_RATIO * len(series)
+            ):
+                categorical = series.astype("category")
+                # In a handful of rows the categories cost more than the strings they replace
+                if categorical.memory_usage(deep=True) < series.memory_usage(deep=True):
+                    series = categorical
+        elif types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            pass
+        elif types.is_integer_dtype(dtype):
+            series = _downcast_integers(series)
+        elif types.is_float_dtype(dtype):
+            series = _downcast_floats(series)
+        columns[column] = series
+    compacted = DataFrame(columns, index=df.index)
+    if surrogate_keys:
+        compacted.attrs[SURROGATE_KEYS_ATTR] = surrogate_keys
+    return compacted
+
+
+def has_surrogate_keys(df: DataFrame) -> bool:
+    """Whether compact_frame() replaced identifiers of the DataFrame with integer codes."""
+    return bool(df.attrs.get(SURROGATE_KEYS_ATTR))
+
+
+def compact_frames(
+    data_frames: Dict[str, DataFrame],
+    surrogate_keys: bool = True,
+    keys: Optional[KeyDictionary] = None,
+    categorical_ids: bool = False,
+) -> Tuple[Dict[str, DataFrame], DataFrame, Optional[KeyDictionary]]:
+    """Compact every DataFrame of a dictionary and report the memory saved per table.
+
+    Args:
+        data_frames (Dict[str, DataFrame]): DataFrames keyed by table or query name.
+        surrogate_keys (bool): Encode the identifiers as integer surrogate keys, shared by
+            all the frames (see KeyDictionary).
+        keys (Optional[KeyDictionary]): Dictionary to extend, e.g. from a previous call.
+        categorical_ids (bool): Keep the identifiers as categoricals sharing one
+            dictionary per column across the frames (see compact_frame). A dictionary is
+            counted in the report of every frame that uses it.
+
+    Returns:
+        Tuple[Dict[str, DataFrame], DataFrame, Optional[KeyDictionary]]: The compacted
+        frames, the report (see compaction_report) and the key dictionary, None when
+        surrogate_keys is False.
+    """
+    if surrogate_keys and keys is None:
+        keys = KeyDictionary()
+    if surrogate_keys and categorical_ids:
+        for df in data_frames.values():
+            for column in df.columns:
+                if is_id_column(column) and _is_string_or_categorical(df[column].dtype):
+                    keys.add(column, df[column])
+    compacted = {
+        name: compact_frame(df, keys if surrogate_keys else None, categorical_ids)
+        for name, df in data_frames.items()
+    }
+    report = compaction_report(
+        ((name, data_frames[name], compacted[name]) for name in data_frames),
+        keys if surrogate_keys else None,
+    )
+    for row in report.itertuples():
+        logger.info(
+            "compacted %s: %d -> %d bytes (%.1fx)",
+            row.table,
+            row.bytes_before,
+            row.bytes_after,
+            row.ratio,
+        )
+    return compacted, report, keys if surrogate_keys else None
+
+
+def compaction_report(
+    frames: Iterable[Tuple[str, DataFrame, DataFrame]], keys: Optional[KeyDictionary] = None
+) -> DataFrame:
+    """Measure the memory of every frame before and after compaction.
+
+    Memory is measured deep (string contents included). A dictionary shared by several
+    frames, either the categories of a categorical or the KeyDictionary behind integer
+    surrogate keys, is held once, so it is counted once, in the first frame that uses it.
+
+    Args:
+        frames (Iterable[Tuple[str, DataFrame, DataFrame]]): (name, before, after) tuples.
+        keys (Optional[KeyDictionary]): Dictionary the surrogate keys were encoded with.
+
+    Returns:
+        DataFrame: One row per table with "table", "rows", "bytes_before",
+        "bytes_after", "bytes_saved" and "ratio" (before / after).
+    """
+    counted_before: set = set()
+    counted_after: set = set()
+    rows = []
+    for name, before, after in frames:
+        bytes_before = _memory_usage(before, counted_before, keys)
+        bytes_after = _memory_usage(after, counted_after, keys)
+        rows.append(
+            {
+                "table": name,
+                "rows": len(before),
+                "bytes_before": bytes_before,
+                "bytes_after": bytes_after,
+                "bytes_saved": bytes_before - bytes_after,
+                "ratio": bytes_before / bytes_after if bytes_after else 1.0,
+            }
+        )
+    return DataFrame(
+        rows, columns=["table", "rows", "bytes_before", "bytes_after", "bytes_saved", "ratio"]
+    )
+
+
+def _memory_usage(df: DataFrame, counted: set, keys: Optional[KeyDictionary]) -> int:
+    """Deep memory of a frame, skipping the dictionaries already in "counted"."""
+    total = int(df.index.memory_usage(deep=True))
+    surrogate_keys = df.attrs.get(SURROGATE_KEYS_ATTR, [])
+    for column in df.columns:
+        series = df[column]
+        dictionary = None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            total += int(series.cat.codes.memory_usage(deep=True, index=False))
+            dictionary = series.cat.categories
+        else:
+            total += int(series.memory_usage(deep=True, index=False))
+            if keys is not None and column in surrogate_keys:
+                dictionary = keys._keys[column]
+        if dictionary is not None and id(dictionary) not in counted:
+            counted.add(id(dictionary))
+            # The values only: the hash table pandas builds for lookups can be dropped
+            total += int(Series(dictionary).memory_usage(deep=True, index=False))
+    return total
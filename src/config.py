@@ -1,12 +1,27 @@
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
 # Definimos las rutas relativas a la raíz del proyecto
 DATASET_ROOT_PATH = str(Path(__file__).parent.parent / "dataset")
 QUERIES_ROOT_PATH = str(Path(__file__).parent.parent / "queries")
 QUERY_RESULTS_ROOT_PATH = str(Path(__file__).parent.parent / "tests/query_results")
-PUBLIC_HOLIDAYS_URL = "https://date.nager.at/api/v3/publicholidays"
+# La URL puede apuntar a una carpeta local con "file://" (ver PUBLIC_HOLIDAYS_FIXTURES_URL)
+PUBLIC_HOLIDAYS_URL = os.environ.get(
+    "PUBLIC_HOLIDAYS_URL", "https://date.nager.at/api/v3/publicholidays"
+)
+PUBLIC_HOLIDAYS_FIXTURES_URL = (Path(__file__).parent.parent / "dataset" / "public_holidays").as_uri()
 SQLITE_BD_ABSOLUTE_PATH = str(Path(__file__).parent.parent / "olist.db")
+QUERY_CACHE_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "query_results")
+ARTIFACTS_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "artifacts")
+HOLIDAYS_CACHE_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "public_holidays")
+STAGING_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "staging")
+PLOTS_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "plots")
+BENCHMARK_RESULTS_PATH = str(Path(__file__).parent.parent / ".cache" / "benchmarks" / "results.json")
+BENCHMARK_BASELINE_PATH = str(Path(__file__).parent.parent / "benchmarks" / "baseline.json")
+# Archivos opcionales de telemetría: registros JSON por etapa y métricas en formato Prometheus
+TELEMETRY_LOG_PATH = os.environ.get("TELEMETRY_LOG_PATH")
+TELEMETRY_PROMETHEUS_PATH = os.environ.get("TELEMETRY_PROMETHEUS_PATH")
 
 def get_csv_to_table_mapping() -> Dict[str, str]:
     """Mapeamoa los archivos CSV a los nombres de las tablas en la base de datos.
@@ -26,4 +41,322 @@ def get_csv_to_table_mapping() -> Dict[str, str]:
             ("olist_sellers_dataset.csv", "olist_sellers"),
             ("product_category_name_translation.csv", "product_category_name_translation"),
         ]
-    )
\ No newline at end of file
+    )
+
+def get_table_schemas() -> Dict[str, Dict[str, Any]]:
+    """Definimos el esquema de tipos de cada tabla para la lectura de los CSV.
+
+    Cada entrada indica los "dtype" de las columnas (categóricas para valores con pocos
+    valores distintos y numéricos de ancho fijo) y las columnas "parse_dates" que se
+    convierten a datetime. Los importes y pesos se mantienen en float64 para no alterar
+    los resultados de las consultas.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Diccionario con el nombre de la tabla como clave y un
+        diccionario con las llaves "dtype" y "parse_dates" como valor.
+    """
+    return {
+        "olist_customers": {
+            "dtype": {
+                "customer_id": "object",
+                "customer_unique_id": "object",
+                "customer_zip_code_prefix": "int32",
+                "customer_city": "category",
+                "customer_state": "category",
+            },
+            "parse_dates": [],
+        },
+        "olist_geolocation": {
+            "dtype": {
+                "geolocation_zip_code_prefix": "int32",
+                "geolocation_lat": "float64",
+                "geolocation_lng": "float64",
+                "geolocation_city": "category",
+                "geolocation_state": "category",
+            },
+            "parse_dates": [],
+        },
+        "olist_order_items": {
+            "dtype": {
+                "order_id": "object",
+                "order_item_id": "int16",
+                "product_id": "category",
+                "seller_id": "category",
+                "price": "float64",
+                "freight_value": "float64",
+            },
+            "parse_dates": ["shipping_limit_date"],
+        },
+        "olist_order_payments": {
+            "dtype": {
+                "order_id": "object",
+                "payment_sequential": "int16",
+                "payment_type": "category",
+                "payment_installments": "int16",
+                "payment_value": "float64",
+            },
+            "parse_dates": [],
+        },
+        "olist_order_reviews": {
+            "dtype": {
+                "review_id": "object",
+                "order_id": "object",
+                "review_score": "int8",
+                "review_comment_title": "object",
+                "review_comment_message": "object",
+            },
+            "parse_dates": ["review_creation_date", "review_answer_timestamp"],
+        },
+        "olist_orders": {
+            "dtype": {
+                "order_id": "object",
+                "customer_id": "object",
+                "order_status": "category",
+            },
+            "parse_dates": [
+                "order_purchase_timestamp",
+                "order_approved_at",
+                "order_delivered_carrier_date",
+                "order_delivered_customer_date",
+                "order_estimated_delivery_date",
+            ],
+        },
+        "olist_products": {
+            "dtype": {
+                "product_id": "object",
+                "product_category_name": "category",
+                "product_name_lenght": "float32",
+                "product_description_lenght": "float32",
+                "product_photos_qty": "float32",
+                "product_weight_g": "float64",
+                "product_length_cm": "float32",
+                "product_height_cm": "float32",
+                "product_width_cm": "float32",
+            },
+            "parse_dates": [],
+        },
+        "olist_sellers": {
+            "dtype": {
+                "seller_id": "object",
+                "seller_zip_code_prefix": "int32",
+                "seller_city": "category",
+                "seller_state": "category",
+            },
+            "parse_dates": [],
+        },
+        "product_category_name_translation": {
+            "dtype": {
+                "product_category_name": "object",
+                "product_category_name_english": "object",
+            },
+            "parse_dates": [],
+        },
+    }
+
+
+def get_table_partitions() -> Dict[str, Tuple[str, List[str]]]:
+    """Definimos cómo se particiona cada tabla en el área de staging Parquet.
+
+    Cada tabla particionada se divide por el año y el mes de una columna de fecha, en
+    carpetas "<columna_año>=<año>/<columna_mes>=<mes>". Las tablas que no aparecen se
+    guardan en un único archivo.
+
+    Returns:
+        Dict[str, Tuple[str, List[str]]]: Diccionario con el nombre de la tabla como clave
+        y una tupla (columna de fecha, [columna del año, columna del mes]) como valor.
+    """
+    return {
+        "olist_orders": ("order_purchase_timestamp", ["purchase_year", "purchase_month"]),
+    }
+
+def get_query_columns() -> Dict[str, List[str]]:
+    """Definimos las columnas que leen las consultas de transformación y los resúmenes.
+
+    Sirve para leer del área de staging solo lo necesario (ver
+    src.extract.extract_staged). Incluye las llaves primarias de cada tabla para que la
+    carga incremental siga funcionando; las tablas que no aparecen no las lee ninguna
+    consulta.
+
+    Returns:
+        Dict[str, List[str]]: Diccionario con el nombre de la tabla y sus columnas.
+    """
+    return {
+        "olist_customers": ["customer_id", "customer_state"],
+        "olist_order_items": ["order_id", "order_item_id", "product_id", "price", "freight_value"],
+        "olist_order_payments": ["order_id", "payment_sequential", "payment_value"],
+        "olist_orders": [
+            "order_id",
+            "customer_id",
+            "order_status",
+            "order_purchase_timestamp",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+        ],
+        "olist_products": ["product_id", "product_category_name", "product_weight_g"],
+        "product_category_name_translation": [
+            "product_category_name",
+            "product_category_name_english",
+        ],
+    }
+
+def get_query_tables() -> Dict[str, List[str]]:
+    """Definimos las tablas que lee cada consulta de transformación.
+
+    Sirve para invalidar la caché de resultados (ver src.transform.get_query_dependencies)
+    y para que en el DAG cada consulta dependa solo de las tareas que cargan sus tablas.
+
+    Returns:
+        Dict[str, List[str]]: Diccionario con el nombre del resultado de la consulta como
+        clave y las tablas que lee como valor.
+    """
+    return {
+        "delivery_date_difference": ["summary_orders"],
+        "global_ammount_order_status": ["olist_orders"],
+        "revenue_by_month_year": ["summary_orders"],
+        "revenue_per_state": ["summary_orders"],
+        "top_10_least_revenue_categories": ["summary_category_revenue"],
+        "top_10_revenue_categories": ["summary_category_revenue"],
+        "real_vs_estimated_delivered_time": ["summary_orders"],
+        "orders_per_day_and_holidays_2017": ["summary_daily_orders", "public_holidays"],
+        "get_freight_value_weight_relationship": [
+            "olist_orders",
+            "olist_order_items",
+            "olist_products",
+        ],
+    }
+
+def get_table_primary_keys() -> Dict[str, List[str]]:
+    """Definimos la llave primaria natural de cada tabla para la carga incremental.
+
+    Las tablas sin llave natural (por ejemplo, olist_geolocation, que tiene filas repetidas)
+    tienen una lista vacía y se reemplazan completas cuando cambia su contenido.
+
+    Returns:
+        Dict[str, List[str]]: Diccionario con el nombre de la tabla y las columnas de su llave primaria.
+    """
+    return {
+        "olist_customers": ["customer_id"],
+        "olist_geolocation": [],
+        "olist_order_items": ["order_id", "order_item_id"],
+        "olist_order_payments": ["order_id", "payment_sequential"],
+        "olist_order_reviews": ["review_id", "order_id"],
+        "olist_orders": ["order_id"],
+        "olist_products": ["product_id"],
+        "olist_sellers": ["seller_id"],
+        "product_category_name_translation": ["product_category_name"],
+        "public_holidays": ["date", "name"],
+    }
+
+
+def get_table_high_water_marks() -> Dict[str, str]:
+    """Definimos la columna de marca de agua (high-water mark) de las tablas que la tienen.
+
+    La carga incremental guarda en etl_load_metadata el máximo de esta columna, que
+    indica hasta dónde llegan los datos cargados. No se usa para elegir las filas: una
+    fila antigua también puede cambiar (por ejemplo, el estado de un pedido), así que
+    las filas a escribir se eligen comparando el hash de cada una.
+
+    Returns:
+        Dict[str, str]: Diccionario con el nombre de la tabla y su columna de marca de agua.
+    """
+    return {
+        "olist_orders": "order_purchase_timestamp",
+        "olist_order_reviews": "review_answer_timestamp",
+    }
+
+
+def get_timestamp_columns() -> Dict[str, List[str]]:
+    """Definimos las columnas de fecha que se guardan con sus columnas numéricas derivadas.
+
+    src.load.load() agrega "<columna>_epoch", "_year", "_month" y "_day" (ver
+    src.load.add_timestamp_columns) solo a estas columnas, que son las que leen las
+    consultas, los resúmenes y la descarga de días festivos en lugar de llamar a
+    julianday() o strftime() en cada fila. Por eso son obligatorias: sin ellas
+    queries/summaries/summary_orders.sql y queries/orders_per_day_and_holidays.sql no se
+    pueden ejecutar. Las demás columnas de fecha no tienen columnas derivadas salvo que
+    se pidan en el argumento timestamp_columns de load().
+
+    Returns:
+        Dict[str, List[str]]: Diccionario con el nombre de la tabla y sus columnas de fecha con columnas derivadas.
+    """
+    return {
+        "olist_orders": [
+            "order_purchase_timestamp",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+        ],
+        "public_holidays": ["date"],
+    }
+
+
+def get_table_indexes() -> Dict[str, Tuple[str, List[str]]]:
+    """Definimos los índices que se crean después de cada carga.
+
+    Incluyen las llaves de los JOIN de las consultas (order_id, customer_id, product_id) y
+    un índice de cobertura para el filtro order_status = 'delivered'. Todos los nombres
+    empiezan por "ix_" para distinguirlos de los índices que crea SQLite.
+
+    Returns:
+        Dict[str, Tuple[str, List[str]]]: Diccionario con el nombre del índice como clave y
+        una tupla (tabla, columnas) como valor.
+    """
+    return {
+        "ix_olist_orders_delivered": (
+            "olist_orders",
+            ["order_status", "order_delivered_customer_date", "order_id", "customer_id"],
+        ),
+        "ix_olist_orders_order_id": ("olist_orders", ["order_id"]),
+        "ix_olist_orders_customer_id": ("olist_orders", ["customer_id"]),
+        "ix_olist_order_items_order_product": ("olist_order_items", ["order_id", "product_id"]),
+        "ix_olist_order_payments_order_value": (
+            "olist_order_payments",
+            ["order_id", "payment_value"],
+        ),
+        "ix_olist_customers_customer_state": ("olist_customers", ["customer_id", "customer_state"]),
+        "ix_olist_products_product_category": (
+            "olist_products",
+            ["product_id", "product_category_name"],
+        ),
+        "ix_product_category_name_translation_english": (
+            "product_category_name_translation",
+            ["product_category_name", "product_category_name_english"],
+        ),
+        "ix_public_holidays_date": ("public_holidays", ["date"]),
+        "ix_summary_orders_order_id": ("summary_orders", ["order_id"]),
+        "ix_summary_daily_orders_purchase_day": ("summary_daily_orders", ["purchase_day"]),
+        "ix_summary_order_categories_order_id": ("summary_order_categories", ["order_id"]),
+    }
+
+
+def get_summary_tables() -> Dict[str, Tuple[str, List[str]]]:
+    """Definimos las tablas de resumen que se materializan después de cada carga.
+
+    Cada tabla se calcula con queries/summaries/<tabla>.sql. La primera tabla de origen es
+    la tabla que guía el resumen: las filas que cambian en las demás tablas de origen se
+    traducen a su llave a través de una columna en común con ella. Las tablas se declaran
+    en orden de dependencia, ya que un resumen puede leer otro.
+
+    Returns:
+        Dict[str, Tuple[str, List[str]]]: Diccionario con el nombre de la tabla de resumen
+        como clave y una tupla (columna llave, tablas de origen) como valor.
+    """
+    return {
+        "summary_orders": (
+            "order_id",
+            ["olist_orders", "olist_order_payments", "olist_customers"],
+        ),
+        "summary_daily_orders": ("purchase_day", ["summary_orders"]),
+        "summary_order_categories": (
+            "order_id",
+            [
+                "olist_order_items",
+                "olist_orders",
+                "olist_products",
+                "product_category_name_translation",
+            ],
+        ),
+        "summary_category_revenue": (
+            "category",
+            ["summary_order_categories", "summary_orders"],
+        ),
+    }
@@ -0,0 +1,102 @@
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# Inputs above these sizes are downsampled before they are drawn
+MAX_SCATTER_POINTS = 10_000
+MAX_LINE_POINTS = 2_000
+
+
+def reservoir_sample(
+    data: Union[DataFrame, Iterable[DataFrame]], n: int, seed: int = 0
+) -> DataFrame:
+    """Uniform random sample of n rows, from a DataFrame or a stream of DataFrame chunks.
+
+    Every row gets a random key and the n rows with the smallest keys are kept, which
+    is a reservoir sample: memory is bounded by n plus one chunk whatever the number of
+    rows, and every row has the same probability of being kept. Rows keep their
+    original order.
+
+    Args:
+        data (Union[DataFrame, Iterable[DataFrame]]): The rows, at once or in chunks.
+        n (int): Size of the sample.
+        seed (int): Seed of the random keys.
+
+    Returns:
+        DataFrame: At most n rows.
+    """
+    chunks = [data] if isinstance(data, DataFrame) else data
+    rng = np.random.default_rng(seed)
+    reservoir, keys = None, np.empty(0)
+    for chunk in chunks:
+        candidates = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        candidate_keys = np.concatenate([keys, rng.random(len(chunk))])
+        if len(candidates) > n:
+            keep = np.sort(np.argpartition(candidate_keys, n)[:n])
+            candidates, candidate_keys = candidates.iloc[keep], candidate_keys[keep]
+        reservoir, keys = candidates, candidate_keys
+    return reservoir if reservoir is not None else DataFrame()
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling of a time series.
+
+    The first and last points are kept and the rest is split into n_out - 2 buckets;
+    from every bucket the point kept is the one forming the largest triangle with the
+    point kept from the previous bucket and the mean of the next bucket, which keeps
+    the peaks and valleys a plain stride would drop.
+
+    Args:
+        x (np.ndarray): Sorted x values (numbers or datetimes).
+        y (np.ndarray): y values.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Positions of the points kept, in increasing order.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x)
+    x = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    x, y = x.astype(np.float64), np.asarray(y, dtype=np.float64)
+
+    # Bucket i covers the points edges[i]:edges[i + 1] of x[1:-1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[end:edges[i + 2]].mean(), y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        previous_x, previous_y = x[kept[i]], y[kept[i]]
+        areas = np.abs(
+            (previous_x - next_x) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end]) * (next_y - previous_y)
+        )
+        kept[i + 1] = start + int(np.argmax(areas))
+    return kept
+
+
+def histogram_2d(
+    x: np.ndarray, y: np.ndarray, bins: int = 100
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count the points of a scatter in a bins x bins grid.
+
+    Args:
+        x (np.ndarray): x values.
+        y (np.ndarray): y values.
+        bins (int): Number of bins per axis.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Counts (x bins by y bins), x edges and
+        y edges, as returned by np.histogram2d. Missing values are ignored.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return np.histogram2d(x[valid], y[valid], bins=bins)
@@ -1,16 +1,29 @@
-# Importamos Dict de typing para anotar tipos de datos en las funciones (en este caso, diccionarios)
-from typing import Dict
+# Importamos Dict, Iterator, Optional y Tuple de typing para anotar tipos de datos en las funciones
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Importamos los ejecutores de concurrent.futures para leer los CSV en paralelo
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Importamos la librería requests para realizar solicitudes HTTP a APIs externas
 import requests
 
-# Importamos el módulo json para convertir cadenas JSON a estructuras de datos de Python (como diccionarios)
-import json
-
 # Importamos DataFrame, read_csv y to_datetime de pandas para manipular datos en formato tabular,
 # leer archivos CSV y convertir columnas a tipo datetime, respectivamente
 from pandas import DataFrame, read_csv, to_datetime
 
+# Importamos el registro de esquemas para leer cada tabla con tipos explícitos
+from src.compaction import compact_frames
+from src.config import STAGING_ROOT_PATH, get_table_partitions, get_table_schemas
+
+# Importamos el proveedor de días festivos (caché en disco, reintentos y modo sin conexión)
+from src.holidays import HolidaysProvider, get_order_years
+
+# Importamos el decorador de telemetría, que mide tiempo, CPU, memoria y filas de cada etapa
+from src.telemetry import instrument
+
+# Importamos el área de staging Parquet (conversión única de cada CSV y lectura con poda)
+from src.staging import read_staged_table, stage
+
 
 # Función para leer datos de temperatura desde un archivo CSV y devolverlos como un DataFrame
 def temp() -> DataFrame:
@@ -25,6 +38,7 @@ def temp() -> DataFrame:
 
 
 # Función para obtener los días festivos de Brasil desde una API pública y devolverlos como un DataFrame
+@instrument()
 def get_public_holidays(public_holidays_url: str, year: str) -> DataFrame:
     """
     Obtiene los días festivos de Brasil desde una API pública.
@@ -54,66 +68,142 @@ def get_public_holidays(public_holidays_url: str, year: str) -> DataFrame:
     #------------------------------------------------------------------------------------------------------------- 
 
 
-    # Realizamos una solicitud HTTP GET a la API, construyendo la URL con el año y el código de Brasil ("BR")
-    response = requests.get(f"{public_holidays_url}/{year}/BR")
-
     try:
-        # Verificamos que la respuesta HTTP sea exitosa; si no, lanza una excepción HTTPError
-        response.raise_for_status()  # Lanzamos una excepción si la solicitud falla (por ejemplo, 404 o 500)
-
-        # Convertimos el texto de la respuesta (en formato JSON) a un diccionario de Python
-        data = json.loads(response.text)
-        # Creamos un DataFrame a partir del diccionario obtenido de la respuesta JSON
-        df = DataFrame(data)
-
-        # Convertimos la columna "date" a tipo datetime para un manejo adecuado de las fechas
-        df["date"] = to_datetime(df["date"])
-
-        # Eliminamos las columnas "types" y "counties", ya que no son necesarias para el análisis
-        df = df.drop(columns=["types", "counties"])
+        # Delegamos en HolidaysProvider, que reutiliza la caché en disco y reintenta las solicitudes fallidas
+        df = HolidaysProvider(public_holidays_url).fetch(year)
 
         # Imprimos un mensaje de éxito indicando que los días festivos fueron extraídos correctamente
         print("✅🎉 Días Festivos Extraídos Correctamente.")
         # Retornamos el DataFrame con los días festivos procesados
         return df
 
-    except requests.exceptions.HTTPError as err:
-        # Si ocurre un error HTTP, imprime un mensaje de error detallando el problema
+    except (requests.exceptions.RequestException, OSError) as err:
+        # Si ocurre un error HTTP (o no existe el archivo local), imprime un mensaje de error detallando el problema
         print(f"❌ Error al Obtener Días Festivos: {err}")
         # Finalizamos la ejecución del programa lanzando SystemExit con el error obtenido
         raise SystemExit(err)
 
 
+# Función para obtener los días festivos de todos los años presentes en los pedidos, en una sola llamada
+@instrument()
+def get_public_holidays_for_years(public_holidays_url: str, years: List[str]) -> DataFrame:
+    """
+    Obtiene los días festivos de Brasil para varios años, descargándolos al mismo tiempo.
+
+    Args:
+        public_holidays_url (str): URL base de la API de días festivos.
+        years (List[str]): Años para los cuales se deben obtener los días festivos.
+
+    Raises:
+        SystemExit: Si alguna de las solicitudes HTTP falla.
+
+    Returns:
+        DataFrame: Un DataFrame con los días festivos de todos los años, sin las columnas "types" y "counties".
+    """
+    try:
+        df = HolidaysProvider(public_holidays_url).fetch_many(years)
+        print(f"✅🎉 Días Festivos Extraídos Correctamente ({', '.join(sorted(set(years)))}).")
+        return df
+
+    except (requests.exceptions.RequestException, OSError) as err:
+        print(f"❌ Error al Obtener Días Festivos: {err}")
+        raise SystemExit(err)
+
+
+# Función para leer un archivo CSV aplicando el esquema de tipos registrado para su tabla
+def read_table_csv(csv_path: str, table_name: str, engine: str = "c") -> DataFrame:
+    """
+    Lee un archivo CSV aplicando el esquema de tipos de su tabla.
+
+    Args:
+        csv_path (str): Ruta del archivo CSV.
+        table_name (str): Nombre de la tabla, usado para buscar su esquema en get_table_schemas().
+        engine (str): Motor de lectura de pandas ("c" o "pyarrow").
+
+    Returns:
+        DataFrame: Un DataFrame con columnas categóricas, numéricas de ancho fijo y fechas ya convertidas.
+    """
+    # Buscamos el esquema de la tabla; si no está registrado, pandas infiere los tipos como antes
+    schema = get_table_schemas().get(table_name, {})
+    parse_dates = schema.get("parse_dates", [])
+
+    df = read_csv(
+        csv_path,
+        dtype=schema.get("dtype"),
+        parse_dates=parse_dates or False,
+        engine=engine,
+    )
+
+    # Unificamos la resolución de las fechas (pyarrow devuelve datetime64[s])
+    for column in parse_dates:
+        df[column] = to_datetime(df[column]).astype("datetime64[ns]")
+
+    return df
+
+
 # Función para extraer datos de múltiples archivos CSV y de una API externa, combinándolos en un diccionario de DataFrames
+@instrument()
 def extract(
-    csv_folder: str, csv_table_mapping: Dict[str, str], public_holidays_url: str
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    public_holidays_url: str,
+    engine: str = "c",
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    compact: bool = False,
 ) -> Dict[str, DataFrame]:
     """
     Extrae datos de múltiples archivos CSV y de una API externa.
 
+    Los archivos CSV se leen al mismo tiempo en un pool de hilos (o de procesos) y cada
+    tabla se tipa con el esquema definido en get_table_schemas().
+
     Args:
         csv_folder (str): Ruta de la carpeta donde están los archivos CSV.
         csv_table_mapping (Dict[str, str]): Diccionario que mapea nombres de archivos CSV a nombres de tablas.
         public_holidays_url (str): URL base de la API de días festivos.
+        engine (str): Motor de lectura de pandas ("c" o "pyarrow").
+        max_workers (Optional[int]): Número máximo de lecturas simultáneas. Por defecto, una por archivo.
+        use_processes (bool): Si es True, usa un pool de procesos en lugar de un pool de hilos.
+        compact (bool): Si es True, compacta los DataFrames en memoria (ver compact_tables()).
 
     Returns:
         Dict[str, DataFrame]: Un diccionario con los nombres de las tablas como claves y los DataFrames como valores.
     """
 
     try:
-        # Creamos un diccionario "dataframes" donde cada clave es el nombre de la tabla y cada valor es un DataFrame
-        # obtenido leyendo el archivo CSV correspondiente (la ruta se construye concatenando "csv_folder" y el nombre del archivo CSV)
-        dataframes = {
-            table_name: read_csv(f"{csv_folder}/{csv_file}")
-            for csv_file, table_name in csv_table_mapping.items()
-        }
-        # Imprimimos un mensaje de éxito indicando que los archivos CSV han sido extraídos correctamente
-        print("✅🎉 Archivos CSV Extraídos Correctamente.")
-
-        # Llamamos a la función get_public_holidays para obtener los días festivos para el año 2017
-        holidays = get_public_holidays(public_holidays_url, "2017")
-        # Agregamos el DataFrame de días festivos al diccionario "dataframes" bajo la clave "public_holidays"
-        dataframes["public_holidays"] = holidays
+        # Elegimos el tipo de pool; con pyarrow o con el motor "c" la lectura libera el GIL en gran parte
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        workers = max_workers or max(len(csv_table_mapping), 1)
+
+        with executor_class(max_workers=workers) as executor, ThreadPoolExecutor(max_workers=1) as holidays_executor:
+            # Lanzamos la lectura de cada archivo CSV (la ruta se construye concatenando "csv_folder" y el nombre del archivo CSV)
+            futures = {
+                table_name: executor.submit(
+                    read_table_csv, f"{csv_folder}/{csv_file}", table_name, engine
+                )
+                for csv_file, table_name in csv_table_mapping.items()
+            }
+
+            # Apenas termina la lectura de olist_orders, descargamos los días festivos de todos sus años
+            # mientras el resto de los CSV se sigue leyendo
+            orders_future = futures.get("olist_orders")
+            years = get_order_years(orders_future.result()) if orders_future else []
+            holidays_future = holidays_executor.submit(
+                get_public_holidays_for_years, public_holidays_url, years or ["2017"]
+            )
+
+            # Creamos el diccionario "dataframes" respetando el orden del mapeo
+            dataframes = {table_name: future.result() for table_name, future in futures.items()}
+
+            # Imprimimos un mensaje de éxito indicando que los archivos CSV han sido extraídos correctamente
+            print("✅🎉 Archivos CSV Extraídos Correctamente.")
+
+            # Agregamos el DataFrame de días festivos al diccionario "dataframes" bajo la clave "public_holidays"
+            dataframes["public_holidays"] = holidays_future.result()
+
+        if compact:
+            dataframes = compact_tables(dataframes)
 
         # Imprimimos un mensaje final de éxito indicando que la extracción de datos se completó correctamente
         print("✅🎉 Extracción Completada con Éxito.")
@@ -125,5 +215,163 @@ def extract(
         print(f"❌ Error en la Extracción: {e}")
         # Retornamos un diccionario vacío para indicar que la extracción falló
         return {}
-    
-    
+
+
+# Función para extraer los datos desde el área de staging Parquet, leyendo solo las columnas y particiones necesarias
+@instrument()
+def extract_staged(
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    public_holidays_url: str,
+    staging_folder: str = STAGING_ROOT_PATH,
+    columns: Optional[Dict[str, List[str]]] = None,
+    filters: Optional[Dict[str, List[tuple]]] = None,
+    max_workers: Optional[int] = None,
+    compact: bool = False,
+) -> Dict[str, DataFrame]:
+    """
+    Extrae los datos desde el área de staging Parquet en lugar de volver a leer los CSV.
+
+    Primero se convierten a Parquet los CSV que cambiaron desde la última vez (ver
+    src.staging.stage); los demás ya están en staging y no se vuelven a parsear. Luego
+    cada tabla se lee con sus columnas y filtros: los filtros sobre las columnas de
+    partición (por ejemplo, [("purchase_year", "=", 2017)] en olist_orders) descartan
+    carpetas completas. Con columns=get_query_columns() se lee solo lo que usan las
+    consultas de transformación.
+
+    Args:
+        csv_folder (str): Ruta de la carpeta donde están los archivos CSV.
+        csv_table_mapping (Dict[str, str]): Diccionario que mapea nombres de archivos CSV a nombres de tablas.
+        public_holidays_url (str): URL base de la API de días festivos.
+        staging_folder (str): Carpeta raíz del área de staging.
+        columns (Optional[Dict[str, List[str]]]): Columnas a leer por tabla. Las tablas que no aparecen se leen completas.
+        filters (Optional[Dict[str, List[tuple]]]): Filtros por tabla, en el formato de pyarrow.parquet.read_table().
+        max_workers (Optional[int]): Número máximo de lecturas simultáneas. Por defecto, una por archivo.
+        compact (bool): Si es True, compacta los DataFrames en memoria (ver compact_tables()).
+
+    Returns:
+        Dict[str, DataFrame]: Un diccionario con los nombres de las tablas como claves y los DataFrames como valores.
+    """
+    columns = columns or {}
+    filters = filters or {}
+
+    try:
+        stage(csv_folder, csv_table_mapping, staging_folder, max_workers)
+
+        workers = max_workers or max(len(csv_table_mapping), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                table_name: executor.submit(
+                    read_staged_table,
+                    table_name,
+                    staging_folder,
+                    columns.get(table_name),
+                    filters.get(table_name),
+                )
+                for table_name in csv_table_mapping.values()
+            }
+            dataframes = {table_name: future.result() for table_name, future in futures.items()}
+
+        print("✅🎉 Tablas Leídas desde el Staging Parquet.")
+
+        # Los años de los días festivos salen de la columna de partición, sin leer las fechas
+        years = []
+        if "olist_orders" in dataframes:
+            year_column = get_table_partitions()["olist_orders"][1][0]
+            staged_years = read_staged_table(
+                "olist_orders", staging_folder, [year_column], filters.get("olist_orders")
+            )[year_column]
+            years = [str(year) for year in sorted(staged_years.dropna().unique())]
+        dataframes["public_holidays"] = get_public_holidays_for_years(
+            public_holidays_url, years or ["2017"]
+        )
+
+        if compact:
+            dataframes = compact_tables(dataframes)
+
+        print("✅🎉 Extracción Completada con Éxito.")
+        return dataframes
+
+    except Exception as e:
+        print(f"❌ Error en la Extracción: {e}")
+        return {}
+
+
+# Función para reducir la memoria de las tablas extraídas e informar los bytes ahorrados por tabla
+def compact_tables(dataframes: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+    """
+    Compacta en memoria las tablas extraídas (ver src.compaction.compact_frames).
+
+    Las columnas de pocos valores (order_status, customer_state, product_category_name,
+    payment_type, ...) pasan a categóricas y los números se reducen al tipo más chico
+    que los contiene. Los identificadores hexadecimales ("*_id") se codifican con un
+    diccionario por columna compartido por todas las tablas: cada fila guarda un código
+    entero y el texto de cada identificador se guarda una sola vez. Siguen siendo
+    categóricas con sus valores originales, así que load() (también en modo
+    incremental) guarda los mismos identificadores y las consultas dan los mismos
+    resultados que sin compactar.
+
+    Args:
+        dataframes (Dict[str, DataFrame]): Las tablas extraídas.
+
+    Returns:
+        Dict[str, DataFrame]: Las tablas compactadas, en el mismo orden.
+    """
+    compacted, report, _ = compact_frames(dataframes, categorical_ids=True)
+    for row in report.itertuples():
+        print(
+            f"🗜️  {row.table}: {row.bytes_before / 2**20:.1f} MB → "
+            f"{row.bytes_after / 2**20:.1f} MB ({row.ratio:.1f}x)"
+        )
+    print(f"✅🎉 Tablas Compactadas: {report['bytes_saved'].sum() / 2**20:.1f} MB ahorrados.")
+    return compacted
+
+
+# Función generadora que lee los CSV por bloques de tamaño fijo, sin cargar nunca una tabla completa en memoria
+def extract_stream(
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    public_holidays_url: str,
+    chunksize: int = 100_000,
+) -> Iterator[Tuple[str, DataFrame]]:
+    """
+    Extrae los datos como un flujo de bloques (nombre de tabla, DataFrame).
+
+    A diferencia de extract(), cada archivo CSV se lee en bloques de "chunksize" filas y se
+    entrega apenas se lee, de modo que la memoria usada depende del tamaño del bloque y no
+    del tamaño de la tabla. Al final se entrega el DataFrame de días festivos de todos los
+    años encontrados en olist_orders.
+
+    Args:
+        csv_folder (str): Ruta de la carpeta donde están los archivos CSV.
+        csv_table_mapping (Dict[str, str]): Diccionario que mapea nombres de archivos CSV a nombres de tablas.
+        public_holidays_url (str): URL base de la API de días festivos.
+        chunksize (int): Número de filas por bloque.
+
+    Yields:
+        Tuple[str, DataFrame]: El nombre de la tabla y un bloque de sus filas.
+    """
+    years = set()
+    for csv_file, table_name in csv_table_mapping.items():
+        # Leemos el CSV por bloques aplicando el mismo esquema de tipos que extract()
+        schema = get_table_schemas().get(table_name, {})
+        parse_dates = schema.get("parse_dates", [])
+        reader = read_csv(
+            f"{csv_folder}/{csv_file}",
+            dtype=schema.get("dtype"),
+            parse_dates=parse_dates or False,
+            chunksize=chunksize,
+        )
+        with reader:
+            for chunk in reader:
+                for column in parse_dates:
+                    chunk[column] = to_datetime(chunk[column]).astype("datetime64[ns]")
+                if table_name == "olist_orders":
+                    years.update(get_order_years(chunk))
+                yield table_name, chunk
+
+        # Imprimimos un mensaje de éxito por cada archivo leído completamente
+        print(f"✅ Archivo '{csv_file}' Extraído por Bloques.")
+
+    # Los días festivos son pocas filas, por lo que se entregan en un único bloque
+    yield "public_holidays", get_public_holidays_for_years(public_holidays_url, sorted(years) or ["2017"])
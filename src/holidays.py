@@ -0,0 +1,211 @@
+# Importamos json, os y time para leer/escribir la caché en disco y controlar su vigencia (TTL)
+import json
+import os
+import time
+
+# Importamos el pool de hilos para descargar varios años al mismo tiempo
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+from urllib.parse import unquote, urlparse
+
+# Importamos requests junto con el adaptador y la política de reintentos de urllib3
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pandas import DataFrame, to_datetime
+
+from src.config import HOLIDAYS_CACHE_ROOT_PATH
+
+
+# Columnas de los días festivos tras quitar "types" y "counties"; las tiene también el
+# DataFrame de una respuesta vacía
+HOLIDAY_COLUMNS = ["date", "localName", "name", "countryCode", "fixed", "global", "launchYear"]
+
+
+class HolidaysProvider:
+    """Obtiene días festivos públicos con caché en disco, reintentos y modo sin conexión.
+
+    Las respuestas se guardan en disco por (país, año) y se reutilizan mientras no
+    superen el TTL. Las solicitudes HTTP usan una única requests.Session (con pool de
+    conexiones), timeouts y reintentos con backoff. Si la URL base empieza por "file://",
+    los datos se leen de "<carpeta>/<año>/<país>.json" sin usar la red.
+    """
+
+    def __init__(
+        self,
+        public_holidays_url: str,
+        cache_path: Optional[str] = HOLIDAYS_CACHE_ROOT_PATH,
+        ttl_seconds: int = 30 * 24 * 60 * 60,
+        timeout: float = 10.0,
+        retries: int = 3,
+    ):
+        """
+        Args:
+            public_holidays_url (str): URL base de la API de días festivos o carpeta "file://".
+            cache_path (Optional[str]): Carpeta de la caché en disco. None la desactiva.
+            ttl_seconds (int): Segundos que una respuesta en caché se considera vigente.
+            timeout (float): Timeout de cada solicitud HTTP, en segundos.
+            retries (int): Número de reintentos ante errores de conexión o respuestas 429/5xx.
+        """
+        self.public_holidays_url = public_holidays_url.rstrip("/")
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+
+        # Creamos una sesión con pool de conexiones y reintentos con backoff exponencial
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _cache_file(self, country: str, year: str) -> str:
+        return os.path.join(self.cache_path, f"{country}_{year}.json")
+
+    def _read_cache(self, country: str, year: str, max_age: Optional[float]) -> Optional[list]:
+        """Leemos la caché si existe y tiene menos de max_age segundos (None ignora la edad)."""
+        if not self.cache_path:
+            return None
+        path = self._cache_file(country, year)
+        if not os.path.exists(path):
+            return None
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_cache(self, country: str, year: str, data: list):
+        if not self.cache_path:
+            return
+        os.makedirs(self.cache_path, exist_ok=True)
+        path = self._cache_file(country, year)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _download(self, country: str, year: str) -> list:
+        """Descargamos los días festivos de la API (o de la carpeta local "file://")."""
+        if self.public_holidays_url.startswith("file://"):
+            folder = unquote(urlparse(self.public_holidays_url).path)
+            with open(os.path.join(folder, year, f"{country}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        response = self.session.get(
+            f"{self.public_holidays_url}/{year}/{country}", timeout=self.timeout
+        )
+        # Lanzamos una excepción HTTPError si la solicitud falla (por ejemplo, 404 o 500)
+        response.raise_for_status()
+        return json.loads(response.text)
+
+    def fetch_raw(self, year: str, country: str = "BR") -> list:
+        """
+        Obtiene la respuesta JSON de un año, usando la caché cuando está vigente.
+
+        Si la descarga falla y existe una copia vencida en caché, se usa esa copia.
+
+        Args:
+            year (str): Año a consultar.
+            country (str): Código del país.
+
+        Raises:
+            requests.exceptions.RequestException: Si la descarga falla y no hay caché.
+
+        Returns:
+            list: Lista de días festivos tal como la devuelve la API.
+        """
+        year = str(year)
+        data = self._read_cache(country, year, self.ttl_seconds)
+        if data is not None:
+            return data
+        try:
+            data = self._download(country, year)
+        except (requests.exceptions.RequestException, OSError):
+            stale = self._read_cache(country, year, None)
+            if stale is None:
+                raise
+            print(f"⚠️ Usando Días Festivos en Caché Vencida para {country} {year}.")
+            return stale
+        if not self.public_holidays_url.startswith("file://"):
+            self._write_cache(country, year, data)
+        return data
+
+    @staticmethod
+    def to_dataframe(data: list) -> DataFrame:
+        """Convertimos la respuesta en DataFrame, con "date" como datetime y sin "types" ni "counties".
+
+        Una respuesta vacía da un DataFrame vacío con las columnas de HOLIDAY_COLUMNS.
+        """
+        if not data:
+            return DataFrame({column: [] for column in HOLIDAY_COLUMNS}).astype(
+                {"date": "datetime64[ns]"}
+            )
+        df = DataFrame(data)
+        df["date"] = to_datetime(df["date"])
+        return df.drop(columns=["types", "counties"], errors="ignore")
+
+    def fetch(self, year: str, country: str = "BR") -> DataFrame:
+        """
+        Obtiene los días festivos de un año como DataFrame.
+
+        Args:
+            year (str): Año a consultar.
+            country (str): Código del país.
+
+        Returns:
+            DataFrame: Días festivos, con "date" como datetime y sin las columnas "types" y "counties".
+        """
+        return self.to_dataframe(self.fetch_raw(year, country))
+
+    def _fetch_year(self, year: str, country: str) -> list:
+        """Obtenemos un año para fetch_many(), omitiendo los años sin archivo en el modo sin conexión."""
+        try:
+            return self.fetch_raw(year, country)
+        except FileNotFoundError:
+            if not self.public_holidays_url.startswith("file://"):
+                raise
+            print(f"⚠️ Sin Días Festivos de {country} {year} en {self.public_holidays_url}: se Omite el Año.")
+            return []
+
+    def fetch_many(self, years: Iterable[str], country: str = "BR") -> DataFrame:
+        """
+        Obtiene los días festivos de varios años al mismo tiempo y los concatena.
+
+        En el modo sin conexión ("file://"), los años que no tienen archivo en la carpeta
+        se omiten con un aviso, ya que los datos de ejemplo no cubren todos los años.
+
+        Args:
+            years (Iterable[str]): Años a consultar.
+            country (str): Código del país.
+
+        Returns:
+            DataFrame: Días festivos de todos los años, ordenados por año.
+        """
+        years = sorted({str(year) for year in years})
+        with ThreadPoolExecutor(max_workers=max(len(years), 1)) as executor:
+            responses = list(executor.map(lambda year: self._fetch_year(year, country), years))
+        data = [holiday for response in responses for holiday in response]
+        return self.to_dataframe(data)
+
+
+def get_order_years(orders: DataFrame, column: str = "order_purchase_timestamp") -> List[str]:
+    """
+    Obtiene los años presentes en los pedidos.
+
+    Args:
+        orders (DataFrame): DataFrame de la tabla olist_orders.
+        column (str): Columna de fecha de la que se toman los años.
+
+    Returns:
+        List[str]: Años ordenados, como texto.
+    """
+    years = to_datetime(orders[column]).dt.year.dropna().astype(int).unique()
+    return [str(year) for year in sorted(years)]
+
@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional
+
+from pandas import DataFrame, read_sql
+from sqlalchemy.engine.base import Engine
+
+from src.config import get_table_indexes
+
+# Prefijo de los índices administrados por este módulo
+INDEX_PREFIX = "ix_"
+
+
+def _existing_tables(cursor) -> List[str]:
+    """Devolvemos las tablas que existen en la base de datos."""
+    rows = cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    return [row[0] for row in rows]
+
+
+def _existing_indexes(cursor) -> Dict[str, str]:
+    """Devolvemos los índices administrados que existen, con la tabla a la que pertenecen."""
+    # substr() y no LIKE 'ix_%': en LIKE el "_" es un comodín y "ixa..." también coincidiría
+    rows = cursor.execute(
+        "SELECT name, tbl_name FROM sqlite_master "
+        "WHERE type = 'index' AND substr(name, 1, ?) = ?",
+        (len(INDEX_PREFIX), INDEX_PREFIX),
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _index_columns(cursor, index_name: str) -> List[str]:
+    """Devolvemos las columnas de un índice en orden."""
+    rows = cursor.execute(f'PRAGMA index_info("{index_name}")').fetchall()
+    return [row[2] for row in sorted(rows)]
+
+
+def create_indexes(
+    database: Engine, analyze: bool = True, tables: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Creamos y mantenemos los índices declarados en get_table_indexes().
+
+    Es idempotente: los índices que ya existen con las mismas columnas no se tocan, los
+    que cambiaron de definición se recrean y los índices "ix_" que ya no están declarados
+    se eliminan. Los índices de tablas que no existen se omiten. Al final se ejecuta
+    ANALYZE para que el planificador use estadísticas actualizadas.
+
+    Con "tables" solo se tocan los índices de esas tablas y solo ellas se analizan, de
+    modo que varias tareas que cargan tablas distintas pueden llamarla al mismo tiempo.
+
+    Args:
+        database (Engine): Conexión a la base de datos SQLite.
+        analyze (bool): Si es True, ejecuta ANALYZE después de crear los índices.
+        tables (Optional[List[str]]): Tablas cuyos índices se crean. Por defecto, todas.
+
+    Returns:
+        List[str]: Nombres de los índices creados o recreados.
+    """
+    declared = get_table_indexes()
+    if tables is not None:
+        declared = {
+            index_name: (table_name, columns)
+            for index_name, (table_name, columns) in declared.items()
+            if table_name in tables
+        }
+    created = []
+
+    raw_conn = database.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        existing_tables = set(_existing_tables(cursor))
+        existing = _existing_indexes(cursor)
+
+        # Eliminamos los índices administrados que ya no están declarados
+        for index_name, table_name in existing.items():
+            if index_name not in declared and (tables is None or table_name in tables):
+                cursor.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+
+        for index_name, (table_name, columns) in declared.items():
+            if table_name not in existing_tables:
+                continue
+            if index_name in existing:
+                if existing[index_name] == table_name and _index_columns(cursor, index_name) == columns:
+                    continue
+                cursor.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+            column_list = ", ".join(f'"{column}"' for column in columns)
+            cursor.execute(f'CREATE INDEX "{index_name}" ON "{table_name}" ({column_list})')
+            created.append(index_name)
+
+        if analyze and tables is None:
+            cursor.execute("ANALYZE")
+        elif analyze:
+            for table_name in tables:
+                if table_name in existing_tables:
+                    cursor.execute(f'ANALYZE "{table_name}"')
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+    print(f"✅ Índices Actualizados ({len(created)} creados) y Estadísticas Recalculadas.")
+    return created
+
+
+def get_index_sizes(database: Engine) -> Optional[DataFrame]:
+    """
+    Obtenemos el tamaño en disco de cada índice de la base de datos.
+
+    Usa la tabla virtual dbstat de SQLite; si la versión de SQLite no la incluye,
+    devuelve None.
+
+    Args:
+        database (Engine): Conexión a la base de datos SQLite.
+
+    Returns:
+        Optional[DataFrame]: DataFrame con las columnas "index_name", "table_name", "pages"
+        y "size_bytes", ordenado de mayor a menor tamaño.
+    """
+    query = """
+        SELECT
+            m.name AS index_name,
+            m.tbl_name AS table_name,
+            COUNT(*) AS pages,
+            SUM(s.pgsize) AS size_bytes
+        FROM sqlite_master m
+        JOIN dbstat s ON s.name = m.name
+        WHERE m.type = 'index'
+        GROUP BY m.name, m.tbl_name
+        ORDER BY size_bytes DESC
+    """
+    try:
+        with database.connect() as connection:
+            return read_sql(query, connection.connection)
+    except Exception as e:
+        print(f"⚠️ No se pudo Obtener el Tamaño de los Índices: {e}")
+        return None
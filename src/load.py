@@ -1,37 +1,735 @@
-from typing import Dict
-from pandas import DataFrame
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from pandas import DataFrame, Series, Timedelta, Timestamp, concat, to_datetime
+from pandas.api import types
+from pandas.util import hash_pandas_object
 from sqlalchemy.engine.base import Engine
 
-def load(data_frames: Dict[str, DataFrame], database: Engine):
+from src.compaction import has_surrogate_keys
+from src.config import (
+    get_summary_tables,
+    get_table_high_water_marks,
+    get_table_primary_keys,
+    get_timestamp_columns,
+)
+from src.indexes import create_indexes
+from src.summaries import read_summary_query, refresh_summaries
+from src.telemetry import instrument
+
+# Formato con el que se guardan las fechas en SQLite (el mismo que usa to_sql)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Día juliano del 1970-01-01 00:00:00 (época Unix)
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Tabla donde la carga incremental guarda el checksum y la marca de agua de cada tabla
+LOAD_METADATA_TABLE = "etl_load_metadata"
+
+# Tabla donde la carga incremental guarda el hash de la llave y de cada fila cargada
+ROW_HASHES_TABLE = "etl_row_hashes"
+
+# Tabla temporal con las llaves primarias del DataFrame, para encontrar las filas borradas
+CURRENT_KEYS_TABLE = "etl_current_keys"
+
+# journal_mode admitidos durante la carga. OFF no está: sin diario el ROLLBACK queda
+# indefinido y una tabla que falla podría dejar la base a medio escribir
+JOURNAL_MODES = ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY")
+
+
+def add_timestamp_columns(
+    df: DataFrame, julian_days: bool = False, columns: Optional[List[str]] = None
+) -> DataFrame:
+    """
+    Agregamos columnas numéricas derivadas de las columnas de fecha del DataFrame.
+
+    Por cada columna datetime "<columna>" se agregan "<columna>_epoch" (segundos desde
+    1970-01-01, entero) y "<columna>_year", "<columna>_month" y "<columna>_day" (enteros).
+    Con julian_days=True también se agrega "<columna>_julian" (día juliano, REAL, el mismo
+    valor que devuelve julianday() en SQLite). Los valores nulos quedan como NULL.
+
+    Args:
+        df (DataFrame): DataFrame con columnas datetime.
+        julian_days (bool): Si es True, agrega también las columnas "<columna>_julian".
+        columns (Optional[List[str]]): Columnas de fecha a las que se agregan columnas
+            derivadas; las que no están en el DataFrame se ignoran. Por defecto, todas.
+
+    Returns:
+        DataFrame: Una copia del DataFrame con las columnas derivadas, o el mismo
+        DataFrame si no tiene columnas de fecha que derivar.
+    """
+    date_columns = [
+        column
+        for column in df.columns
+        if types.is_datetime64_any_dtype(df[column].dtype) and (columns is None or column in columns)
+    ]
+    if not date_columns:
+        return df
+
+    derived = {}
+    for column in date_columns:
+        dates = df[column]
+        seconds = (dates - Timestamp("1970-01-01")) // Timedelta(seconds=1)
+        derived[f"{column}_epoch"] = seconds.astype("Int64")
+        derived[f"{column}_year"] = dates.dt.year.astype("Int16")
+        derived[f"{column}_month"] = dates.dt.month.astype("Int8")
+        derived[f"{column}_day"] = dates.dt.day.astype("Int8")
+        if julian_days:
+            derived[f"{column}_julian"] = seconds / 86400 + UNIX_EPOCH_JULIAN_DAY
+
+    return df.assign(**derived)
+
+
+def _column_affinity(dtype) -> str:
+    """Devolvemos la afinidad de SQLite que corresponde a un dtype de pandas."""
+    if types.is_bool_dtype(dtype) or types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _create_table_sql(
+    table_name: str, df: DataFrame, primary_key: Optional[List[str]] = None
+) -> str:
+    """Construimos el DDL CREATE TABLE con la afinidad explícita de cada columna."""
+    columns = [f'"{column}" {_column_affinity(df[column].dtype)}' for column in df.columns]
+    if primary_key:
+        columns.append("PRIMARY KEY (" + ", ".join(f'"{column}"' for column in primary_key) + ")")
+    return f'CREATE TABLE "{table_name}" ({", ".join(columns)})'
+
+
+def _insert_sql(table_name: str, columns: List[str]) -> str:
+    """Construimos la sentencia INSERT parametrizada que se reutiliza en cada lote."""
+    names = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    return f'INSERT INTO "{table_name}" ({names}) VALUES ({placeholders})'
+
+
+def _upsert_sql(table_name: str, columns: List[str], primary_key: List[str]) -> str:
+    """Construimos la sentencia INSERT ... ON CONFLICT DO UPDATE sobre la llave primaria."""
+    conflict = ", ".join(f'"{column}"' for column in primary_key)
+    updates = ", ".join(
+        f'"{column}" = excluded."{column}"' for column in columns if column not in primary_key
+    )
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    return f"{_insert_sql(table_name, columns)} ON CONFLICT ({conflict}) {action}"
+
+
+def _table_checksum(df: DataFrame) -> str:
+    """Calculamos un checksum del contenido del DataFrame (independiente del índice)."""
+    return hashlib.sha256(hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+
+def get_load_checksum(
+    table_name: str,
+    df: DataFrame,
+    julian_days: bool = False,
+    timestamp_columns: Optional[Dict[str, List[str]]] = None,
+) -> str:
+    """
+    Calculamos el checksum que load() guarda en etl_load_metadata al cargar el DataFrame.
+
+    Sirve para comprobar que una carga terminó: load() informa los errores sin lanzarlos,
+    y en el modo "incremental" una carga fallida deja la tabla anterior intacta.
+
+    Args:
+        table_name (str): Nombre de la tabla.
+        df (DataFrame): DataFrame tal como se pasa a load().
+        julian_days (bool): El mismo valor que se pasó a load().
+        timestamp_columns (Optional[Dict[str, List[str]]]): El mismo valor que se pasó a load().
+
+    Returns:
+        str: El checksum del DataFrame con sus columnas de fecha derivadas.
+    """
+    if timestamp_columns is None:
+        timestamp_columns = get_timestamp_columns()
+    return _table_checksum(
+        add_timestamp_columns(df, julian_days, timestamp_columns.get(table_name, []))
+    )
+
+
+def _iter_batches(df: DataFrame, batch_size: int) -> Iterator[List[tuple]]:
+    """Convertimos el DataFrame en lotes de tuplas con tipos nativos de Python.
+
+    Las fechas se formatean como texto. Los valores nulos quedan como NaN (o None en las
+    columnas enteras con nulos), que SQLite guarda como NULL al enlazar el parámetro.
+    """
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start : start + batch_size]
+        columns = []
+        for column in batch.columns:
+            series = batch[column]
+            if types.is_datetime64_any_dtype(series.dtype):
+                series = series.dt.strftime(TIMESTAMP_FORMAT)
+            elif types.is_integer_dtype(series.dtype) and types.is_extension_array_dtype(series.dtype):
+                # Los enteros con nulos (Int64, Int16...) devuelven pd.NA, que sqlite3 no sabe enlazar
+                series = series.astype(object).where(series.notna(), None)
+            columns.append(series.tolist())
+        yield list(zip(*columns))
+
+
+def _replace_table(cursor, table_name: str, df: DataFrame, batch_size: int):
+    """Reemplazamos la tabla completa con DDL explícito e INSERT por lotes."""
+    cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+    cursor.execute(_create_table_sql(table_name, df))
+    insert = _insert_sql(table_name, list(df.columns))
+    for rows in _iter_batches(df, batch_size):
+        cursor.executemany(insert, rows)
+    print(f"✅ Tabla '{table_name}' Cargada Exitosamente con {len(df)} registros.")
+
+
+def _row_hashes(df: DataFrame, primary_key: List[str]) -> DataFrame:
+    """Calculamos el hash de la llave primaria y el de la fila completa de cada registro.
+
+    Los hashes de 64 bits sin signo se guardan como enteros con signo, que es lo que
+    admite SQLite.
+    """
+    return DataFrame(
+        {
+            "key_hash": hash_pandas_object(df[primary_key], index=False).to_numpy().view(np.int64),
+            "row_hash": hash_pandas_object(df, index=False).to_numpy().view(np.int64),
+        }
+    )
+
+
+def _fetch_row_hashes(cursor, table_name: str) -> Optional[Series]:
+    """Devolvemos el hash de cada fila guardada, indexado por el hash de su llave, o None si no hay."""
+    _create_row_hashes_table(cursor)
+    rows = cursor.execute(
+        f"SELECT key_hash, row_hash FROM {ROW_HASHES_TABLE} WHERE table_name = ?", (table_name,)
+    ).fetchall()
+    if not rows:
+        return None
+    key_hashes, row_hashes = zip(*rows)
+    return Series(row_hashes, index=key_hashes, dtype=np.int64)
+
+
+def _store_row_hashes(cursor, table_name: str, hashes: DataFrame):
+    """Reemplazamos los hashes guardados de la tabla por los de la carga actual."""
+    _create_row_hashes_table(cursor)
+    cursor.execute(f"DELETE FROM {ROW_HASHES_TABLE} WHERE table_name = ?", (table_name,))
+    cursor.executemany(
+        f"INSERT INTO {ROW_HASHES_TABLE} (table_name, key_hash, row_hash) VALUES (?, ?, ?)",
+        zip([table_name] * len(hashes), hashes["key_hash"].tolist(), hashes["row_hash"].tolist()),
+    )
+
+
+def _delete_missing_rows(
+    cursor, table_name: str, df: DataFrame, primary_key: List[str], batch_size: int
+) -> DataFrame:
+    """Borramos las filas de la tabla cuya llave primaria ya no está en el DataFrame.
+
+    Returns:
+        DataFrame: Las filas borradas, tal como estaban guardadas.
+    """
+    columns = ", ".join(f'"{column}"' for column in primary_key)
+    cursor.execute(f"DROP TABLE IF EXISTS temp.{CURRENT_KEYS_TABLE}")
+    cursor.execute(f"CREATE TEMP TABLE {CURRENT_KEYS_TABLE} ({columns}, PRIMARY KEY ({columns}))")
+    placeholders = ", ".join("?" for _ in primary_key)
+    insert = f"INSERT OR IGNORE INTO temp.{CURRENT_KEYS_TABLE} ({columns}) VALUES ({placeholders})"
+    for batch in _iter_batches(df[primary_key], batch_size):
+        cursor.executemany(insert, batch)
+
+    match = " AND ".join(f'k."{column}" = t."{column}"' for column in primary_key)
+    missing = f"NOT EXISTS (SELECT 1 FROM temp.{CURRENT_KEYS_TABLE} k WHERE {match})"
+    cursor.execute(f'SELECT * FROM "{table_name}" t WHERE {missing}')
+    removed = DataFrame(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+    cursor.execute(f'DELETE FROM "{table_name}" AS t WHERE {missing}')
+    cursor.execute(f"DROP TABLE temp.{CURRENT_KEYS_TABLE}")
+    return removed
+
+
+def _upsert_table(
+    cursor, table_name: str, df: DataFrame, batch_size: int
+) -> Optional[Tuple[DataFrame, bool]]:
+    """Cargamos la tabla de forma incremental.
+
+    Si el checksum del DataFrame coincide con el de la carga anterior, la tabla no se toca.
+    En la primera carga incremental (o si la tabla no tiene llave natural) la tabla se
+    recrea. En las siguientes se compara el hash de cada fila con el guardado en
+    etl_row_hashes para su llave primaria: solo se hace upsert de las filas nuevas o
+    modificadas, sin importar su antigüedad, y se borran de la tabla las filas cuya
+    llave ya no está en el DataFrame.
+
+    Devuelve None si la tabla no cambió; si cambió, las filas escritas o borradas (las
+    borradas con los valores guardados en la base) y si la tabla se recreó.
+    """
+    primary_key = get_table_primary_keys().get(table_name, [])
+    watermark = get_table_high_water_marks().get(table_name)
+    checksum = _table_checksum(df)
+
+    previous = cursor.execute(
+        f"SELECT checksum FROM {LOAD_METADATA_TABLE} WHERE table_name = ?",
+        (table_name,),
+    ).fetchone()
+    if previous is not None and previous[0] == checksum:
+        print(f"⏭️ Tabla '{table_name}' sin Cambios desde la Última Carga.")
+        return None
+
+    if primary_key:
+        # Con llaves repetidas el upsert guarda la última fila de cada llave; los hashes
+        # y la máscara de filas cambiadas se calculan sobre esas mismas filas
+        df = df.drop_duplicates(primary_key, keep="last")
+    hashes = _row_hashes(df, primary_key) if primary_key else None
+    previous_hashes = (
+        _fetch_row_hashes(cursor, table_name) if primary_key and previous is not None else None
+    )
+
+    changed, removed = df, None
+    # Sin metadatos (o sin hashes de filas) la tabla pudo haberse creado sin llave
+    # primaria o por otro modo de carga: la recreamos
+    recreated = previous is None or not primary_key or previous_hashes is None
+    if recreated:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        cursor.execute(_create_table_sql(table_name, df, primary_key))
+    else:
+        stored = hashes["key_hash"].map(previous_hashes)
+        changed = df[(stored != hashes["row_hash"]).to_numpy()]
+        if previous_hashes.index.difference(hashes["key_hash"]).size:
+            removed = _delete_missing_rows(cursor, table_name, df, primary_key, batch_size)
+
+    columns = list(df.columns)
+    insert = (
+        _upsert_sql(table_name, columns, primary_key)
+        if primary_key
+        else _insert_sql(table_name, columns)
+    )
+    for batch in _iter_batches(changed, batch_size):
+        cursor.executemany(insert, batch)
+    if hashes is not None:
+        _store_row_hashes(cursor, table_name, hashes)
+
+    high_water_mark = None
+    if watermark and df[watermark].notna().any():
+        high_water_mark = to_datetime(df[watermark]).max().strftime(TIMESTAMP_FORMAT)
+
+    cursor.execute(
+        f"""
+        INSERT INTO {LOAD_METADATA_TABLE} (table_name, checksum, high_water_mark, row_count, loaded_at)
+        VALUES (?, ?, ?, (SELECT COUNT(*) FROM "{table_name}"), ?)
+        ON CONFLICT (table_name) DO UPDATE SET
+            checksum = excluded.checksum,
+            high_water_mark = excluded.high_water_mark,
+            row_count = excluded.row_count,
+            loaded_at = excluded.loaded_at
+        """,
+        (table_name, checksum, high_water_mark, datetime.now().strftime(TIMESTAMP_FORMAT)),
+    )
+    deleted = 0 if removed is None else len(removed)
+    print(
+        f"✅ Tabla '{table_name}' Actualizada con {len(changed)} registros Nuevos o "
+        f"Modificados y {deleted} Borrados."
+    )
+    rows = concat([changed, removed], ignore_index=True) if deleted else changed
+    return rows, recreated
+
+
+def _create_load_metadata_table(cursor):
+    """Creamos la tabla de metadatos de la carga incremental si no existe."""
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {LOAD_METADATA_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            checksum TEXT,
+            high_water_mark TEXT,
+            row_count INTEGER,
+            loaded_at TEXT
+        )
+        """
+    )
+
+
+def _create_row_hashes_table(cursor):
+    """Creamos la tabla de hashes de filas de la carga incremental si no existe."""
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {ROW_HASHES_TABLE} (
+            table_name TEXT,
+            key_hash INTEGER,
+            row_hash INTEGER,
+            PRIMARY KEY (table_name, key_hash)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _record_loaded_tables(cursor, checksums: Dict[str, str]):
+    """Guardamos en etl_load_metadata la huella de cada tabla escrita completa.
+
+    Todos los modos de carga la guardan: src.transform.get_table_fingerprints la usa para
+    que cualquier caché de consultas note que el contenido cambió aunque la tabla tenga
+    el mismo número de filas, y que no cambió si se volvieron a cargar los mismos datos.
+    La huella es el checksum del DataFrame (acumulado por bloques en load_stream()) o, en
+    los resúmenes, la combinación de las de sus tablas de origen. Los hashes de filas
+    de la carga incremental ya no describen la tabla y se borran.
+    """
+    _create_load_metadata_table(cursor)
+    loaded_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+    for table_name, checksum in checksums.items():
+        cursor.execute(
+            f"""
+            INSERT INTO {LOAD_METADATA_TABLE} (table_name, checksum, high_water_mark, row_count, loaded_at)
+            VALUES (?, ?, NULL, (SELECT COUNT(*) FROM "{table_name}"), ?)
+            ON CONFLICT (table_name) DO UPDATE SET
+                checksum = excluded.checksum,
+                high_water_mark = NULL,
+                row_count = excluded.row_count,
+                loaded_at = excluded.loaded_at
+            """,
+            (table_name, checksum, loaded_at),
+        )
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (ROW_HASHES_TABLE,)
+    ).fetchone()
+    if exists:
+        cursor.executemany(
+            f"DELETE FROM {ROW_HASHES_TABLE} WHERE table_name = ?",
+            [(table_name,) for table_name in checksums],
+        )
+
+
+def _record_replaced_tables(database: Engine, checksums: Dict[str, str]):
+    """Guardamos la huella de las tablas tras una carga con to_sql() en su propia conexión."""
+    raw_conn = database.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        _record_loaded_tables(cursor, checksums)
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+
+def _load_in_transaction(
+    data_frames: Dict[str, DataFrame],
+    database: Engine,
+    batch_size: int,
+    journal_mode: str,
+    incremental: bool,
+) -> Optional[Dict[str, Optional[DataFrame]]]:
+    """Cargamos todas las tablas en una sola conexión y una única transacción explícita.
+
+    Mientras dura la carga se usan journal_mode=<journal_mode> y synchronous=OFF; al
+    terminar se restauran los valores anteriores.
+
+    En la carga incremental devuelve las filas escritas de cada tabla que cambió (None
+    para las tablas que se recrearon completas); en las demás devuelve None.
+    """
+    changes = None
+    raw_conn = database.raw_connection()
+    dbapi_conn = raw_conn.connection
+    isolation_level = dbapi_conn.isolation_level
+    try:
+        # Controlamos nosotros mismos BEGIN/COMMIT
+        dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+
+        previous_journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        previous_synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        cursor.execute(f"PRAGMA journal_mode={journal_mode.upper()}")
+        cursor.execute("PRAGMA synchronous=OFF")
+        try:
+            # IMMEDIATE toma el bloqueo de escritura al empezar: si otra conexión está
+            # escribiendo se espera su fin (timeout de la conexión) en lugar de fallar a mitad
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                if incremental:
+                    _create_load_metadata_table(cursor)
+                    changes = {}
+                    for table_name, df in data_frames.items():
+                        written = _upsert_table(cursor, table_name, df, batch_size)
+                        if written is not None:
+                            rows, recreated = written
+                            changes[table_name] = None if recreated else rows
+                else:
+                    for table_name, df in data_frames.items():
+                        _replace_table(cursor, table_name, df, batch_size)
+                    _record_loaded_tables(
+                        cursor,
+                        {table_name: _table_checksum(df) for table_name, df in data_frames.items()},
+                    )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            cursor.execute(f"PRAGMA synchronous={previous_synchronous}")
+            cursor.execute(f"PRAGMA journal_mode={previous_journal_mode}")
+            cursor.close()
+    finally:
+        dbapi_conn.isolation_level = isolation_level
+        raw_conn.close()
+
+    return changes
+
+
+def _record_summary_refresh(database: Engine, summary_names: List[str]):
+    """Guardamos en etl_load_metadata la huella de cada tabla de resumen actualizada.
+
+    La huella combina la consulta del resumen con las huellas de sus tablas de origen, que
+    ya están guardadas porque los resúmenes se declaran en orden de dependencia (ver
+    get_summary_tables). Un resumen recalculado a partir de los mismos datos conserva su
+    huella, así que los resultados en caché que lo leen siguen sirviendo. Si alguna tabla
+    de origen no tiene huella (se cargó fuera de load()), se usa un identificador nuevo.
+    """
+    summary_tables = get_summary_tables()
+    raw_conn = database.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        _create_load_metadata_table(cursor)
+        for summary_name in summary_names:
+            sources = summary_tables[summary_name][1]
+            source_checksums = [
+                _stored_checksum(cursor, source_name) for source_name in sources
+            ]
+            if None in source_checksums:
+                checksum = uuid.uuid4().hex
+            else:
+                digest = hashlib.sha256(read_summary_query(summary_name).encode("utf-8"))
+                for source_checksum in source_checksums:
+                    digest.update(source_checksum.encode("utf-8"))
+                checksum = digest.hexdigest()
+            # Uno por uno: un resumen puede leer la huella del anterior
+            _record_loaded_tables(cursor, {summary_name: checksum})
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+
+def _stored_checksum(cursor, table_name: str) -> Optional[str]:
+    """Devolvemos el checksum guardado de la tabla en etl_load_metadata, o None si no hay."""
+    row = cursor.execute(
+        f"SELECT checksum FROM {LOAD_METADATA_TABLE} WHERE table_name = ?", (table_name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _finish_load(
+    database: Engine,
+    table_names: List[str],
+    indexes: bool,
+    summaries: bool,
+    changes: Optional[Dict[str, Optional[DataFrame]]] = None,
+):
+    """Creamos los índices y actualizamos las tablas de resumen.
+
+    La caché de consultas no se vacía: sus llaves incluyen la huella de cada tabla, que
+    cambió con la carga, así que los resultados anteriores ya no se usan y se descartan
+    solos por antigüedad (ver src.cache.QueryResultCache).
+    """
+    refreshed = []
+    if summaries:
+        # Primero los índices de las tablas de origen, que aceleran el cálculo de los resúmenes
+        if indexes:
+            create_indexes(database, analyze=False)
+        refreshed = refresh_summaries(database, changes)
+        _record_summary_refresh(database, refreshed)
+
+    if indexes:
+        create_indexes(database)
+
+
+def refresh_summary_tables(database: Engine, summary_names: Optional[List[str]] = None) -> List[str]:
+    """
+    Reconstruimos tablas de resumen fuera de una carga, con sus índices.
+
+    Es lo que hace load() al terminar, pero para resúmenes sueltos: en el DAG cada
+    resumen es una tarea que corre apenas se cargan sus tablas de origen. Se registra en
+    etl_load_metadata la huella de cada resumen, derivada de las de sus tablas de origen.
+
+    Args:
+        database (Engine): Conexión a la base de datos SQLite.
+        summary_names (Optional[List[str]]): Resúmenes a reconstruir. Por defecto, todos.
+
+    Returns:
+        List[str]: Nombres de las tablas de resumen que se reconstruyeron.
+    """
+    refreshed = refresh_summaries(database, summary_names=summary_names)
+    _record_summary_refresh(database, refreshed)
+    create_indexes(database, tables=refreshed)
+    return refreshed
+
+
+@instrument()
+def load(
+    data_frames: Dict[str, DataFrame],
+    database: Engine,
+    mode: str = "replace",
+    batch_size: int = 50_000,
+    journal_mode: str = "WAL",
+    indexes: bool = True,
+    summaries: bool = True,
+    julian_days: bool = False,
+    timestamp_columns: Optional[Dict[str, List[str]]] = None,
+):
     """
     Cargamos los DataFrames en la base de datos SQLite.
 
-    Para cada DataFrame en el diccionario, se obtiene una conexión raw (DBAPI)
-    a partir del Engine de SQLAlchemy y se utiliza para cargar la tabla mediante
+    En el modo "replace", para cada DataFrame en el diccionario se obtiene una conexión raw
+    (DBAPI) a partir del Engine de SQLAlchemy y se utiliza para cargar la tabla mediante
     pandas.DataFrame.to_sql(), que requiere una conexión que tenga el método .cursor().
 
+    En el modo "bulk", todas las tablas se cargan en una sola conexión y una sola
+    transacción, con DDL explícito, INSERT preparados ejecutados con executemany() en
+    lotes de "batch_size" filas, y los PRAGMA journal_mode y synchronous ajustados
+    mientras dura la carga. Si una tabla falla, no se guarda ninguna.
+
+    El modo "incremental" usa la misma transacción única, pero en lugar de reemplazar las
+    tablas hace upsert (INSERT ... ON CONFLICT DO UPDATE) sobre las llaves primarias de
+    get_table_primary_keys(). Las tablas cuyo checksum no cambió desde la carga anterior se
+    omiten; en las demás solo se escriben las filas nuevas o cuyo hash cambió (de
+    cualquier fecha) y se borran las filas cuya llave ya no está en el DataFrame. Los
+    checksums y marcas de agua se guardan en la tabla etl_load_metadata y los hashes de
+    las filas en etl_row_hashes.
+
+    En todos los modos, las columnas de fecha de timestamp_columns se guardan junto a sus
+    columnas derivadas "<columna>_epoch", "_year", "_month" y "_day" (y "_julian" si
+    julian_days es True; ver add_timestamp_columns), de modo que las consultas hacen
+    aritmética entera en lugar de llamar a julianday() o strftime() en cada fila. Las
+    columnas de src.config.get_timestamp_columns() son las que leen las consultas y deben
+    incluirse siempre. Al terminar se crean los índices declarados (ver
+    src.indexes.create_indexes), se actualizan las tablas de resumen (ver
+    src.summaries.refresh_summaries; en el modo "incremental" solo se recalculan las filas
+    afectadas por los cambios) y se ejecuta ANALYZE. Cada tabla escrita guarda en
+    etl_load_metadata una huella de su contenido, así que los resultados en caché de las
+    consultas que la leen dejan de usarse en cualquier carpeta de caché.
+
     Args:
         data_frames (Dict[str, DataFrame]): Diccionario con nombres de tablas como claves y DataFrames como valores.
         database (Engine): Conexión a la base de datos SQLite.
+        mode (str): Modo de carga, "replace", "bulk" o "incremental".
+        batch_size (int): Número de filas por llamada a executemany() en los modos "bulk" e "incremental".
+        journal_mode (str): journal_mode de SQLite durante la carga en los modos "bulk" e "incremental", uno de JOURNAL_MODES.
+        indexes (bool): Si es True, crea o actualiza los índices al terminar la carga.
+        summaries (bool): Si es True, actualiza las tablas de resumen al terminar la carga.
+        julian_days (bool): Si es True, guarda también el día juliano (REAL) de cada columna de fecha con columnas derivadas.
+        timestamp_columns (Optional[Dict[str, List[str]]]): Columnas de fecha de cada tabla que
+            se guardan con columnas derivadas. Por defecto, las de get_timestamp_columns().
     """
     if not data_frames:
         print("⚠️ No hay Datos para cargar en la Base de Datos 😢")
         return
 
+    if mode not in ("replace", "bulk", "incremental"):
+        raise ValueError(f"Modo de carga no soportado: {mode}")
+    if mode == "incremental" and any(has_surrogate_keys(df) for df in data_frames.values()):
+        # Los códigos de src.compaction cambian entre compactaciones: el upsert mezclaría
+        # identificadores distintos bajo el mismo código
+        raise ValueError(
+            "La carga incremental no admite tablas con claves sustitutas de src.compaction; "
+            "compacte con categorical_ids=True (como extract(compact=True)) o sin surrogate_keys."
+        )
+    if journal_mode.upper() not in JOURNAL_MODES:
+        raise ValueError(
+            f"journal_mode no soportado: {journal_mode} (debe ser uno de {', '.join(JOURNAL_MODES)})"
+        )
+
+    if timestamp_columns is None:
+        timestamp_columns = get_timestamp_columns()
+    data_frames = {
+        table_name: add_timestamp_columns(df, julian_days, timestamp_columns.get(table_name, []))
+        for table_name, df in data_frames.items()
+    }
+
     print("📥 Iniciando la carga de Datos en la Base de Datos...\n")
 
-    for table_name, df in data_frames.items():
+    changes = None
+    if mode in ("bulk", "incremental"):
         try:
-            # Obtenemos una conexión raw que implementa la interfaz DBAPI (por ejemplo, con .cursor())
-            raw_conn = database.raw_connection()
-            try:
-                # Utilizamos raw_conn en to_sql()
-                df.to_sql(table_name, con=raw_conn, if_exists="replace", index=False)
-                raw_conn.commit()  # Commit para guardar los cambios en caso de SQLite
-                print(f"✅ Tabla '{table_name}' Cargada Exitosamente con {len(df)} registros.")
-            finally:
-                raw_conn.close()
+            changes = _load_in_transaction(
+                data_frames, database, batch_size, journal_mode, incremental=mode == "incremental"
+            )
         except Exception as e:
-            print(f"❌ Error al Cargar la Tabla '{table_name}': {e}")
+            print(f"❌ Error en la Carga, no se guardó ninguna tabla: {e}")
+            return
+    else:
+        checksums = {}
+        for table_name, df in data_frames.items():
+            try:
+                # Obtenemos una conexión raw que implementa la interfaz DBAPI (por ejemplo, con .cursor())
+                raw_conn = database.raw_connection()
+                try:
+                    # Utilizamos raw_conn en to_sql()
+                    df.to_sql(table_name, con=raw_conn, if_exists="replace", index=False)
+                    raw_conn.commit()  # Commit para guardar los cambios en caso de SQLite
+                    print(f"✅ Tabla '{table_name}' Cargada Exitosamente con {len(df)} registros.")
+                finally:
+                    raw_conn.close()
+                checksums[table_name] = _table_checksum(df)
+            except Exception as e:
+                print(f"❌ Error al Cargar la Tabla '{table_name}': {e}")
+
+        _record_replaced_tables(database, checksums)
+
+    _finish_load(database, list(data_frames), indexes, summaries, changes)
 
     print("\n ✅🎉 Proceso de Carga Finalizado con Éxito. 🚀 ")
+
+
+@instrument()
+def load_stream(
+    chunks: Iterable[Tuple[str, DataFrame]],
+    database: Engine,
+    indexes: bool = True,
+    summaries: bool = True,
+    julian_days: bool = False,
+    timestamp_columns: Optional[Dict[str, List[str]]] = None,
+):
+    """
+    Cargamos en la base de datos un flujo de bloques (nombre de tabla, DataFrame).
+
+    Pensado para consumir src.extract.extract_stream(): el primer bloque de cada tabla
+    la reemplaza y los siguientes se anexan. Cada bloque se guarda en su propia
+    transacción, por lo que nunca se mantiene una tabla completa en memoria. Las
+    columnas de fecha de timestamp_columns se guardan con sus columnas derivadas, igual
+    que en load().
+
+    Args:
+        chunks (Iterable[Tuple[str, DataFrame]]): Bloques con el nombre de la tabla y sus filas.
+        database (Engine): Conexión a la base de datos SQLite.
+        indexes (bool): Si es True, crea o actualiza los índices al terminar la carga.
+        summaries (bool): Si es True, reconstruye las tablas de resumen al terminar la carga.
+        julian_days (bool): Si es True, guarda también el día juliano (REAL) de cada columna de fecha con columnas derivadas.
+        timestamp_columns (Optional[Dict[str, List[str]]]): Columnas de fecha de cada tabla que
+            se guardan con columnas derivadas. Por defecto, las de get_timestamp_columns().
+    """
+    if timestamp_columns is None:
+        timestamp_columns = get_timestamp_columns()
+
+    print("📥 Iniciando la carga por bloques en la Base de Datos...\n")
+
+    # Contamos las filas cargadas por tabla; también nos indica si la tabla ya fue reemplazada
+    loaded_rows: Dict[str, int] = {}
+    # El checksum se acumula bloque a bloque: es el mismo que el de la tabla completa
+    digests: Dict[str, Any] = {}
+
+    raw_conn = database.raw_connection()
+    try:
+        for table_name, df in chunks:
+            if_exists = "append" if table_name in loaded_rows else "replace"
+            df = add_timestamp_columns(df, julian_days, timestamp_columns.get(table_name, []))
+            try:
+                df.to_sql(table_name, con=raw_conn, if_exists=if_exists, index=False)
+                raw_conn.commit()  # Cada bloque en su propia transacción
+            except Exception:
+                raw_conn.rollback()
+                raise
+            loaded_rows[table_name] = loaded_rows.get(table_name, 0) + len(df)
+            digests.setdefault(table_name, hashlib.sha256()).update(
+                hash_pandas_object(df, index=False).values.tobytes()
+            )
+    finally:
+        raw_conn.close()
+
+    _record_replaced_tables(
+        database, {table_name: digest.hexdigest() for table_name, digest in digests.items()}
+    )
+
+    for table_name, rows in loaded_rows.items():
+        print(f"✅ Tabla '{table_name}' Cargada Exitosamente con {rows} registros.")
+
+    _finish_load(database, list(loaded_rows), indexes, summaries)
+
+    print("\n ✅🎉 Proceso de Carga por Bloques Finalizado con Éxito. 🚀 ")
@@ -0,0 +1,205 @@
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+
+from src.artifacts import ArtifactStore
+from src.cache import QueryResultCache
+from src.config import (
+    DATASET_ROOT_PATH,
+    PUBLIC_HOLIDAYS_URL,
+    QUERY_CACHE_ROOT_PATH,
+    SQLITE_BD_ABSOLUTE_PATH,
+)
+from src.extract import get_public_holidays_for_years, read_table_csv
+from src.indexes import create_indexes
+from src.load import LOAD_METADATA_TABLE, get_load_checksum, load, refresh_summary_tables
+from src.render import render_plots
+from src.transform import get_query_dependencies, run_cached_query
+
+# Segundos que una tarea espera el bloqueo de escritura de SQLite mientras otra tarea
+# carga su propia tabla
+SQLITE_BUSY_TIMEOUT = 600
+
+# Tabla de días festivos, que se descarga para los años presentes en olist_orders
+HOLIDAYS_TABLE = "public_holidays"
+
+
+def get_engine(database_path: str = SQLITE_BD_ABSOLUTE_PATH) -> Engine:
+    """
+    Creamos el Engine de una tarea del pipeline.
+
+    La base queda en modo WAL, de modo que las consultas leen mientras otras tareas
+    escriben, y cada conexión espera hasta SQLITE_BUSY_TIMEOUT segundos el bloqueo de
+    escritura en lugar de fallar con "database is locked".
+
+    Args:
+        database_path (str): Ruta del archivo SQLite.
+
+    Returns:
+        Engine: Conexión a la base de datos.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{database_path}", connect_args={"timeout": SQLITE_BUSY_TIMEOUT}
+    )
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+    return engine
+
+
+def _load_table(engine: Engine, table_name: str, df) -> Dict[str, Union[str, int]]:
+    """Cargamos una tabla de forma incremental con sus índices y fallamos si la carga no terminó.
+
+    En cada ejecución diaria solo se escriben las filas nuevas o modificadas (ver el modo
+    "incremental" de src.load.load). load() informa los errores sin lanzarlos y una carga
+    fallida deja la tabla anterior intacta, así que se comprueba el checksum guardado en
+    etl_load_metadata; si no coincide se lanza el error para que Airflow reintente solo
+    la tarea de esa tabla.
+    """
+    load({table_name: df}, engine, mode="incremental", indexes=False, summaries=False)
+    with engine.connect() as connection:
+        loaded = connection.exec_driver_sql(
+            f"SELECT checksum, row_count FROM {LOAD_METADATA_TABLE} WHERE table_name = ?",
+            (table_name,),
+        ).fetchone()
+    if loaded is None or loaded[0] != get_load_checksum(table_name, df):
+        raise RuntimeError(f"La tabla '{table_name}' no se cargó: revise el error de la carga.")
+    create_indexes(engine, tables=[table_name])
+    return {"table": table_name, "rows": loaded[1]}
+
+
+def extract_load_table(
+    table_name: str,
+    csv_file: str,
+    csv_folder: str = DATASET_ROOT_PATH,
+    database_path: str = SQLITE_BD_ABSOLUTE_PATH,
+) -> Dict[str, Union[str, int]]:
+    """
+    Extraemos un archivo CSV y lo cargamos en su tabla, con sus índices.
+
+    Es la tarea de una tabla en el DAG: cada tabla se extrae, carga y reintenta por
+    separado, y las tablas independientes se cargan en paralelo.
+
+    Args:
+        table_name (str): Nombre de la tabla.
+        csv_file (str): Nombre del archivo CSV dentro de csv_folder.
+        csv_folder (str): Carpeta de los archivos CSV.
+        database_path (str): Ruta del archivo SQLite.
+
+    Returns:
+        Dict[str, Union[str, int]]: Nombre de la tabla y número de registros cargados.
+    """
+    df = read_table_csv(os.path.join(csv_folder, csv_file), table_name)
+    engine = get_engine(database_path)
+    try:
+        return _load_table(engine, table_name, df)
+    finally:
+        engine.dispose()
+
+
+def extract_load_holidays(
+    public_holidays_url: str = PUBLIC_HOLIDAYS_URL,
+    database_path: str = SQLITE_BD_ABSOLUTE_PATH,
+) -> Dict[str, Union[str, int]]:
+    """
+    Descargamos los días festivos de los años de los pedidos y los cargamos.
+
+    Los años se leen de la tabla olist_orders ya cargada (columna derivada
+    order_purchase_timestamp_year), por lo que en el DAG esta tarea depende de la suya.
+
+    Args:
+        public_holidays_url (str): URL base de la API de días festivos.
+        database_path (str): Ruta del archivo SQLite.
+
+    Returns:
+        Dict[str, Union[str, int]]: Nombre de la tabla y número de registros cargados.
+    """
+    engine = get_engine(database_path)
+    try:
+        with engine.connect() as connection:
+            years = connection.exec_driver_sql(
+                "SELECT DISTINCT order_purchase_timestamp_year FROM olist_orders "
+                "WHERE order_purchase_timestamp_year IS NOT NULL ORDER BY 1"
+            ).fetchall()
+        holidays = get_public_holidays_for_years(
+            public_holidays_url, [str(int(year)) for (year,) in years] or ["2017"]
+        )
+        return _load_table(engine, HOLIDAYS_TABLE, holidays)
+    finally:
+        engine.dispose()
+
+
+def refresh_summary(summary_name: str, database_path: str = SQLITE_BD_ABSOLUTE_PATH) -> List[str]:
+    """
+    Reconstruimos una tabla de resumen con sus índices (ver src.load.refresh_summary_tables).
+
+    Args:
+        summary_name (str): Nombre de la tabla de resumen.
+        database_path (str): Ruta del archivo SQLite.
+
+    Returns:
+        List[str]: Los resúmenes reconstruidos.
+    """
+    engine = get_engine(database_path)
+    try:
+        refreshed = refresh_summary_tables(engine, [summary_name])
+    finally:
+        engine.dispose()
+    if summary_name not in refreshed:
+        raise RuntimeError(f"El resumen '{summary_name}' no se reconstruyó: faltan sus tablas de origen.")
+    return refreshed
+
+
+def run_query(
+    query_name: str,
+    run_id: str,
+    database_path: str = SQLITE_BD_ABSOLUTE_PATH,
+    cache_path: Optional[str] = QUERY_CACHE_ROOT_PATH,
+) -> Dict[str, Union[str, int]]:
+    """
+    Ejecutamos una consulta de transformación y guardamos su resultado como artefacto.
+
+    El resultado se toma de la caché de consultas mientras las tablas que lee no cambien
+    (ver src.transform.run_cached_query), así que en una ejecución diaria sin datos nuevos
+    la consulta no se vuelve a ejecutar.
+
+    Args:
+        query_name (str): Nombre del resultado de la consulta (ver src.transform.QueryEnum).
+        run_id (str): Identificador de la ejecución, que define la carpeta del artefacto.
+        database_path (str): Ruta del archivo SQLite.
+        cache_path (Optional[str]): Carpeta de la caché de consultas; None no la usa.
+
+    Returns:
+        Dict[str, Union[str, int]]: Entrada del manifiesto del artefacto (ver src.artifacts).
+    """
+    queries = {dependency.query: query for query, dependency in get_query_dependencies().items()}
+    engine = get_engine(database_path)
+    try:
+        if cache_path is None:
+            query_result = queries[query_name](engine)
+        else:
+            query_result = run_cached_query(engine, queries[query_name], QueryResultCache(cache_path))
+    finally:
+        engine.dispose()
+    return ArtifactStore(run_id).put(query_result.query, query_result.result)
+
+
+def render_query_results(
+    manifest: Dict[str, Dict[str, Union[str, int]]], run_id: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generamos los gráficos a partir de los resultados guardados y liberamos los artefactos.
+
+    Args:
+        manifest (Dict[str, Dict[str, Union[str, int]]]): Entradas de los artefactos de
+            las consultas, con el nombre de cada resultado como clave.
+        run_id (str): Identificador de la ejecución.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Reporte de src.render.render_plots.
+    """
+    report = render_plots(ArtifactStore.get_many(manifest))
+    ArtifactStore(run_id).cleanup()
+    return report
@@ -1,24 +1,36 @@
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 
 import plotly.express as px
+import plotly.graph_objects as go
 import seaborn as sns
 
 from pandas import DataFrame
 import pandas as pd
 
+from src.downsample import MAX_LINE_POINTS, MAX_SCATTER_POINTS, histogram_2d, lttb, reservoir_sample
+from src.telemetry import instrument
 
-def plot_revenue_by_month_year(df: DataFrame, year: int):
+
+@instrument()
+def plot_revenue_by_month_year(df: DataFrame, year: int, show: bool = True) -> Figure:
     """Plot revenue by month in a given year
 
     Args:
         df (DataFrame): Dataframe with revenue by month and year query result
-        year (int): It could be 2016, 2017 or 2018
+        year (int): Any year present in the query result (e.g. 2016, 2017 or 2018)
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
     matplotlib.rc_file_defaults()
     sns.set_style(style=None, rc=None)
 
-    _, ax1 = plt.subplots(figsize=(12, 6))
+    fig, ax1 = plt.subplots(figsize=(12, 6))
 
     sns.lineplot(data=df[f"Year{year}"], marker="o", sort=False, ax=ax1)
     ax2 = ax1.twinx()
@@ -26,21 +38,28 @@ def plot_revenue_by_month_year(df: DataFrame, year: int):
     sns.barplot(data=df, x="month", y=f"Year{year}", alpha=0.5, ax=ax2)
     ax1.set_title(f"Revenue by month in {year}")
 
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_real_vs_predicted_delivered_time(df: DataFrame, year: int):
+@instrument()
+def plot_real_vs_predicted_delivered_time(df: DataFrame, year: int, show: bool = True) -> Figure:
     """Plot real vs predicted delivered time by month in a given year
 
     Args:
         df (DataFrame): Dataframe with real vs predicted delivered time by month and
                         year query result
-        year (int): It could be 2016, 2017 or 2018
+        year (int): Any year present in the query result (e.g. 2016, 2017 or 2018)
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
     matplotlib.rc_file_defaults()
     sns.set_style(style=None, rc=None)
 
-    _, ax1 = plt.subplots(figsize=(12, 6))
+    fig, ax1 = plt.subplots(figsize=(12, 6))
 
     sns.lineplot(data=df[f"Year{year}_real_time"], marker="o", sort=False, ax=ax1)
     ax1.twinx()
@@ -53,16 +72,23 @@ def plot_real_vs_predicted_delivered_time(df: DataFrame, year: int):
     ax1.set_title(f"Average days delivery time by month in {year}")
     ax1.legend(["Real time", "Estimated time"])
 
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_global_amount_order_status(df: DataFrame):
+@instrument()
+def plot_global_amount_order_status(df: DataFrame, show: bool = True) -> Figure:
     """Plot global amount of order status
 
     Args:
         df (DataFrame): Dataframe with global amount of order status query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
-    _, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
+    fig, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
 
     elements = [x.split()[-1] for x in df["order_status"]]
 
@@ -81,32 +107,45 @@ def plot_global_amount_order_status(df: DataFrame):
     ax.set_title("Order Status Total")
 
     my_circle = plt.Circle((0, 0), 0.7, color="white")
-    p = plt.gcf()
-    p.gca().add_artist(my_circle)
+    ax.add_artist(my_circle)
 
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_revenue_per_state(df: DataFrame):
+@instrument()
+def plot_revenue_per_state(df: DataFrame, show: bool = True) -> go.Figure:
     """Plot revenue per state
 
     Args:
         df (DataFrame): Dataframe with revenue per state query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        go.Figure: The figure
     """
     fig = px.treemap(
         df, path=["customer_state"], values="Revenue", width=800, height=400
     )
     fig.update_layout(margin=dict(t=50, l=25, r=25, b=25))
-    fig.show()
+    if show:
+        fig.show()
+    return fig
 
 
-def plot_top_10_least_revenue_categories(df: DataFrame):
+@instrument()
+def plot_top_10_least_revenue_categories(df: DataFrame, show: bool = True) -> Figure:
     """Plot top 10 least revenue categories
 
     Args:
         df (DataFrame): Dataframe with top 10 least revenue categories query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
-    _, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
+    fig, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
 
     elements = [x.split()[-1] for x in df["Category"]]
 
@@ -123,22 +162,28 @@ def plot_top_10_least_revenue_categories(df: DataFrame):
 
     plt.setp(autotexts, size=8, weight="bold")
     my_circle = plt.Circle((0, 0), 0.7, color="white")
-    p = plt.gcf()
-    p.gca().add_artist(my_circle)
+    ax.add_artist(my_circle)
 
     ax.set_title("Top 10 Least Revenue Categories ammount")
 
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_top_10_revenue_categories_ammount(df: DataFrame):
+@instrument()
+def plot_top_10_revenue_categories_ammount(df: DataFrame, show: bool = True) -> Figure:
     """Plot top 10 revenue categories
 
     Args:
         df (DataFrame): Dataframe with top 10 revenue categories query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
     # Plotting the top 10 revenue categories ammount
-    _, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
+    fig, ax = plt.subplots(figsize=(6, 3), subplot_kw=dict(aspect="equal"))
 
     elements = [x.split()[-1] for x in df["Category"]]
 
@@ -155,86 +200,154 @@ def plot_top_10_revenue_categories_ammount(df: DataFrame):
 
     plt.setp(autotexts, size=8, weight="bold")
     my_circle = plt.Circle((0, 0), 0.7, color="white")
-    p = plt.gcf()
-    p.gca().add_artist(my_circle)
+    ax.add_artist(my_circle)
 
     ax.set_title("Top 10 Revenue Categories ammount")
 
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_top_10_revenue_categories(df: DataFrame):
+@instrument()
+def plot_top_10_revenue_categories(df: DataFrame, show: bool = True) -> go.Figure:
     """Plot top 10 revenue categories
 
     Args:
         df (DataFrame): Dataframe with top 10 revenue categories query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        go.Figure: The figure
     """
     fig = px.treemap(df, path=["Category"], values="Num_order", width=800, height=400)
     fig.update_layout(margin=dict(t=50, l=25, r=25, b=25))
-    fig.show()
+    if show:
+        fig.show()
+    return fig
 
 
-def plot_freight_value_weight_relationship(df: DataFrame):
+@instrument()
+def plot_freight_value_weight_relationship(
+    df: DataFrame, show: bool = True, max_points: int = MAX_SCATTER_POINTS, method: str = "hexbin"
+) -> Figure:
     """Plot freight value vs product weight relationship.
 
+    Up to max_points orders are drawn as a scatterplot. Above that the drawing cost
+    would grow with every point, so the orders are aggregated or sampled first:
+
+    - "hexbin": hexagonal bins colored by the (log) number of orders.
+    - "hist2d": a 100 x 100 histogram computed with numpy and drawn as one mesh.
+    - "sample": a scatterplot of a uniform sample of max_points orders.
+
     Args:
         df (DataFrame): DataFrame con las columnas 'product_weight_g' y 'freight_value'
                         que describen el peso y el valor del flete, respectivamente.
+        show (bool): Display the figure; when False it is only built and returned
+        max_points (int): Largest number of orders drawn one by one
+        method (str): "hexbin", "hist2d" or "sample", used above max_points
+
+    Returns:
+        Figure: The figure
     """
     
     # TODO: Representar gráficamente la relación entre el valor del flete y el peso usando un scatterplot de seaborn.
     # El eje x debe ser el peso (weight) y el eje y debe ser el valor del flete (freight value).
 
     # Ajustamos el estilo y el tamaño de la figura
-    plt.figure(figsize=(8, 6))
-
-    # Creamos el scatterplot con seaborn
-    sns.scatterplot(
-        data=df,
-        x='product_weight_g',     
-        y='freight_value',        
-        alpha=0.7                
-    )
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    data = df[['product_weight_g', 'freight_value']].dropna()
+    if len(data) > max_points and method == 'sample':
+        data = reservoir_sample(data, max_points)
+
+    if len(data) <= max_points:
+        # Creamos el scatterplot con seaborn
+        sns.scatterplot(
+            data=data,
+            ax=ax,
+            x='product_weight_g',
+            y='freight_value',
+            alpha=0.7
+        )
+    elif method == 'hexbin':
+        # Agrupamos los pedidos en hexágonos; el costo de dibujo depende de la grilla, no de los datos
+        bins = ax.hexbin(
+            data['product_weight_g'], data['freight_value'], gridsize=60, bins='log', mincnt=1
+        )
+        fig.colorbar(bins, ax=ax, label='Orders')
+    elif method == 'hist2d':
+        counts, x_edges, y_edges = histogram_2d(data['product_weight_g'], data['freight_value'])
+        mesh = ax.pcolormesh(
+            x_edges, y_edges, np.ma.masked_equal(counts.T, 0), norm=LogNorm(), rasterized=True
+        )
+        fig.colorbar(mesh, ax=ax, label='Orders')
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
 
-    plt.xlabel('Product Weight (g)')
-    plt.ylabel('Freight Value')
-    plt.title('Freight Value vs Product Weight')
+    ax.set_xlabel('Product Weight (g)')
+    ax.set_ylabel('Freight Value')
+    ax.set_title('Freight Value vs Product Weight')
 
     # Mostramos el gráfico
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 
-def plot_delivery_date_difference(df: DataFrame):
+@instrument()
+def plot_delivery_date_difference(df: DataFrame, show: bool = True) -> Figure:
     """Plot delivery date difference
 
     Args:
         df (DataFrame): Dataframe with delivery date difference query result
+        show (bool): Display the figure; when False it is only built and returned
+
+    Returns:
+        Figure: The figure
     """
-    sns.barplot(data=df, x="Delivery_Difference", y="State").set(
+    fig, ax = plt.subplots()
+    sns.barplot(data=df, x="Delivery_Difference", y="State", ax=ax).set(
         title="Difference Between Delivery Estimate Date and Delivery Date"
     )
 
+    if show:
+        plt.show()
+    return fig
+
 
-def plot_order_amount_per_day_with_holidays(df: DataFrame):
+@instrument()
+def plot_order_amount_per_day_with_holidays(
+    df: DataFrame, show: bool = True, max_points: int = MAX_LINE_POINTS
+) -> Figure:
     """Grafica la cantidad de pedidos por día, marcando los días festivos.
 
+    Series longer than max_points are downsampled with LTTB, which keeps the peaks and
+    valleys, and the holidays are drawn as a single collection of vertical lines.
+
     Args:
         df (DataFrame): DataFrame con los resultados de cantidad de pedidos por día y días festivos.
                        Se espera que tenga las columnas 'order_count', 'date' y 'holiday'.
+        show (bool): Display the figure; when False it is only built and returned
+        max_points (int): Largest number of days drawn in the line
+
+    Returns:
+        Figure: The figure
     """
     
     # TODO: Graficar el monto de pedidos por día con los días festivos usando matplotlib.
     # Marcar los días festivos con líneas verticales.
     # Sugerencia: usar plt.axvline.
 
-    # Convertimos la columna 'date' a formato datetime
-    df['date'] = pd.to_datetime(df['date'])
+    # Convertimos la columna 'date' a formato datetime, sin modificar el DataFrame recibido
+    df = df.assign(date=pd.to_datetime(df['date'])).sort_values('date')
 
     # Creamos la figura y el eje
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    # Graficamos la cantidad de pedidos por día (línea verde)
-    ax.plot(df['date'], df['order_count'], label='Order Count', color='green')
+    # Graficamos la cantidad de pedidos por día (línea verde), reducida con LTTB si es muy larga
+    line = df.iloc[lttb(df['date'].values, df['order_count'].values, max_points)]
+    ax.plot(line['date'], line['order_count'], label='Order Count', color='green')
 
     # Verificamos si existe la columna 'holiday' que indique los días festivos
     if 'holiday' in df.columns:
@@ -243,15 +356,18 @@ def plot_order_amount_per_day_with_holidays(df: DataFrame):
     else:
         holiday_dates = []
 
-    # Dibujamos líneas verticales para cada día festivo (línea punteada azul)
-    for i, holiday in enumerate(holiday_dates):
-        label = 'Holiday' if i == 0 else None
-        ax.axvline(
-            holiday,
+    # Dibujamos todas las líneas verticales de los días festivos en una sola llamada (línea
+    # punteada azul), de la parte inferior a la superior del eje
+    if len(holiday_dates):
+        ax.vlines(
+            holiday_dates,
+            0,
+            1,
+            transform=ax.get_xaxis_transform(),
             color='blue',
             linestyle=':',
             alpha=0.7,
-            label=label
+            label='Holiday'
         )
 
     ax.set_title('Order Count per Day with Holidays')
@@ -259,8 +375,10 @@ def plot_order_amount_per_day_with_holidays(df: DataFrame):
     ax.set_ylabel('Order Count')
     ax.legend()
 
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return fig
 
     #raise NotImplementedError
\ No newline at end of file
@@ -0,0 +1,261 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+from src.config import PLOTS_ROOT_PATH
+
+MANIFEST_FILE = "_manifest.json"
+MATPLOTLIB_FORMATS = ("png", "svg", "html")
+DEFAULT_FORMATS = ("png", "html")
+
+
+class Chart(NamedTuple):
+    """A chart of src.plots and the query result it draws."""
+
+    function: str
+    query: str
+    # Read-only, so the default is not a dict shared (and mutable) by every Chart
+    kwargs: Mapping[str, Any] = MappingProxyType({})
+    plotly: bool = False
+
+
+CHARTS: Dict[str, Chart] = {
+    "revenue_by_month_year": Chart(
+        "plot_revenue_by_month_year", "revenue_by_month_year", {"year": 2017}
+    ),
+    "real_vs_predicted_delivered_time": Chart(
+        "plot_real_vs_predicted_delivered_time", "real_vs_estimated_delivered_time", {"year": 2017}
+    ),
+    "global_amount_order_status": Chart(
+        "plot_global_amount_order_status", "global_ammount_order_status"
+    ),
+    "revenue_per_state": Chart("plot_revenue_per_state", "revenue_per_state", plotly=True),
+    "top_10_least_revenue_categories": Chart(
+        "plot_top_10_least_revenue_categories", "top_10_least_revenue_categories"
+    ),
+    "top_10_revenue_categories_ammount": Chart(
+        "plot_top_10_revenue_categories_ammount", "top_10_revenue_categories"
+    ),
+    "top_10_revenue_categories": Chart(
+        "plot_top_10_revenue_categories", "top_10_revenue_categories", plotly=True
+    ),
+    "freight_value_weight_relationship": Chart(
+        "plot_freight_value_weight_relationship", "get_freight_value_weight_relationship"
+    ),
+    "delivery_date_difference": Chart(
+        "plot_delivery_date_difference", "delivery_date_difference"
+    ),
+    "order_amount_per_day_with_holidays": Chart(
+        "plot_order_amount_per_day_with_holidays", "orders_per_day_and_holidays_2017"
+    ),
+}
+
+
+def hash_data_frame(df: DataFrame) -> str:
+    """Hash the values, index, column names and dtypes of a DataFrame.
+
+    Args:
+        df (DataFrame): The data.
+
+    Returns:
+        str: A hex digest that changes whenever the DataFrame does.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def _chart_formats(chart: Chart, formats: Sequence[str]) -> List[str]:
+    """Formats of the request that the chart supports, or its native format if none is.
+
+    Matplotlib writes PNG and SVG, and HTML as a page with the SVG inline. Plotly writes
+    HTML, and PNG or SVG only when the kaleido package is installed.
+    """
+    if chart.plotly:
+        supported = ["html"]
+        try:
+            import kaleido  # noqa: F401
+
+            supported += ["png", "svg"]
+        except ImportError:
+            pass
+    else:
+        supported = list(MATPLOTLIB_FORMATS)
+    selected = [f for f in formats if f in supported]
+    return selected or supported[:1]
+
+
+def render_chart(
+    name: str, df: DataFrame, output_dir: str, formats: Sequence[str] = DEFAULT_FORMATS
+) -> List[str]:
+    """Draw one chart without displaying it, write it in every format and close it.
+
+    Args:
+        name (str): Key of the chart in CHARTS.
+        df (DataFrame): The query result the chart draws.
+        output_dir (str): Folder the files are written to, as <name>.<format>.
+        formats (Sequence[str]): Requested formats, among "png", "svg" and "html".
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from src import plots
+
+    chart = CHARTS[name]
+    fig = getattr(plots, chart.function)(df, show=False, **chart.kwargs)
+    paths = []
+    try:
+        for file_format in _chart_formats(chart, formats):
+            path = os.path.join(output_dir, f"{name}.{file_format}")
+            tmp_path = f"{path}.tmp"
+            if chart.plotly and file_format == "html":
+                # plotly.js is embedded so the page also opens offline
+                fig.write_html(tmp_path, include_plotlyjs=True)
+            elif chart.plotly:
+                fig.write_image(tmp_path, format=file_format)
+            elif file_format == "html":
+                svg = io.StringIO()
+                fig.savefig(svg, format="svg", bbox_inches="tight")
+                # The XML prolog and doctype of the SVG file are not valid inside HTML
+                svg_element = svg.getvalue()[svg.getvalue().index("<svg"):]
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(f"<!DOCTYPE html>\n<html><head><title>{name}</title></head><body>\n")
+                    f.write(svg_element)
+                    f.write("</body></html>\n")
+            else:
+                fig.savefig(tmp_path, format=file_format, bbox_inches="tight")
+            os.replace(tmp_path, path)
+            paths.append(path)
+    finally:
+        if not chart.plotly:
+            plt.close(fig)
+    return paths
+
+
+def _render_chart_task(args: Tuple[str, DataFrame, str, Sequence[str]]) -> List[str]:
+    return render_chart(*args)
+
+
+def _read_manifest(output_dir: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(output_dir: str, manifest: Dict[str, Dict[str, Any]]):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def render_plots(
+    query_results: Dict[str, DataFrame],
+    output_dir: str = PLOTS_ROOT_PATH,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    charts: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """Render the charts of src.plots to files, in parallel worker processes.
+
+    Charts are drawn in a pool of worker processes rather than threads, because
+    matplotlib is not thread-safe, and every figure is closed once it is written, so
+    neither the workers nor the caller accumulate figures. A chart is skipped when the
+    hash of its input DataFrame, its arguments and the formats are the same as in the
+    manifest of the output folder and its files still exist.
+
+    If a chart fails, the manifest is still updated with the charts that were written,
+    so they are skipped on the next call, and then the first error is raised.
+
+    Args:
+        query_results (Dict[str, DataFrame]): Query results keyed by query name, as
+            returned by src.transform.run_queries().
+        output_dir (str): Folder the charts and the manifest are written to.
+        formats (Sequence[str]): Requested formats, among "png", "svg" and "html".
+        charts (Optional[Sequence[str]]): Keys of CHARTS to render. Defaults to every
+            chart whose query result is available.
+        max_workers (Optional[int]): Worker processes. Defaults to one per chart up to the
+            number of CPUs; 0 renders in the current process.
+        force (bool): Render every chart even if its input is unchanged.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: For every chart, its input "hash", the "files" written
+        and whether it was "skipped".
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if charts is None:
+        charts = [name for name, chart in CHARTS.items() if chart.query in query_results]
+
+    manifest = _read_manifest(output_dir)
+    report: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for name in charts:
+        chart = CHARTS[name]
+        df = query_results[chart.query]
+        key = hashlib.sha256(
+            json.dumps(
+                [hash_data_frame(df), chart.function, dict(chart.kwargs), list(formats)],
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+        previous = manifest.get(name)
+        if (
+            not force
+            and previous is not None
+            and previous["hash"] == key
+            and all(os.path.exists(path) for path in previous["files"])
+        ):
+            report[name] = {"hash": key, "files": previous["files"], "skipped": True}
+        else:
+            report[name] = {"hash": key, "files": [], "skipped": False}
+            pending.append((name, df, output_dir, tuple(formats)))
+
+    errors: List[BaseException] = []
+
+    def record(name: str, render) -> None:
+        try:
+            paths = render()
+        except Exception as e:
+            errors.append(e)
+            # The files of the previous input no longer match it
+            manifest.pop(name, None)
+            return
+        report[name]["files"] = paths
+        manifest[name] = {"hash": report[name]["hash"], "files": paths}
+
+    if pending and max_workers == 0:
+        for task in pending:
+            record(task[0], lambda task=task: _render_chart_task(task))
+    elif pending:
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        # "spawn" starts clean interpreters, instead of forking a parent that may hold
+        # threads, open connections or an interactive matplotlib backend
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [(task[0], executor.submit(_render_chart_task, task)) for task in pending]
+            for name, future in futures:
+                record(name, future.result)
+
+    _write_manifest(output_dir, manifest)
+    if errors:
+        raise errors[0]
+    return report
@@ -0,0 +1,182 @@
+# Importamos hashlib, json, os y shutil para calcular el hash de los CSV y reemplazar el staging en disco
+import hashlib
+import json
+import os
+import shutil
+
+# Importamos el pool de hilos para convertir varios CSV al mismo tiempo
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pandas import DataFrame, to_datetime
+
+from src.config import STAGING_ROOT_PATH, get_table_partitions, get_table_schemas
+
+# Archivo que guarda, por tabla, el hash del CSV con el que se generó su Parquet
+STAGING_MANIFEST = "_manifest.json"
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Calculamos el SHA-256 de un archivo leyéndolo por bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(table_path: str) -> Optional[dict]:
+    path = os.path.join(table_path, STAGING_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def stage_table(
+    csv_path: str, table_name: str, staging_folder: str = STAGING_ROOT_PATH, force: bool = False
+) -> bool:
+    """
+    Convierte un CSV en su carpeta Parquet del área de staging.
+
+    La conversión solo se repite si el hash del CSV cambió desde la última vez (o si
+    "force" es True). Las tablas de get_table_partitions() se particionan por año y mes;
+    el resto se guarda en un único archivo. La carpeta nueva se escribe aparte y luego
+    reemplaza a la anterior, para que un lector nunca vea un staging a medio escribir.
+
+    Args:
+        csv_path (str): Ruta del archivo CSV.
+        table_name (str): Nombre de la tabla.
+        staging_folder (str): Carpeta raíz del área de staging.
+        force (bool): Convierte el CSV aunque su hash no haya cambiado.
+
+    Returns:
+        bool: True si la tabla se convirtió, False si su Parquet ya estaba al día.
+    """
+    # Importamos aquí read_table_csv para evitar una importación circular con src.extract
+    from src.extract import read_table_csv
+
+    table_path = os.path.join(staging_folder, table_name)
+    source_hash = file_hash(csv_path)
+    manifest = _read_manifest(table_path)
+    if not force and manifest and manifest.get("source_hash") == source_hash:
+        return False
+
+    df = read_table_csv(csv_path, table_name)
+    date_column, partition_columns = get_table_partitions().get(table_name, (None, []))
+
+    tmp_path = f"{table_path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    if partition_columns:
+        dates = to_datetime(df[date_column])
+        df[partition_columns[0]] = dates.dt.year.astype("Int16")
+        df[partition_columns[1]] = dates.dt.month.astype("Int8")
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            tmp_path,
+            partition_cols=partition_columns,
+        )
+    else:
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False), os.path.join(tmp_path, "part-0.parquet")
+        )
+
+    with open(os.path.join(tmp_path, STAGING_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "source": os.path.basename(csv_path),
+                "source_hash": source_hash,
+                "rows": len(df),
+                "partition_columns": partition_columns,
+            },
+            f,
+        )
+
+    shutil.rmtree(table_path, ignore_errors=True)
+    os.replace(tmp_path, table_path)
+    return True
+
+
+def stage(
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    staging_folder: str = STAGING_ROOT_PATH,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Convierte los CSV del dataset en el área de staging Parquet.
+
+    Args:
+        csv_folder (str): Ruta de la carpeta donde están los archivos CSV.
+        csv_table_mapping (Dict[str, str]): Diccionario que mapea nombres de archivos CSV a nombres de tablas.
+        staging_folder (str): Carpeta raíz del área de staging.
+        max_workers (Optional[int]): Número máximo de conversiones simultáneas. Por defecto, una por archivo.
+
+    Returns:
+        List[str]: Nombres de las tablas que se convirtieron porque su CSV cambió.
+    """
+    os.makedirs(staging_folder, exist_ok=True)
+    workers = max_workers or max(len(csv_table_mapping), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        staged = {
+            table_name: executor.submit(
+                stage_table, f"{csv_folder}/{csv_file}", table_name, staging_folder
+            )
+            for csv_file, table_name in csv_table_mapping.items()
+        }
+        converted = [table_name for table_name, future in staged.items() if future.result()]
+
+    print(f"✅🎉 Staging Parquet al Día ({len(converted)} Tablas Convertidas).")
+    return converted
+
+
+def read_staged_table(
+    table_name: str,
+    staging_folder: str = STAGING_ROOT_PATH,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[tuple]] = None,
+) -> DataFrame:
+    """
+    Lee una tabla del área de staging leyendo solo las columnas y particiones necesarias.
+
+    Los filtros sobre las columnas de partición (por ejemplo
+    [("purchase_year", "=", 2017)]) descartan carpetas completas sin abrirlas; los filtros
+    sobre otras columnas usan las estadísticas de cada row group del Parquet.
+
+    Args:
+        table_name (str): Nombre de la tabla.
+        staging_folder (str): Carpeta raíz del área de staging.
+        columns (Optional[List[str]]): Columnas a leer. Por defecto, todas menos las de partición.
+        filters (Optional[List[tuple]]): Filtros en el formato de pyarrow.parquet.read_table().
+
+    Returns:
+        DataFrame: La tabla con los mismos tipos que read_table_csv().
+    """
+    table_path = os.path.join(staging_folder, table_name)
+    manifest = _read_manifest(table_path) or {}
+    partition_columns = manifest.get("partition_columns", [])
+
+    # Las particiones se leen con los mismos tipos con los que se escribieron (año Int16, mes Int8)
+    partitioning = (
+        ds.partitioning(
+            pa.schema([(partition_columns[0], pa.int16()), (partition_columns[1], pa.int8())]),
+            flavor="hive",
+        )
+        if partition_columns
+        else None
+    )
+    table = pq.read_table(table_path, columns=columns, filters=filters, partitioning=partitioning)
+    df = table.to_pandas()
+
+    # Las columnas de partición solo se devuelven si se pidieron explícitamente
+    if columns is None:
+        df = df.drop(columns=[column for column in partition_columns if column in df.columns])
+    for column in get_table_schemas().get(table_name, {}).get("parse_dates", []):
+        if column in df.columns:
+            df[column] = to_datetime(df[column]).astype("datetime64[ns]")
+
+    return df
@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional
+
+from pandas import DataFrame, concat
+from sqlalchemy.engine.base import Engine
+
+from src.config import QUERIES_ROOT_PATH, get_summary_tables
+
+# Tabla temporal con las llaves que se recalculan en una actualización incremental
+SUMMARY_KEYS_TABLE = "etl_summary_keys"
+
+
+def read_summary_query(summary_name: str) -> str:
+    """Leemos la consulta que calcula una tabla de resumen, sin el ";" ni los comentarios finales."""
+    with open(f"{QUERIES_ROOT_PATH}/summaries/{summary_name}.sql", "r") as f:
+        return f.read().split(";")[0]
+
+
+def _table_columns(cursor, table_name: str) -> List[str]:
+    """Devolvemos las columnas de una tabla en orden."""
+    return [row[1] for row in cursor.execute(f'PRAGMA table_info("{table_name}")').fetchall()]
+
+
+def _query_columns(cursor, sql: str) -> List[str]:
+    """Devolvemos las columnas que produce la consulta de un resumen, sin calcular filas."""
+    cursor.execute(f"SELECT * FROM ({sql}) LIMIT 0", {"refresh_all": 0})
+    columns = [column[0] for column in cursor.description]
+    cursor.fetchall()
+    return columns
+
+
+def _fetch_frame(cursor, sql: str, params: tuple = ()) -> DataFrame:
+    """Ejecutamos la consulta en el cursor y devolvemos el resultado como DataFrame."""
+    cursor.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    return DataFrame(cursor.fetchall(), columns=columns)
+
+
+def _set_keys(cursor, keys: List):
+    """Reemplazamos el contenido de la tabla temporal de llaves."""
+    cursor.execute(f"DELETE FROM temp.{SUMMARY_KEYS_TABLE}")
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO temp.{SUMMARY_KEYS_TABLE} (key) VALUES (?)",
+        [(key,) for key in keys],
+    )
+
+
+def _changed_keys(
+    cursor, key: str, sources: List[str], changes: Dict[str, Optional[DataFrame]]
+) -> Optional[List]:
+    """Traducimos las filas modificadas de las tablas de origen a llaves del resumen.
+
+    Devuelve None si hay que reconstruir el resumen completo: alguna tabla de origen se
+    recreó, o sus filas no comparten ninguna columna con la tabla que guía el resumen.
+    """
+    driving_table = sources[0]
+    driving_columns = _table_columns(cursor, driving_table)
+    keys = set()
+    for source in sources:
+        if source not in changes:
+            continue
+        rows = changes[source]
+        if rows is None:
+            return None
+        if key in rows.columns:
+            keys.update(rows[key].dropna().tolist())
+            continue
+        shared = [column for column in rows.columns if column in driving_columns]
+        if not shared:
+            return None
+        # Buscamos las llaves de la tabla guía que comparten el valor de la columna en común
+        _set_keys(cursor, rows[shared[0]].dropna().unique().tolist())
+        matches = cursor.execute(
+            f'SELECT DISTINCT "{key}" FROM "{driving_table}" '
+            f'WHERE "{shared[0]}" IN (SELECT key FROM temp.{SUMMARY_KEYS_TABLE})'
+        ).fetchall()
+        keys.update(row[0] for row in matches)
+    return sorted(keys)
+
+
+def _rebuild_summary(cursor, summary_name: str, sql: str):
+    """Reconstruimos la tabla de resumen completa, dentro de la transacción de refresh_summaries()."""
+    cursor.execute(f'DROP TABLE IF EXISTS "{summary_name}"')
+    cursor.execute(
+        f'CREATE TABLE "{summary_name}" AS SELECT * FROM ({sql})',
+        {"refresh_all": 1},
+    )
+
+
+def _refresh_summary_keys(cursor, summary_name: str, key: str, sql: str, keys: List) -> DataFrame:
+    """Recalculamos solo las filas del resumen cuyas llaves cambiaron.
+
+    Returns:
+        DataFrame: Las filas borradas y las insertadas, para propagar el cambio a los
+        resúmenes que leen este.
+    """
+    _set_keys(cursor, keys)
+    in_keys = f'"{key}" IN (SELECT key FROM temp.{SUMMARY_KEYS_TABLE})'
+    previous = _fetch_frame(cursor, f'SELECT * FROM "{summary_name}" WHERE {in_keys}')
+    cursor.execute(f'DELETE FROM "{summary_name}" WHERE {in_keys}')
+    cursor.execute(
+        f'INSERT INTO "{summary_name}" SELECT * FROM ({sql})', {"refresh_all": 0}
+    )
+    current = _fetch_frame(cursor, f'SELECT * FROM "{summary_name}" WHERE {in_keys}')
+    return concat([previous, current], ignore_index=True)
+
+
+def refresh_summaries(
+    database: Engine,
+    changes: Optional[Dict[str, Optional[DataFrame]]] = None,
+    summary_names: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Materializamos las tablas de resumen declaradas en get_summary_tables().
+
+    Sin "changes" (cargas "replace", "bulk" y por bloques) todas las tablas de resumen se
+    reconstruyen. En una carga incremental, "changes" indica qué tablas se modificaron:
+    las que no leen ninguna de ellas no se tocan, y en las demás solo se borran y
+    recalculan las filas cuyas llaves cambiaron. Si una tabla de origen se recreó (valor
+    None) el resumen se reconstruye completo. Los resúmenes cuyas tablas de origen no
+    existen se omiten. Con "summary_names" solo se materializan esos resúmenes (por
+    ejemplo, una tarea del DAG por resumen).
+
+    Args:
+        database (Engine): Conexión a la base de datos SQLite.
+        changes (Optional[Dict[str, Optional[DataFrame]]]): Filas insertadas o
+            actualizadas por tabla, o None para las tablas que se recrearon completas.
+        summary_names (Optional[List[str]]): Resúmenes a materializar. Por defecto, todos.
+
+    Returns:
+        List[str]: Nombres de las tablas de resumen que se actualizaron.
+    """
+    refreshed = []
+    # Los resúmenes actualizados también cuentan como cambios para los que los leen
+    changes = dict(changes) if changes is not None else None
+
+    raw_conn = database.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        # sqlite3 no abre una transacción antes de DROP o CREATE: sin un BEGIN explícito el
+        # DROP de _rebuild_summary se confirma solo, y si falla el CREATE el resumen se
+        # pierde. IMMEDIATE toma el bloqueo de escritura al empezar, y las consultas que
+        # leen en paralelo siguen viendo el resumen anterior hasta el COMMIT.
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {SUMMARY_KEYS_TABLE} (key PRIMARY KEY)")
+        tables = {
+            row[0]
+            for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+        for summary_name, (key, sources) in get_summary_tables().items():
+            if summary_names is not None and summary_name not in summary_names:
+                continue
+            if any(source not in tables for source in sources):
+                print(f"⚠️ Resumen '{summary_name}' Omitido: faltan sus Tablas de Origen.")
+                continue
+
+            sql = read_summary_query(summary_name)
+            # Una tabla creada con otra versión de la consulta no admite el INSERT
+            # incremental y se reconstruye completa
+            if (
+                changes is not None
+                and summary_name in tables
+                and _table_columns(cursor, summary_name) == _query_columns(cursor, sql)
+            ):
+                if not any(source in changes for source in sources):
+                    continue
+                keys = _changed_keys(cursor, key, sources, changes)
+                if keys is not None:
+                    changes[summary_name] = _refresh_summary_keys(
+                        cursor, summary_name, key, sql, keys
+                    )
+                    refreshed.append(summary_name)
+                    print(f"✅ Resumen '{summary_name}' Actualizado para {len(keys)} llaves.")
+                    continue
+
+            _rebuild_summary(cursor, summary_name, sql)
+            tables.add(summary_name)
+            if changes is not None:
+                changes[summary_name] = None
+            refreshed.append(summary_name)
+            print(f"✅ Resumen '{summary_name}' Reconstruido.")
+
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{SUMMARY_KEYS_TABLE}")
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    return refreshed
@@ -0,0 +1,496 @@
+import argparse
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from src.config import get_csv_to_table_mapping
+
+# Share of customers per state in the Olist sample, with the approximate center of each state
+STATES: Dict[str, Tuple[float, float, float]] = {
+    "SP": (0.4198, -23.0, -47.5),
+    "RJ": (0.1292, -22.5, -43.2),
+    "MG": (0.1170, -19.0, -44.5),
+    "RS": (0.0550, -29.7, -52.5),
+    "PR": (0.0507, -24.8, -51.2),
+    "SC": (0.0366, -27.2, -49.5),
+    "BA": (0.0340, -12.9, -40.5),
+    "DF": (0.0215, -15.8, -47.9),
+    "ES": (0.0204, -19.6, -40.5),
+    "GO": (0.0203, -16.3, -49.3),
+    "PE": (0.0166, -8.3, -36.9),
+    "CE": (0.0134, -4.8, -39.5),
+    "PA": (0.0098, -3.8, -52.5),
+    "MT": (0.0091, -13.0, -56.0),
+    "MA": (0.0075, -4.9, -45.2),
+    "MS": (0.0072, -20.5, -54.6),
+    "PB": (0.0054, -7.1, -36.6),
+    "PI": (0.0050, -7.7, -42.7),
+    "RN": (0.0049, -5.8, -36.5),
+    "AL": (0.0042, -9.6, -36.6),
+    "SE": (0.0035, -10.6, -37.4),
+    "TO": (0.0028, -10.2, -48.3),
+    "RO": (0.0025, -10.9, -62.8),
+    "AM": (0.0015, -3.4, -62.0),
+    "AC": (0.0008, -9.0, -70.3),
+    "AP": (0.0007, 1.4, -51.8),
+    "RR": (0.0005, 2.1, -61.4),
+}
+
+# Product categories (Portuguese name, English name) with their share of products
+CATEGORIES: Dict[str, Tuple[str, float]] = {
+    "cama_mesa_banho": ("bed_bath_table", 0.093),
+    "esporte_lazer": ("sports_leisure", 0.087),
+    "moveis_decoracao": ("furniture_decor", 0.082),
+    "beleza_saude": ("health_beauty", 0.076),
+    "utilidades_domesticas": ("housewares", 0.072),
+    "automotivo": ("auto", 0.058),
+    "informatica_acessorios": ("computers_accessories", 0.051),
+    "brinquedos": ("toys", 0.043),
+    "relogios_presentes": ("watches_gifts", 0.036),
+    "telefonia": ("telephony", 0.033),
+    "bebes": ("baby", 0.029),
+    "perfumaria": ("perfumery", 0.026),
+    "papelaria": ("stationery", 0.026),
+    "fashion_bolsas_e_acessorios": ("fashion_bags_accessories", 0.026),
+    "cool_stuff": ("cool_stuff", 0.024),
+    "ferramentas_jardim": ("garden_tools", 0.023),
+    "pet_shop": ("pet_shop", 0.021),
+    "eletronicos": ("electronics", 0.016),
+    "construcao_ferramentas_construcao": ("construction_tools_construction", 0.015),
+    "eletrodomesticos": ("home_appliances", 0.013),
+    "malas_acessorios": ("luggage_accessories", 0.011),
+    "consoles_games": ("consoles_games", 0.010),
+    "instrumentos_musicais": ("musical_instruments", 0.009),
+    "livros_interesse_geral": ("books_general_interest", 0.016),
+    "alimentos": ("food", 0.005),
+    "seguros_e_servicos": ("security_and_services", 0.0001),
+}
+
+ORDER_STATUSES = {
+    "delivered": 0.9702,
+    "shipped": 0.0111,
+    "canceled": 0.0063,
+    "unavailable": 0.0061,
+    "invoiced": 0.0032,
+    "processing": 0.0030,
+    "created": 0.0001,
+    "approved": 0.0001,
+}
+ITEMS_PER_ORDER = {1: 0.9006, 2: 0.0757, 3: 0.0121, 4: 0.0051, 5: 0.0023, 6: 0.0042}
+PAYMENTS_PER_ORDER = {1: 0.9690, 2: 0.0246, 3: 0.0064}
+PAYMENT_TYPES = {"credit_card": 0.7392, "boleto": 0.1904, "voucher": 0.0556, "debit_card": 0.0148}
+INSTALLMENTS = {1: 0.505, 2: 0.119, 3: 0.101, 4: 0.068, 5: 0.050, 6: 0.039, 7: 0.016, 8: 0.043, 10: 0.059}
+REVIEW_SCORES = {5: 0.5771, 4: 0.1929, 3: 0.0824, 2: 0.0318, 1: 0.1158}
+REVIEW_MESSAGES = [
+    "Recebi bem antes do prazo estipulado.",
+    "Produto de boa qualidade, recomendo.",
+    "Entrega rapida e produto conforme o anunciado.",
+    "Ainda nao recebi o produto.",
+    "Veio com defeito, quero trocar.",
+    "Otimo vendedor, muito atencioso.",
+]
+# Share of orders placed by a customer_unique_id that already bought
+REPEAT_CUSTOMER_SHARE = 0.03
+# Orders per product, seller and zip code prefix in the Olist sample, which has about
+# 19,000 zip code prefixes in total
+ORDERS_PER_PRODUCT = 3.0
+ORDERS_PER_SELLER = 32.0
+ORDERS_PER_ZIP_CODE = 5.0
+MAX_ZIP_CODES = 19_000
+
+PURCHASE_START = np.datetime64("2016-09-04T00:00:00", "s")
+PURCHASE_DAYS = 730
+BLACK_FRIDAY = np.datetime64("2017-11-24T00:00:00", "s")
+# Share of purchases per hour of the day, quiet at night and busiest in the afternoon
+PURCHASE_HOURS = np.array(
+    [2.4, 1.1, 0.5, 0.3, 0.2, 0.2, 0.5, 1.2, 3.0, 4.8, 6.2, 6.6,
+     6.0, 6.6, 6.7, 6.4, 6.4, 6.0, 5.7, 5.9, 6.2, 6.1, 5.8, 4.4]
+)
+
+DAY = np.timedelta64(86400, "s")
+HOUR = np.timedelta64(3600, "s")
+
+# Every id is derived from (seed, namespace, row number), so rows of different chunks
+# reference each other without keeping any id in memory
+_NAMESPACES = {"customer": 1, "customer_unique": 2, "order": 3, "product": 4, "seller": 5, "review": 6}
+
+
+def _probabilities(weights: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.array(list(weights))
+    p = np.array(list(weights.values()), dtype=float)
+    return values, p / p.sum()
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: a bijection of uint64 with good avalanche."""
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _ids(seed: int, namespace: str, rows: np.ndarray) -> pa.Array:
+    """32 character hexadecimal ids, unique per (seed, namespace, row) like the Olist md5 ids."""
+    key = _mix(np.array([seed * 16 + _NAMESPACES[namespace]], dtype=np.uint64))
+    high = _mix(rows.astype(np.uint64) ^ key)
+    low = _mix(high ^ np.uint64(_NAMESPACES[namespace]))
+    hex_text = np.column_stack([high, low]).astype(">u8").tobytes().hex()
+    return pa.array(np.frombuffer(hex_text.encode(), dtype="S32")).cast(pa.string())
+
+
+def _timestamps(values: np.ndarray, valid: Optional[np.ndarray] = None) -> pa.Array:
+    mask = None if valid is None else ~valid
+    return pa.array(values.astype("datetime64[s]"), type=pa.timestamp("s"), mask=mask)
+
+
+def _days(rng: np.random.Generator, shape: float, mean_days: float, size: int) -> np.ndarray:
+    """Gamma distributed durations, in whole seconds."""
+    days = rng.gamma(shape, mean_days / shape, size)
+    return (days * 86400).astype("timedelta64[s]")
+
+
+class _Catalog:
+    """Zip codes, products and sellers shared by every chunk of orders."""
+
+    def __init__(self, rng: np.random.Generator, n_orders: int):
+        states, state_p = _probabilities({state: values[0] for state, values in STATES.items()})
+
+        n_zip_codes = min(max(int(n_orders / ORDERS_PER_ZIP_CODE), 50), MAX_ZIP_CODES)
+        zip_states = rng.choice(len(states), n_zip_codes, p=state_p)
+        # Every state gets at least one zip code prefix
+        zip_states[: len(states)] = np.arange(len(states))
+        self.zip_codes = np.sort(rng.choice(np.arange(1000, 100000), n_zip_codes, replace=False))
+        self.zip_states = states[zip_states]
+        self.zip_cities = np.char.add(
+            np.char.add(np.char.lower(self.zip_states.astype(str)), "_city_"),
+            rng.integers(0, 40, n_zip_codes).astype(str),
+        )
+        per_zip = state_p[zip_states] / np.bincount(zip_states, minlength=len(states))[zip_states]
+        self.zip_p = per_zip / per_zip.sum()
+
+        self.n_products = max(int(n_orders / ORDERS_PER_PRODUCT), 10)
+        self.n_sellers = max(int(n_orders / ORDERS_PER_SELLER), 5)
+        self.categories, category_p = _probabilities(
+            {name: values[1] for name, values in CATEGORIES.items()}
+        )
+        # Categories are kept as small codes: the catalog has millions of products at 10M orders
+        self.product_categories = rng.choice(len(self.categories), self.n_products, p=category_p).astype(np.int8)
+        self.product_prices = np.clip(rng.lognormal(np.log(75), 0.9, self.n_products), 0.85, 6735.0)
+        self.product_weights = np.clip(
+            np.round(rng.lognormal(np.log(700), 1.2, self.n_products)), 50, 40425
+        )
+        # Every product is sold by one seller; a few sellers carry most of the catalog
+        self.product_sellers = self.popular(rng, self.n_sellers, self.n_products)
+        self.seller_zip_codes = rng.choice(n_zip_codes, self.n_sellers, p=self.zip_p)
+
+    @staticmethod
+    def popular(rng: np.random.Generator, n: int, size: int, skew: float = 2.5) -> np.ndarray:
+        """Indexes in [0, n) following a power law: low indexes are picked far more often."""
+        return np.minimum((n * rng.random(size) ** skew).astype(np.int64), n - 1)
+
+
+def _geolocation(rng: np.random.Generator, catalog: _Catalog, chunksize: int) -> Iterator[pa.Table]:
+    for start in range(0, len(catalog.zip_codes), chunksize):
+        zips = np.arange(start, min(start + chunksize, len(catalog.zip_codes)))
+        rows = np.repeat(zips, rng.geometric(0.2, len(zips)))
+        states = catalog.zip_states[rows]
+        centers = np.array([STATES[state][1:] for state in states]).reshape(-1, 2)
+        yield pa.table(
+            {
+                "geolocation_zip_code_prefix": pa.array(catalog.zip_codes[rows]),
+                "geolocation_lat": pa.array(centers[:, 0] + rng.normal(0, 1.5, len(rows))),
+                "geolocation_lng": pa.array(centers[:, 1] + rng.normal(0, 1.5, len(rows))),
+                "geolocation_city": pa.array(catalog.zip_cities[rows]),
+                "geolocation_state": pa.array(states),
+            }
+        )
+
+
+def _products(rng: np.random.Generator, seed: int, catalog: _Catalog, chunksize: int) -> Iterator[pa.Table]:
+    for start in range(0, catalog.n_products, chunksize):
+        rows = np.arange(start, min(start + chunksize, catalog.n_products))
+        n = len(rows)
+        # About 2% of the Olist products have no category nor descriptive attributes
+        described = rng.random(n) >= 0.0185
+        weights = catalog.product_weights[rows]
+        side = np.cbrt(weights / 0.2).clip(2, 105)
+        yield pa.table(
+            {
+                "product_id": _ids(seed, "product", rows),
+                "product_category_name": pa.array(
+                    catalog.categories[catalog.product_categories[rows]], mask=~described
+                ),
+                "product_name_lenght": pa.array(rng.integers(5, 77, n), mask=~described),
+                "product_description_lenght": pa.array(
+                    np.clip(rng.lognormal(6.4, 0.7, n), 4, 3992).astype(int), mask=~described
+                ),
+                "product_photos_qty": pa.array(rng.geometric(0.5, n).clip(1, 20), mask=~described),
+                "product_weight_g": pa.array(weights.astype(int)),
+                "product_length_cm": pa.array((side * rng.uniform(1.0, 1.6, n)).clip(7, 105).astype(int)),
+                "product_height_cm": pa.array((side * rng.uniform(0.3, 1.0, n)).clip(2, 105).astype(int)),
+                "product_width_cm": pa.array((side * rng.uniform(0.6, 1.2, n)).clip(6, 118).astype(int)),
+            }
+        )
+
+
+def _sellers(seed: int, catalog: _Catalog) -> pa.Table:
+    rows = np.arange(catalog.n_sellers)
+    return pa.table(
+        {
+            "seller_id": _ids(seed, "seller", rows),
+            "seller_zip_code_prefix": pa.array(catalog.zip_codes[catalog.seller_zip_codes]),
+            "seller_city": pa.array(catalog.zip_cities[catalog.seller_zip_codes]),
+            "seller_state": pa.array(catalog.zip_states[catalog.seller_zip_codes]),
+        }
+    )
+
+
+def _purchase_timestamps(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Purchases grow linearly over the two years, with a Black Friday peak."""
+    days = np.floor(PURCHASE_DAYS * np.sqrt(rng.random(n))).astype(np.int64)
+    timestamps = PURCHASE_START + days * DAY
+    black_friday = rng.random(n) < 0.006
+    timestamps[black_friday] = BLACK_FRIDAY
+    hours = rng.choice(24, n, p=PURCHASE_HOURS / PURCHASE_HOURS.sum())
+    return timestamps + hours * HOUR + rng.integers(0, 3600, n).astype("timedelta64[s]")
+
+
+def _order_chunk(
+    rng: np.random.Generator,
+    seed: int,
+    catalog: _Catalog,
+    start: int,
+    n: int,
+    unique_customers: int,
+) -> Tuple[Dict[str, pa.Table], int]:
+    """Customers, orders, items, payments and reviews of orders [start, start + n)."""
+    rows = np.arange(start, start + n)
+    order_ids = _ids(seed, "order", rows)
+    customer_ids = _ids(seed, "customer", rows)
+
+    # customer_unique_id: most orders come from a new person, a few from a returning one
+    new_customer = rng.random(n) >= REPEAT_CUSTOMER_SHARE
+    new_customer[0] |= unique_customers == 0
+    unique_rows = unique_customers + np.cumsum(new_customer) - 1
+    returning = ~new_customer
+    unique_rows[returning] = rng.integers(0, np.maximum(unique_rows[returning], 1))
+    unique_customers += int(new_customer.sum())
+    customer_zips = rng.choice(len(catalog.zip_codes), n, p=catalog.zip_p)
+    customers = pa.table(
+        {
+            "customer_id": customer_ids,
+            "customer_unique_id": _ids(seed, "customer_unique", unique_rows),
+            "customer_zip_code_prefix": pa.array(catalog.zip_codes[customer_zips]),
+            "customer_city": pa.array(catalog.zip_cities[customer_zips]),
+            "customer_state": pa.array(catalog.zip_states[customer_zips]),
+        }
+    )
+
+    statuses, status_p = _probabilities(ORDER_STATUSES)
+    status = statuses[rng.choice(len(statuses), n, p=status_p)]
+    purchase = _purchase_timestamps(rng, n)
+    approved = purchase + (rng.exponential(10.0, n) * 3600).astype("timedelta64[s]")
+    carrier = approved + _days(rng, 2.0, 2.8, n)
+    delivered = carrier + _days(rng, 2.5, 9.0, n)
+    estimated = (purchase.astype("datetime64[D]") + np.maximum(np.round(rng.normal(24, 8, n)), 3).astype(
+        "timedelta64[D]"
+    )).astype("datetime64[s]")
+    has_approval = ~np.isin(status, ["created", "canceled"]) | (rng.random(n) < 0.5)
+    has_carrier = np.isin(status, ["delivered", "shipped"])
+    has_delivery = (status == "delivered") & (rng.random(n) >= 0.0001)
+    orders = pa.table(
+        {
+            "order_id": order_ids,
+            "customer_id": customer_ids,
+            "order_status": pa.array(status),
+            "order_purchase_timestamp": _timestamps(purchase),
+            "order_approved_at": _timestamps(approved, has_approval),
+            "order_delivered_carrier_date": _timestamps(carrier, has_carrier),
+            "order_delivered_customer_date": _timestamps(delivered, has_delivery),
+            "order_estimated_delivery_date": _timestamps(estimated),
+        }
+    )
+
+    counts, count_p = _probabilities(ITEMS_PER_ORDER)
+    item_counts = counts[rng.choice(len(counts), n, p=count_p)]
+    item_orders = np.repeat(np.arange(n), item_counts)
+    n_items = len(item_orders)
+    item_numbers = np.arange(n_items) - np.repeat(np.cumsum(item_counts) - item_counts, item_counts) + 1
+    products = _Catalog.popular(rng, catalog.n_products, n_items)
+    prices = np.round(catalog.product_prices[products] * rng.uniform(0.95, 1.05, n_items), 2)
+    freight = np.round(
+        (7.0 + catalog.product_weights[products] / 1000 * 3.5) * rng.lognormal(0, 0.3, n_items), 2
+    )
+    items = pa.table(
+        {
+            "order_id": order_ids.take(pa.array(item_orders)),
+            "order_item_id": pa.array(item_numbers),
+            "product_id": _ids(seed, "product", products),
+            "seller_id": _ids(seed, "seller", catalog.product_sellers[products]),
+            "shipping_limit_date": _timestamps(approved[item_orders] + 6 * DAY),
+            "price": pa.array(prices),
+            "freight_value": pa.array(freight),
+        }
+    )
+
+    # The payments of an order add up to the price and freight of its items
+    totals = np.bincount(item_orders, weights=prices + freight, minlength=n)
+    counts, count_p = _probabilities(PAYMENTS_PER_ORDER)
+    payment_counts = counts[rng.choice(len(counts), n, p=count_p)]
+    payment_orders = np.repeat(np.arange(n), payment_counts)
+    n_payments = len(payment_orders)
+    sequential = np.arange(n_payments) - np.repeat(np.cumsum(payment_counts) - payment_counts, payment_counts) + 1
+    shares = rng.gamma(1.0, 1.0, n_payments)
+    shares /= np.bincount(payment_orders, weights=shares, minlength=n)[payment_orders]
+    types, type_p = _probabilities(PAYMENT_TYPES)
+    payment_types = types[rng.choice(len(types), n_payments, p=type_p)]
+    # Split payments are completed with vouchers, as in the Olist sample
+    payment_types[sequential > 1] = "voucher"
+    installment_values, installment_p = _probabilities(INSTALLMENTS)
+    installments = np.where(
+        payment_types == "credit_card",
+        installment_values[rng.choice(len(installment_values), n_payments, p=installment_p)],
+        1,
+    )
+    payments = pa.table(
+        {
+            "order_id": order_ids.take(pa.array(payment_orders)),
+            "payment_sequential": pa.array(sequential),
+            "payment_type": pa.array(payment_types),
+            "payment_installments": pa.array(installments),
+            "payment_value": pa.array(np.round(totals[payment_orders] * shares, 2)),
+        }
+    )
+
+    scores, score_p = _probabilities(REVIEW_SCORES)
+    review_scores = scores[rng.choice(len(scores), n, p=score_p)]
+    reviewed_at = np.where(has_delivery, delivered, estimated).astype("datetime64[D]").astype("datetime64[s]") + DAY
+    has_message = rng.random(n) < 0.41
+    reviews = pa.table(
+        {
+            "review_id": _ids(seed, "review", rows),
+            "order_id": order_ids,
+            "review_score": pa.array(review_scores),
+            "review_comment_title": pa.array(
+                np.where(review_scores >= 4, "Recomendo", "Nao recomendo"), mask=rng.random(n) >= 0.12
+            ),
+            "review_comment_message": pa.array(
+                np.array(REVIEW_MESSAGES)[rng.integers(0, len(REVIEW_MESSAGES), n)], mask=~has_message
+            ),
+            "review_creation_date": _timestamps(reviewed_at),
+            "review_answer_timestamp": _timestamps(
+                reviewed_at + (rng.exponential(3.0, n) * 86400).astype("timedelta64[s]")
+            ),
+        }
+    )
+
+    tables = {
+        "olist_customers": customers,
+        "olist_orders": orders,
+        "olist_order_items": items,
+        "olist_order_payments": payments,
+        "olist_order_reviews": reviews,
+    }
+    return tables, unique_customers
+
+
+class _CsvWriters:
+    """One streaming CSV writer per table, opened on its first chunk."""
+
+    def __init__(self, folder: str, table_files: Dict[str, str]):
+        self.folder = folder
+        self.table_files = table_files
+        self.writers: Dict[str, pa_csv.CSVWriter] = {}
+        self.rows: Dict[str, int] = {table_name: 0 for table_name in table_files}
+
+    def write(self, table_name: str, table: pa.Table):
+        if table_name not in self.writers:
+            path = os.path.join(self.folder, self.table_files[table_name])
+            self.writers[table_name] = pa_csv.CSVWriter(path, table.schema)
+        self.writers[table_name].write_table(table)
+        self.rows[table_name] += table.num_rows
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+def generate_dataset(
+    folder: str, n_orders: int, seed: int = 0, chunksize: int = 100_000
+) -> Dict[str, int]:
+    """Write a synthetic Olist dataset with the CSV layout of get_csv_to_table_mapping().
+
+    Rows are generated and appended to the CSV files one chunk of orders at a time, so
+    memory depends on the chunk size and on the catalog (zip codes, products and sellers,
+    which grow with n_orders), not on the number of orders. Every order has one customer,
+    items referencing existing products and sellers, payments that add up to the items
+    and one review. Customer states, categories, order statuses, item and payment counts,
+    payment types and review scores follow the shares of the Olist sample; purchases grow
+    over 2016-09 to 2018-09 with a Black Friday peak, product popularity follows a power
+    law, and prices, weights and delivery times are skewed like the original.
+
+    The same seed and chunk size always produce the same files.
+
+    Args:
+        folder (str): Folder the CSV files are written to.
+        n_orders (int): Number of orders.
+        seed (int): Seed of the random generator.
+        chunksize (int): Number of orders generated at a time.
+
+    Returns:
+        Dict[str, int]: Number of rows written per table.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder, exist_ok=True)
+    table_files = {table_name: csv_file for csv_file, table_name in get_csv_to_table_mapping().items()}
+    catalog = _Catalog(rng, n_orders)
+
+    writers = _CsvWriters(folder, table_files)
+    try:
+        writers.write(
+            "product_category_name_translation",
+            pa.table(
+                {
+                    "product_category_name": list(CATEGORIES),
+                    "product_category_name_english": [values[0] for values in CATEGORIES.values()],
+                }
+            ),
+        )
+        writers.write("olist_sellers", _sellers(seed, catalog))
+        for table in _products(rng, seed, catalog, chunksize):
+            writers.write("olist_products", table)
+        for table in _geolocation(rng, catalog, chunksize):
+            writers.write("olist_geolocation", table)
+
+        unique_customers = 0
+        for start in range(0, n_orders, chunksize):
+            tables, unique_customers = _order_chunk(
+                rng, seed, catalog, start, min(chunksize, n_orders - start), unique_customers
+            )
+            for table_name, table in tables.items():
+                writers.write(table_name, table)
+    finally:
+        writers.close()
+
+    return {table_name: writers.rows[table_name] for table_name in table_files}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Olist dataset.")
+    parser.add_argument("folder", help="Folder the CSV files are written to.")
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    rows = generate_dataset(args.folder, args.orders, args.seed, args.chunksize)
+    for table_name, count in rows.items():
+        print(f"{table_name:<35} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import psutil
+from pandas import DataFrame
+
+from src.config import TELEMETRY_LOG_PATH, TELEMETRY_PROMETHEUS_PATH
+
+logger = logging.getLogger(__name__)
+
+# Record of the stage running in the current thread, so nested code (e.g. the SQL
+# helper of src.transform) can attach details such as the query plan to it
+_current_record: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "telemetry_record", default=None
+)
+
+
+class PeakMemorySampler(threading.Thread):
+    """Sample the resident memory of the process until stopped, keeping the peak."""
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.process = psutil.Process()
+        self.interval = interval
+        self.start_rss = self.peak_rss = self.process.memory_info().rss
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+    def stop(self) -> int:
+        """Stop sampling and return the peak growth over the starting memory, in bytes."""
+        self._stop_event.set()
+        self.join()
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+        return self.peak_rss - self.start_rss
+
+
+def count_rows(value: Any) -> Optional[int]:
+    """Rows of a DataFrame, of a dictionary of DataFrames or of a QueryResult, else None."""
+    if isinstance(value, DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        counts = [count_rows(item) for item in value.values()]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    result = getattr(value, "result", None)
+    if isinstance(result, DataFrame):
+        return len(result)
+    return None
+
+
+def _read_chars(process: psutil.Process) -> Optional[int]:
+    """Bytes read by the process through read() calls, cached or not, when the OS reports it."""
+    try:
+        counters = process.io_counters()
+    except (AttributeError, psutil.Error):
+        return None
+    return getattr(counters, "read_chars", counters.read_bytes)
+
+
+class Telemetry:
+    """Collect wall time, CPU time, memory, rows and bytes read per pipeline stage.
+
+    Every finished stage is emitted as one JSON log line (through the "src.telemetry"
+    logger and, when log_path is set, appended to that file) and, when prometheus_path
+    is set, the Prometheus text exposition of all stages seen so far is rewritten.
+
+    Peak memory is sampled by one thread per top-level stage only: a stage nested in
+    another (e.g. the query functions called by the top 10 functions) records its time
+    and rows, and its memory is part of the peak of the enclosing stage.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        log_path: Optional[str] = TELEMETRY_LOG_PATH,
+        prometheus_path: Optional[str] = TELEMETRY_PROMETHEUS_PATH,
+        explain: bool = False,
+        max_records: int = 1000,
+    ):
+        """
+        Args:
+            enabled (bool): Record stages at all. When False, stage() only runs the code.
+            log_path (Optional[str]): JSON lines file the records are appended to.
+            prometheus_path (Optional[str]): Prometheus text file rewritten after each stage.
+            explain (bool): Capture the SQLite EXPLAIN QUERY PLAN of every SQL query, which
+                runs each query's planner a second time.
+            max_records (int): Number of recent records kept in memory.
+        """
+        self.enabled = enabled
+        self.log_path = log_path
+        self.prometheus_path = prometheus_path
+        self.explain = explain
+        self.records: deque = deque(maxlen=max_records)
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None, **labels) -> Iterator[Dict[str, Any]]:
+        """Measure the code of the with block as one stage.
+
+        The yielded record can be completed by the block, e.g. record["rows_out"] = n.
+
+        Args:
+            name (str): Stage name.
+            rows_in (Optional[int]): Rows the stage receives.
+            **labels: Extra fields stored in the record, such as the query name.
+        """
+        record: Dict[str, Any] = {"stage": name, **labels, "rows_in": rows_in, "rows_out": None}
+        if not self.enabled:
+            yield record
+            return
+
+        parent = _current_record.get()
+        process = psutil.Process()
+        read_chars = _read_chars(process)
+        sampler = None
+        if parent is None:
+            sampler = PeakMemorySampler()
+            sampler.start()
+        else:
+            record["parent_stage"] = parent["stage"]
+        token = _current_record.set(record)
+        started_at = datetime.now(timezone.utc)
+        wall, cpu = time.perf_counter(), time.process_time()
+        status = "ok"
+        try:
+            yield record
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall
+            # Process-wide CPU time: it includes other threads running at the same time
+            record["cpu_seconds"] = time.process_time() - cpu
+            record["peak_rss_delta_bytes"] = sampler.stop() if sampler is not None else None
+            end_chars = _read_chars(process)
+            record["bytes_read"] = (
+                end_chars - read_chars if read_chars is not None and end_chars is not None else None
+            )
+            record["status"] = status
+            record["started_at"] = started_at.isoformat()
+            _current_record.reset(token)
+            self._emit(record)
+
+    def instrument(self, name: Optional[str] = None) -> Callable:
+        """Decorator that measures every call of a function as a stage.
+
+        rows_in counts the rows of the DataFrame (or dictionary of DataFrames) arguments and
+        rows_out the rows of the returned value.
+
+        Args:
+            name (Optional[str]): Stage name. Defaults to the function name.
+        """
+
+        def decorator(function: Callable) -> Callable:
+            stage_name = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                counts = [count_rows(value) for value in (*args, *kwargs.values())]
+                counts = [count for count in counts if count is not None]
+                with self.stage(stage_name, rows_in=sum(counts) if counts else None) as record:
+                    result = function(*args, **kwargs)
+                    record["rows_out"] = count_rows(result)
+                    return result
+
+            return wrapper
+
+        return decorator
+
+    def record_query_plan(self, connection, query: str, params: Optional[Dict[str, Any]] = None):
+        """Attach the EXPLAIN QUERY PLAN of a SQLite query to the stage running it.
+
+        Args:
+            connection: DB-API connection (sqlite3) the query runs on.
+            query (str): The SQL query.
+            params (Optional[Dict[str, Any]]): Named parameters of the query.
+        """
+        record = _current_record.get()
+        if not self.enabled or not self.explain or record is None:
+            return
+        try:
+            cursor = connection.cursor()
+            rows = cursor.execute(f"EXPLAIN QUERY PLAN {query.split(';')[0]}", params or {}).fetchall()
+            cursor.close()
+        except Exception as error:  # a plan is diagnostics only, it must never fail a query
+            record.setdefault("query_plans", []).append({"error": str(error)})
+            return
+        record.setdefault("query_plans", []).append(
+            [{"id": row[0], "parent": row[1], "detail": row[-1]} for row in rows]
+        )
+
+    def _emit(self, record: Dict[str, Any]):
+        line = json.dumps(record, default=str)
+        logger.info(line)
+        with self._lock:
+            self.records.append(record)
+            self._latest[record["stage"]] = record
+            if self.log_path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            if self.prometheus_path:
+                self.write_prometheus(self.prometheus_path)
+
+    def to_prometheus(self) -> str:
+        """Render the last record of every stage in the Prometheus text exposition format."""
+        latest = dict(self._latest)
+        metrics = [
+            ("wall_seconds", "Wall time of the last run of the stage."),
+            ("cpu_seconds", "CPU time of the process during the last run of the stage."),
+            ("peak_rss_delta_bytes", "Peak resident memory growth during the last run of the stage."),
+            ("rows_in", "Rows received by the last run of the stage."),
+            ("rows_out", "Rows returned by the last run of the stage."),
+            ("bytes_read", "Bytes read by the process during the last run of the stage."),
+        ]
+        lines = []
+        for metric, help_text in metrics:
+            lines.append(f"# HELP olist_stage_{metric} {help_text}")
+            lines.append(f"# TYPE olist_stage_{metric} gauge")
+            for stage, record in latest.items():
+                if record.get(metric) is not None:
+                    lines.append(f'olist_stage_{metric}{{stage="{stage}"}} {record[metric]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write to_prometheus() to a file atomically, e.g. for the node_exporter textfile collector."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+# Shared instance used by the instrumented pipeline functions. Off unless TELEMETRY_ENABLED=1;
+# TELEMETRY_EXPLAIN=1 also captures the query plans
+TELEMETRY = Telemetry(
+    enabled=os.environ.get("TELEMETRY_ENABLED", "0") == "1",
+    explain=os.environ.get("TELEMETRY_EXPLAIN", "0") == "1",
+)
+instrument = TELEMETRY.instrument
+stage = TELEMETRY.stage
@@ -1,14 +1,39 @@
+import os
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 
 import pandas as pd
 from pandas import DataFrame, read_sql
+from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 
-from src.config import QUERIES_ROOT_PATH
+from src.backends import Backend, SQLiteBackend
+from src.compaction import compact_frames
+from src.config import QUERIES_ROOT_PATH, get_query_tables
+from src.load import LOAD_METADATA_TABLE
+from src.telemetry import TELEMETRY, instrument
+
+if TYPE_CHECKING:
+    from src.cache import QueryResultCache
 
 QueryResult = namedtuple("QueryResult", ["query", "result"])
+QueryDependencies = namedtuple("QueryDependencies", ["query", "sql", "tables"])
+
+# Queries run on a SQLite Engine or on any analytical backend (see src.backends)
+Database = Union[Engine, Backend]
+
+MONTH_ABBREVIATIONS = [
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
+]
+
+# Years of the Olist dataset: the pivoted results always have their columns, as the
+# original fixed-schema queries did, even when the data has no rows for one of them
+HISTORICAL_YEARS = (2016, 2017, 2018)
 
 
 class QueryEnum(Enum):
@@ -22,6 +47,7 @@ class QueryEnum(Enum):
     TOP_10_REVENUE_CATEGORIES = "top_10_revenue_categories"
     REAL_VS_ESTIMATED_DELIVERED_TIME = "real_vs_estimated_delivered_time"
     ORDERS_PER_DAY_AND_HOLIDAYS_2017 = "orders_per_day_and_holidays_2017"
+    ORDERS_PER_DAY_AND_HOLIDAYS = "orders_per_day_and_holidays"
     GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP = "get_freight_value_weight_relationship"
 
 
@@ -39,133 +65,241 @@ def read_query(query_name: str) -> str:
     return sql
 
 
-def query_delivery_date_difference(database: Engine) -> QueryResult:
+def _read_query(database: Database, query_name: str) -> str:
+    """Read the query in the SQL dialect of the database."""
+    if isinstance(database, Backend):
+        return database.read_query(query_name)
+    return read_query(query_name)
+
+
+def _run_query(
+    database: Database, query: str, params: Optional[Dict[str, Any]] = None
+) -> DataFrame:
+    """Run a SQL query on its own connection and return the result as a dataframe.
+
+    On SQLite the EXPLAIN QUERY PLAN of the query is attached to the telemetry record of
+    the query function running it.
+
+    Args:
+        database (Database): Database connection or analytical backend.
+        query (str): The SQL query.
+        params (Optional[Dict[str, Any]]): Named parameters of the query.
+
+    Returns:
+        DataFrame: The query result.
+    """
+    if isinstance(database, Backend):
+        return database.run_query(query, params)
+    with database.connect() as connection:
+        TELEMETRY.record_query_plan(connection.connection, query, params)
+        return read_sql(query, connection.connection, params=params)
+
+
+def pivot_years(
+    long: DataFrame,
+    metrics: Dict[str, str],
+    fill_value: Optional[float] = None,
+    years: Sequence[int] = HISTORICAL_YEARS,
+) -> DataFrame:
+    """Pivot a long (year, month, metrics...) result into one column per year and metric.
+
+    There is a column for every year in "years" and for every other year present in the
+    data, so new years need no query changes and the historical columns exist even when
+    the data has no rows for them (or no rows at all).
+    The result has one row per month (month_no "01".."12" and month "Jan".."Dec")
+    followed by the Year<year><suffix> columns, grouped by metric and sorted by year.
+
+    Args:
+        long (DataFrame): Result with integer year and month columns and one column per metric.
+        metrics (Dict[str, str]): Metric columns mapped to the suffix of their pivoted columns.
+        fill_value (Optional[float]): Value for months and years without data. NaN when None.
+        years (Sequence[int]): Years that always get a column.
+
+    Returns:
+        DataFrame: The pivoted result.
+    """
+    all_years = sorted(set(years) | {int(year) for year in long["year"].dropna().unique()})
+    wide = (
+        long.pivot(index="month", columns="year", values=list(metrics))
+        .reindex(index=range(1, 13))
+        .reindex(columns=pd.MultiIndex.from_product([list(metrics), all_years]))
+    )
+    if fill_value is not None:
+        wide = wide.fillna(fill_value)
+    wide.columns = [f"Year{year}{metrics[metric]}" for metric, year in wide.columns]
+
+    months = DataFrame(
+        {"month_no": [f"{month:02d}" for month in range(1, 13)], "month": MONTH_ABBREVIATIONS}
+    )
+    return pd.concat([months, wide.reset_index(drop=True)], axis=1)
+
+
+@instrument()
+def query_delivery_date_difference(database: Database) -> QueryResult:
     """Get the query for delivery date difference."""
     query_name = QueryEnum.DELIVERY_DATE_DIFFERECE.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    query = _read_query(database, query_name)
+    result = _run_query(database, query)
     return QueryResult(query=query_name, result=result)
 
 
-def query_global_ammount_order_status(database: Engine) -> QueryResult:
+@instrument()
+def query_global_ammount_order_status(database: Database) -> QueryResult:
     """Get the query for global amount of order status."""
     query_name = QueryEnum.GLOBAL_AMMOUNT_ORDER_STATUS.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    query = _read_query(database, query_name)
+    result = _run_query(database, query)
     return QueryResult(query=query_name, result=result)
 
 
-def query_revenue_by_month_year(database: Engine) -> QueryResult:
-    """Get the query for revenue by month year."""
+@instrument()
+def query_revenue_by_month_year(database: Database) -> QueryResult:
+    """Get the query for revenue by month year.
+
+    Revenue is grouped by (year, month) in one pass and pivoted to one Year<year>
+    column per year present in the data.
+    """
     query_name = QueryEnum.REVENUE_BY_MONTH_YEAR.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    query = _read_query(database, query_name)
+    result = pivot_years(_run_query(database, query), {"Revenue": ""}, fill_value=0)
     return QueryResult(query=query_name, result=result)
 
 
-def query_revenue_per_state(database: Engine) -> QueryResult:
+@instrument()
+def query_revenue_per_state(database: Database) -> QueryResult:
     """Get the query for revenue per state."""
     query_name = QueryEnum.REVENUE_PER_STATE.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    query = _read_query(database, query_name)
+    result = _run_query(database, query)
     return QueryResult(query=query_name, result=result)
 
 
-def query_top_10_least_revenue_categories(database: Engine) -> QueryResult:
+@instrument()
+def query_revenue_categories(
+    database: Database, n: int = 10, ascending: bool = False, allocated: bool = True
+) -> QueryResult:
+    """Get the n categories with the highest (or lowest) revenue.
+
+    Every ranking is served from summary_category_revenue, the per-category aggregate
+    materialized once after load, so any top-N or bottom-N is a lookup.
+
+    The result is named "top_<n>_categories_by_revenue" (or "bottom_..."), and
+    "..._by_item_revenue" when allocated is False, so it never shares a name with the
+    QueryEnum results, whose Revenue is measured differently.
+
+    Args:
+        database (Database): Database connection or analytical backend.
+        n (int): Number of categories.
+        ascending (bool): Return the categories with the lowest revenue instead.
+        allocated (bool): Split the payments of an order among its categories in
+            proportion to the price of their items, so the revenue of all categories
+            adds up to the total. When False they are counted once per item, as in the
+            historical top 10 results.
+
+    Returns:
+        QueryResult: Result with the columns Category, Num_order and Revenue.
+    """
+    measure = "revenue" if allocated else "item_revenue"
+    query_name = f"{'bottom' if ascending else 'top'}_{n}_categories_by_{measure}"
+    query = _read_query(database, "category_revenue")
+    params = {"n": n, "ascending": int(ascending), "allocated": int(allocated)}
+    result = _run_query(database, query, params)
+    return QueryResult(query=query_name, result=result)
+
+
+@instrument()
+def query_top_10_least_revenue_categories(database: Database) -> QueryResult:
     """Get the query for top 10 least revenue categories."""
     query_name = QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    result = query_revenue_categories(database, 10, ascending=True, allocated=False).result
+    result["Revenue"] = result["Revenue"].round(2)
     return QueryResult(query=query_name, result=result)
 
 
-def query_top_10_revenue_categories(database: Engine) -> QueryResult:
+@instrument()
+def query_top_10_revenue_categories(database: Database) -> QueryResult:
     """Get the query for top 10 revenue categories."""
     query_name = QueryEnum.TOP_10_REVENUE_CATEGORIES.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    result = query_revenue_categories(database, 10, allocated=False).result
     return QueryResult(query=query_name, result=result)
 
 
-def query_real_vs_estimated_delivered_time(database: Engine) -> QueryResult:
-    """Get the query for real vs estimated delivered time."""
+@instrument()
+def query_real_vs_estimated_delivered_time(database: Database) -> QueryResult:
+    """Get the query for real vs estimated delivered time.
+
+    Both averages are grouped by (year, month) in one pass and pivoted to the
+    Year<year>_real_time and Year<year>_estimated_time columns of every year present
+    in the data.
+    """
     query_name = QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value
-    query = read_query(query_name)
-    with database.connect() as connection:
-        result = read_sql(query, connection.connection)
+    query = _read_query(database, query_name)
+    result = pivot_years(
+        _run_query(database, query),
+        {"real_time": "_real_time", "estimated_time": "_estimated_time"},
+    )
     return QueryResult(query=query_name, result=result)
 
 
-def query_freight_value_weight_relationship(database: Engine) -> QueryResult:
+@instrument()
+def query_freight_value_weight_relationship(database: Database) -> QueryResult:
     """Get the freight_value vs weight relationship for delivered orders.
 
-    This query merges the orders, items, and products tables, filtering only
-    'delivered' orders and aggregating freight_value and product_weight_g by order.
+    The join of orders, items and products, the 'delivered' filter and the sum of
+    freight_value and product_weight_g by order all run inside the database.
     """
     query_name = QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value
+    query = _read_query(database, query_name)
+    result = _run_query(database, query)
+    return QueryResult(query=query_name, result=result)
 
-    with database.connect() as connection:
-        # Leemos las tablas
-        orders = read_sql("SELECT * FROM olist_orders", connection.connection)
-        items = read_sql("SELECT * FROM olist_order_items", connection.connection)
-        products = read_sql("SELECT * FROM olist_products", connection.connection)
 
-    # Fusionamos las tablas
-    data = pd.merge(items, orders, on="order_id", how="inner")
-    data = pd.merge(data, products, on="product_id", how="inner")
+@instrument()
+def query_orders_per_day_and_holidays(
+    database: Database, start_year: int, end_year: Optional[int] = None
+) -> QueryResult:
+    """Get the query for orders per day and holidays in a range of years.
 
-    # Filtramos pedidos con estado 'delivered'
-    delivered = data[data["order_status"] == "delivered"]
+    Orders are counted per purchase day in SQL and joined with the holidays table,
+    so only one row per day reaches pandas. Days are integer keys built from the
+    year/month/day columns stored at load time.
 
-    # Sumamos freight_value y product_weight_g por order_id
-    aggregations = delivered.groupby("order_id", as_index=False).agg(
-        {"freight_value": "sum", "product_weight_g": "sum"}
-    )
+    Args:
+        database (Database): Database connection or analytical backend.
+        start_year (int): First year of the range.
+        end_year (Optional[int]): Last year of the range (inclusive). Defaults to start_year.
 
-    return QueryResult(query=query_name, result=aggregations)
+    Returns:
+        QueryResult: Result with the columns order_count, date and holiday.
+    """
+    query_name = QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS.value
+    query = _read_query(database, query_name)
+    params = {"start_year": start_year, "end_year": end_year or start_year}
+    result = _run_query(database, query, params)
+    # The date is assembled from the integer year/month/day columns, without parsing text
+    result = DataFrame(
+        {
+            "order_count": result["order_count"],
+            "date": pd.to_datetime(result[["year", "month", "day"]]),
+            "holiday": result["holiday"].astype(bool),
+        }
+    )
+    return QueryResult(query=query_name, result=result)
 
 
-def query_orders_per_day_and_holidays_2017(database: Engine) -> QueryResult:
+@instrument()
+def query_orders_per_day_and_holidays_2017(database: Database) -> QueryResult:
     """Get the query for orders per day and holidays in 2017."""
     query_name = QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value
-    with database.connect() as connection:
-        # Leemos los días festivos
-        holidays = read_sql("SELECT * FROM public_holidays", connection.connection)
-        holidays["date"] = pd.to_datetime(holidays["date"]).dt.date
-
-        # Leemos las órdenes
-        orders = read_sql("SELECT * FROM olist_orders", connection.connection)
-        orders["order_purchase_timestamp"] = pd.to_datetime(orders["order_purchase_timestamp"])
-        filtered_dates = orders[orders["order_purchase_timestamp"].dt.year == 2017]
-
-        order_purchase_ammount_per_date = (
-            filtered_dates.groupby(filtered_dates["order_purchase_timestamp"].dt.date)
-            .size()
-            .reset_index(name="order_count")
-        )
-
-        order_purchase_ammount_per_date.rename(
-            columns={order_purchase_ammount_per_date.columns[0]: "date"}, inplace=True
-        )
-        order_purchase_ammount_per_date["holiday"] = order_purchase_ammount_per_date["date"].apply(
-            lambda x: x in set(holidays["date"])
-        )
-        result_df = order_purchase_ammount_per_date[["order_count", "date", "holiday"]]
-
-    return QueryResult(query=query_name, result=result_df)
+    result = query_orders_per_day_and_holidays(database, 2017).result
+    return QueryResult(query=query_name, result=result)
 
 
-def get_all_queries() -> List[Callable[[Engine], QueryResult]]:
+def get_all_queries() -> List[Callable[[Database], QueryResult]]:
     """Get all queries.
 
     Returns:
-        List[Callable[[Engine], QueryResult]]: A list of all queries.
+        List[Callable[[Database], QueryResult]]: A list of all queries.
     """
     return [
         query_delivery_date_difference,
@@ -180,17 +314,312 @@ def get_all_queries() -> List[Callable[[Engine], QueryResult]]:
     ]
 
 
-def run_queries(database: Engine) -> Dict[str, DataFrame]:
-    """Run all queries and store results in a dictionary.
+def get_query_dependencies() -> Dict[Callable[[Database], QueryResult], QueryDependencies]:
+    """Get the result name, SQL file and tables read by every query.
+
+    Returns:
+        Dict[Callable[[Database], QueryResult], QueryDependencies]: A dictionary with the
+        query functions of get_all_queries() as keys.
+    """
+    tables = get_query_tables()
+    return {
+        query_delivery_date_difference: QueryDependencies(
+            QueryEnum.DELIVERY_DATE_DIFFERECE.value,
+            "delivery_date_difference",
+            tables[QueryEnum.DELIVERY_DATE_DIFFERECE.value],
+        ),
+        query_global_ammount_order_status: QueryDependencies(
+            QueryEnum.GLOBAL_AMMOUNT_ORDER_STATUS.value,
+            "global_ammount_order_status",
+            tables[QueryEnum.GLOBAL_AMMOUNT_ORDER_STATUS.value],
+        ),
+        query_revenue_by_month_year: QueryDependencies(
+            QueryEnum.REVENUE_BY_MONTH_YEAR.value,
+            "revenue_by_month_year",
+            tables[QueryEnum.REVENUE_BY_MONTH_YEAR.value],
+        ),
+        query_revenue_per_state: QueryDependencies(
+            QueryEnum.REVENUE_PER_STATE.value,
+            "revenue_per_state",
+            tables[QueryEnum.REVENUE_PER_STATE.value],
+        ),
+        query_top_10_least_revenue_categories: QueryDependencies(
+            QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES.value,
+            "category_revenue",
+            tables[QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES.value],
+        ),
+        query_top_10_revenue_categories: QueryDependencies(
+            QueryEnum.TOP_10_REVENUE_CATEGORIES.value,
+            "category_revenue",
+            tables[QueryEnum.TOP_10_REVENUE_CATEGORIES.value],
+        ),
+        query_real_vs_estimated_delivered_time: QueryDependencies(
+            QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value,
+            "real_vs_estimated_delivered_time",
+            tables[QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value],
+        ),
+        query_orders_per_day_and_holidays_2017: QueryDependencies(
+            QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value,
+            "orders_per_day_and_holidays",
+            tables[QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value],
+        ),
+        query_freight_value_weight_relationship: QueryDependencies(
+            QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value,
+            "get_freight_value_weight_relationship",
+            tables[QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value],
+        ),
+    }
+
+
+def get_table_fingerprints(database: Engine, tables: List[str]) -> Dict[str, List]:
+    """Get a cheap fingerprint of the current content of each table.
+
+    The fingerprint is the row count, the maximum rowid and the checksum that every load
+    mode of src.load writes to etl_load_metadata: the checksum of the loaded DataFrame,
+    or for a summary table a combination of the checksums of its sources. The checksum
+    is what changes when a load writes different values in the same number of rows, so
+    the cached results of every QueryResultCache stop matching without having to clear
+    them, and what stays the same when the same data is loaded again, so they are
+    still served.
 
     Args:
         database (Engine): Database connection.
+        tables (List[str]): Table names.
+
+    Returns:
+        Dict[str, List]: A dictionary with the table names as keys and their fingerprints as values.
+    """
+    fingerprints = {}
+    with database.connect() as connection:
+        cursor = connection.connection.cursor()
+        has_metadata = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (LOAD_METADATA_TABLE,)
+        ).fetchone()
+        for table in sorted(set(tables)):
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            if not exists:
+                fingerprints[table] = None
+                continue
+            fingerprint = list(
+                cursor.execute(f'SELECT COUNT(*), MAX(rowid) FROM "{table}"').fetchone()
+            )
+            if has_metadata:
+                checksum = cursor.execute(
+                    f"SELECT checksum FROM {LOAD_METADATA_TABLE} WHERE table_name = ?", (table,)
+                ).fetchone()
+                fingerprint.append(checksum[0] if checksum else None)
+            fingerprints[table] = fingerprint
+        cursor.close()
+    return fingerprints
+
+
+def _is_memory_database(database: Engine) -> bool:
+    """Check whether the engine points to an in-memory SQLite database."""
+    return database.url.database in (None, "", ":memory:")
+
+
+@contextmanager
+def _read_only_engine(database: Engine, pool_size: int) -> Iterator[Engine]:
+    """Open an engine with a pool of read-only connections to the same SQLite file.
+
+    While the readers are open the database is in WAL journal mode, so they never block
+    (or get blocked by) a writer. The previous journal mode is restored afterwards; if
+    another connection still holds the file, SQLite refuses to leave WAL and the
+    database stays in WAL mode, which is harmless for later readers and writers.
+    """
+    with database.connect() as connection:
+        previous_journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+    path = os.path.abspath(database.url.database)
+    reader = create_engine(
+        f"sqlite:///file:{path}?mode=ro&uri=true",
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={"check_same_thread": False},
+    )
+    try:
+        yield reader
+    finally:
+        reader.dispose()
+        if previous_journal_mode.lower() != "wal":
+            try:
+                with database.connect() as connection:
+                    connection.exec_driver_sql(f"PRAGMA journal_mode={previous_journal_mode}")
+            except OperationalError:
+                pass
+
+
+def _run_query_in_process(
+    query: Callable[[Database], QueryResult], database_url: str
+) -> QueryResult:
+    """Run one query in a worker process with its own read-only engine."""
+    engine = create_engine(database_url)
+    try:
+        return query(engine)
+    finally:
+        engine.dispose()
+
+
+def _execute_queries(
+    database: Engine,
+    queries: List[Callable[[Database], QueryResult]],
+    max_workers: Optional[int],
+    use_processes: bool,
+) -> List[QueryResult]:
+    """Run the queries, concurrently when possible, keeping their order."""
+    workers = max_workers or min(len(queries), os.cpu_count() or 1)
+
+    if workers <= 1 or len(queries) <= 1 or _is_memory_database(database):
+        return [query(database) for query in queries]
+
+    with _read_only_engine(database, workers) as reader:
+        if use_processes:
+            database_url = str(reader.url)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(
+                    executor.map(_run_query_in_process, queries, [database_url] * len(queries))
+                )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda query: query(reader), queries))
+
+
+def run_queries(
+    database: Database,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    cache: Optional["QueryResultCache"] = None,
+    compact: bool = False,
+) -> Dict[str, DataFrame]:
+    """Run all queries and store results in a dictionary.
+
+    Queries run concurrently in a thread pool over a pool of read-only WAL connections
+    (or in a process pool when use_processes is True). The database file is switched to
+    WAL journal mode while they run and back to its previous mode afterwards (see
+    _read_only_engine). In-memory databases cannot be shared across connections, so
+    they always run sequentially. The result keeps the
+    order of get_all_queries() regardless of which query finishes first.
+
+    When a cache is given, a query whose SQL text and table fingerprints are unchanged
+    since a previous run is served from the cache instead of being executed. In-memory
+    databases are never cached.
+
+    Any other backend (see src.backends) runs the queries one after the other on its
+    own engine, which parallelizes each query itself. It takes no cache, process pool
+    or max_workers above 1, and passing them raises ValueError instead of ignoring them.
+
+    Args:
+        database (Database): Database connection or analytical backend.
+        max_workers (Optional[int]): Number of queries run at the same time. Defaults to
+            one per query, capped by the number of CPUs. 1 runs sequentially.
+            Values below 1 raise ValueError.
+        use_processes (bool): Use a process pool instead of a thread pool.
+        cache (Optional[QueryResultCache]): Result cache to read from and write to.
+        compact (bool): Shrink the results in memory with categoricals and downcast
+            numerics (see src.compaction.compact_frames). Identifiers stay as strings.
 
     Returns:
         Dict[str, DataFrame]: A dictionary with keys as query names and values as dataframes.
     """
-    query_results = {}
-    for query in get_all_queries():
-        query_result = query(database)
-        query_results[query_result.query] = query_result.result
-    return query_results
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    if isinstance(database, Backend) and not isinstance(database, SQLiteBackend):
+        if cache is not None or use_processes or (max_workers or 1) > 1:
+            raise ValueError(
+                f"The {database.name} backend runs its queries sequentially and without a "
+                "cache: cache, use_processes and max_workers > 1 are not supported"
+            )
+    results = _run_queries(database, max_workers, use_processes, cache)
+    if compact:
+        results, _, _ = compact_frames(results, surrogate_keys=False)
+    return results
+
+
+def _run_queries(
+    database: Database,
+    max_workers: Optional[int],
+    use_processes: bool,
+    cache: Optional["QueryResultCache"],
+) -> Dict[str, DataFrame]:
+    """Body of run_queries(), without the compaction."""
+    queries = get_all_queries()
+    if isinstance(database, SQLiteBackend):
+        database = database.engine
+    elif isinstance(database, Backend):
+        results = [query(database) for query in queries]
+        return {query_result.query: query_result.result for query_result in results}
+
+    if cache is None or _is_memory_database(database):
+        results = _execute_queries(database, queries, max_workers, use_processes)
+        return {query_result.query: query_result.result for query_result in results}
+
+    dependencies = get_query_dependencies()
+    keys = _cache_keys(database, queries, cache)
+
+    cached: Dict[str, DataFrame] = {}
+    pending = []
+    for query in queries:
+        dependency = dependencies[query]
+        result = cache.get(keys[dependency.query])
+        if result is None:
+            pending.append(query)
+        else:
+            cached[dependency.query] = result
+
+    tables_by_name = {dependency.query: dependency.tables for dependency in dependencies.values()}
+    for query_result in _execute_queries(database, pending, max_workers, use_processes):
+        cached[query_result.query] = query_result.result
+        cache.put(
+            keys[query_result.query],
+            query_result.query,
+            tables_by_name[query_result.query],
+            query_result.result,
+        )
+
+    return {dependencies[query].query: cached[dependencies[query].query] for query in queries}
+
+
+def _cache_keys(
+    database: Engine, queries: List[Callable[[Database], QueryResult]], cache: "QueryResultCache"
+) -> Dict[str, str]:
+    """Build the cache key of every query from its SQL text and its table fingerprints."""
+    dependencies = get_query_dependencies()
+    tables = [table for query in queries for table in dependencies[query].tables]
+    fingerprints = get_table_fingerprints(database, tables)
+    return {
+        dependencies[query].query: cache.key(
+            f"{database.url}/{dependencies[query].query}",
+            read_query(dependencies[query].sql),
+            {table: fingerprints[table] for table in dependencies[query].tables},
+        )
+        for query in queries
+    }
+
+
+def run_cached_query(
+    database: Engine, query: Callable[[Database], QueryResult], cache: "QueryResultCache"
+) -> QueryResult:
+    """Run one query of get_all_queries(), served from the cache while its tables are unchanged.
+
+    This is the single-query counterpart of run_queries(cache=...), for callers that run
+    every query in its own task, such as the DAG (see src.pipeline.run_query).
+
+    Args:
+        database (Engine): Database connection.
+        query (Callable[[Database], QueryResult]): One of the functions of get_all_queries().
+        cache (QueryResultCache): Result cache to read from and write to.
+
+    Returns:
+        QueryResult: The result of the query.
+    """
+    if _is_memory_database(database):
+        return query(database)
+    dependency = get_query_dependencies()[query]
+    key = _cache_keys(database, [query], cache)[dependency.query]
+    result = cache.get(key)
+    if result is None:
+        result = query(database).result
+        cache.put(key, dependency.query, dependency.tables, result)
+    return QueryResult(query=dependency.query, result=result)
@@ -0,0 +1,9 @@
+import os
+from pathlib import Path
+
+# Read public holidays from the dataset/public_holidays fixtures instead of the live API,
+# unless PUBLIC_HOLIDAYS_URL is set explicitly. This must run before src.config is imported.
+os.environ.setdefault(
+    "PUBLIC_HOLIDAYS_URL",
+    (Path(__file__).parent.parent / "dataset" / "public_holidays").as_uri(),
+)
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.artifacts import ArtifactStore
+
+
+def test_artifact_store_roundtrip_and_cleanup(tmp_path):
+    """Test that artifacts are read back unchanged and cleanup removes only their run."""
+    df = pd.DataFrame(
+        {
+            "order_status": pd.Categorical(["delivered", "shipped", None]),
+            "order_purchase_timestamp": pd.to_datetime(["2017-01-01", None, "2017-03-01"]),
+            "payment_value": [10.5, np.nan, 3.25],
+            "payment_installments": np.array([1, 2, 3], dtype=np.int64),
+        }
+    )
+    store = ArtifactStore("manual__2017-01-01T00:00:00+00:00", str(tmp_path))
+    other = ArtifactStore("other_run", str(tmp_path))
+    manifest = store.put_many({"orders": df, "empty": df.head(0)})
+    other.put("orders", df)
+
+    assert manifest["orders"]["rows"] == 3 and manifest["orders"]["bytes"] > 0
+    results = ArtifactStore.get_many(manifest)
+    assert_frame_equal(results["orders"], df)
+    assert list(results["empty"].columns) == list(df.columns) and results["empty"].empty
+
+    store.cleanup()
+    assert not os.path.exists(store.run_path)
+    assert os.path.exists(other.run_path)
+
+
+def test_artifact_names_stay_inside_the_run_folder(tmp_path):
+    """Test that artifact names cannot write outside the folder of their run."""
+    store = ArtifactStore("run", str(tmp_path / "artifacts"))
+
+    entry = store.put("../../escaped", pd.DataFrame({"a": [1]}))
+
+    assert os.path.dirname(entry["path"]) == store.run_path
+    assert os.listdir(tmp_path) == ["artifacts"]
@@ -0,0 +1,125 @@
+import json
+import math
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from sqlalchemy import create_engine
+
+from src.backends import Backend, DuckDBBackend, SQLiteBackend
+from src.config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, QUERY_RESULTS_ROOT_PATH
+from src.extract import get_public_holidays_for_years
+from src.transform import query_revenue_categories, run_queries
+from tests.test_load import summary_source_frames
+
+TOLERANCE = 0.1
+
+
+def backend_frames() -> dict:
+    frames = summary_source_frames()
+    frames["olist_order_items"]["freight_value"] = [3.5, 3.5, 8.0, 4.25]
+    frames["olist_products"]["product_weight_g"] = [300.0, 1200.0]
+    frames["public_holidays"] = pd.DataFrame(
+        {"date": pd.to_datetime(["2017-01-01", "2017-04-21"]), "localName": ["x", "y"]}
+    )
+    return frames
+
+
+def test_duckdb_backend_matches_sqlite():
+    """Test that every query returns the same result on DuckDB and on SQLite."""
+    sqlite = SQLiteBackend(create_engine("sqlite://"))
+    duckdb = DuckDBBackend(threads=1)
+    sqlite.load(backend_frames())
+    duckdb.load(backend_frames())
+
+    expected = run_queries(sqlite)
+    results = run_queries(duckdb)
+    duckdb.close()
+
+    assert list(results) == list(expected)
+    for name, result in results.items():
+        assert_frame_equal(
+            result.reset_index(drop=True),
+            expected[name].reset_index(drop=True),
+            check_dtype=False,
+            check_exact=False,
+        )
+
+
+def test_duckdb_backend_allocates_category_revenue_like_sqlite():
+    """Test that both backends split order revenue among categories by item price."""
+    sqlite = SQLiteBackend(create_engine("sqlite://"))
+    duckdb = DuckDBBackend(threads=1)
+    sqlite.load(backend_frames())
+    duckdb.load(backend_frames())
+
+    expected = query_revenue_categories(sqlite, 10)
+    result = query_revenue_categories(duckdb, 10)
+    duckdb.close()
+
+    assert result.query == expected.query
+    assert_frame_equal(result.result, expected.result, check_dtype=False)
+
+
+def test_backend_requires_the_query_methods():
+    """Test that a backend missing one of the abstract methods cannot be instantiated."""
+
+    class PartialBackend(Backend):
+        def read_query(self, query_name):
+            return ""
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+def test_duckdb_backend_rejects_cache_and_parallel_options(tmp_path):
+    """Test that the options run_queries cannot honor on DuckDB raise instead of being ignored."""
+    from src.cache import QueryResultCache
+
+    duckdb = DuckDBBackend(threads=1)
+    duckdb.load(backend_frames())
+    for kwargs in (
+        {"cache": QueryResultCache(str(tmp_path))},
+        {"max_workers": 4},
+        {"use_processes": True},
+    ):
+        with pytest.raises(ValueError):
+            run_queries(duckdb, **kwargs)
+    assert set(run_queries(duckdb, max_workers=1)) == set(run_queries(duckdb))
+    duckdb.close()
+
+
+def _values_are_close(actual, expected) -> bool:
+    """Compare numbers with TOLERANCE, counting a missing number as 0, and the rest exactly."""
+    numbers = (int, float)
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual == expected
+    if isinstance(actual, numbers) or isinstance(expected, numbers):
+        return math.isclose(float(actual or 0.0), float(expected or 0.0), abs_tol=TOLERANCE)
+    return actual == expected
+
+
+@pytest.mark.skipif(
+    not os.path.exists(os.path.join(DATASET_ROOT_PATH, "olist_orders_dataset.csv")),
+    reason="the Olist dataset is not in dataset/",
+)
+def test_duckdb_backend_matches_query_result_fixtures():
+    """Test that DuckDB over the dataset CSVs reproduces tests/query_results/*.json."""
+    holidays = get_public_holidays_for_years(PUBLIC_HOLIDAYS_URL, ["2016", "2017", "2018"])
+    duckdb = DuckDBBackend.from_dataset(public_holidays=holidays)
+    results = run_queries(duckdb)
+    duckdb.close()
+
+    fixtures = sorted(name[: -len(".json")] for name in os.listdir(QUERY_RESULTS_ROOT_PATH))
+    assert fixtures
+    for query_name in fixtures:
+        with open(os.path.join(QUERY_RESULTS_ROOT_PATH, f"{query_name}.json"), "r") as f:
+            expected = json.load(f)
+        actual = json.loads(results[query_name].to_json(orient="records"))
+        assert len(actual) == len(expected), query_name
+        for actual_row, expected_row in zip(actual, expected):
+            assert list(actual_row) == list(expected_row), query_name
+            assert all(
+                _values_are_close(actual_row[key], value) for key, value in expected_row.items()
+            ), (query_name, actual_row, expected_row)
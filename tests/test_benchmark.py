@@ -0,0 +1,55 @@
+import pytest
+
+from src.benchmark import compare_to_baseline, run_scale
+from src.transform import get_all_queries
+
+
+def benchmark_run(seconds: float, memory: int) -> dict:
+    return {
+        "results": [
+            {"scale": 1, "stage": "load", "seconds": seconds, "peak_memory_bytes": memory},
+        ]
+    }
+
+
+def test_compare_to_baseline_flags_regressions_above_threshold():
+    """Test that only growth above both the threshold and the noise floor is a regression."""
+    baseline = benchmark_run(1.0, 100 << 20)
+
+    assert compare_to_baseline(benchmark_run(1.2, 110 << 20), baseline, threshold=0.25) == []
+    assert len(compare_to_baseline(benchmark_run(1.5, 100 << 20), baseline, threshold=0.25)) == 1
+    assert len(compare_to_baseline(benchmark_run(2.0, 200 << 20), baseline, threshold=0.25)) == 2
+    # A tiny stage doubling its time stays below the noise floor
+    assert compare_to_baseline(benchmark_run(0.02, 0), benchmark_run(0.01, 0)) == []
+
+
+def test_compare_to_baseline_rejects_other_machines():
+    """Test that a baseline from a machine with another CPU count fails instead of passing."""
+    metadata = {
+        "platform": "Linux-6.1-x86_64",
+        "system": "Linux",
+        "machine": "x86_64",
+        "cpu_count": 1,
+    }
+    baseline = dict(benchmark_run(1.0, 100 << 20), metadata=metadata)
+    current = dict(benchmark_run(2.0, 100 << 20), metadata=dict(metadata, cpu_count=8))
+
+    with pytest.raises(ValueError, match="cpu_count"):
+        compare_to_baseline(current, baseline)
+    assert len(compare_to_baseline(current, baseline, force=True)) == 1
+
+    # Another kernel build of the same kind of machine is still compared
+    other_kernel = dict(
+        benchmark_run(2.0, 100 << 20), metadata=dict(metadata, platform="Linux-6.2-x86_64")
+    )
+    assert len(compare_to_baseline(other_kernel, baseline)) == 1
+
+
+def test_run_scale_measures_every_stage():
+    """Test that extract, load and every query are measured on synthetic data."""
+    measurements = run_scale(1, base_orders=200, plots=False)
+
+    stages = [measurement["stage"] for measurement in measurements]
+    assert stages == ["extract", "load"] + [query.__name__ for query in get_all_queries()]
+    assert all(measurement["orders"] == 200 for measurement in measurements)
+    assert all(measurement["seconds"] >= 0 for measurement in measurements)
@@ -0,0 +1,59 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from sqlalchemy import create_engine
+
+from src.cache import QueryResultCache
+from src.config import PUBLIC_HOLIDAYS_FIXTURES_URL, get_csv_to_table_mapping
+from src.extract import extract
+from src.load import load
+from src.synthetic import generate_dataset
+from src.transform import run_queries
+
+
+def test_query_result_cache_roundtrip_and_invalidation(tmp_path):
+    """Test that cached results are returned until one of their tables is invalidated."""
+    cache = QueryResultCache(str(tmp_path))
+    result = pd.DataFrame({"State": ["SP", "RJ"], "Delivery_Difference": [10, 12]})
+    key = cache.key("delivery_date_difference", "SELECT 1", {"olist_orders": [2, 2]})
+
+    assert cache.get(key) is None
+    cache.put(key, "delivery_date_difference", ["olist_orders", "olist_customers"], result)
+    pd.testing.assert_frame_equal(cache.get(key), result)
+
+    assert cache.invalidate(["olist_products"]) == 0
+    assert cache.invalidate(["olist_customers"]) == 1
+    assert cache.get(key) is None
+
+
+def test_query_result_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache keeps at most max_entries results, evicting the oldest access."""
+    cache = QueryResultCache(str(tmp_path), max_entries=2)
+    frames = {name: pd.DataFrame({"value": [i]}) for i, name in enumerate("abc")}
+    keys = {name: cache.key(name, "SELECT 1", {}) for name in frames}
+
+    cache.put(keys["a"], "a", ["t"], frames["a"])
+    cache.put(keys["b"], "b", ["t"], frames["b"])
+    cache.get(keys["a"])
+    cache.put(keys["c"], "c", ["t"], frames["c"])
+
+    assert cache.get(keys["b"]) is None
+    assert cache.get(keys["a"]) is not None
+    assert cache.get(keys["c"]) is not None
+
+
+def test_run_queries_cache_misses_after_reload_with_changed_values(tmp_path):
+    """Test that a replace load with the same row count but other values is not served stale."""
+    csv_folder = str(tmp_path / "dataset")
+    generate_dataset(csv_folder, 200, seed=11)
+    engine = create_engine(f"sqlite:///{tmp_path / 'olist.db'}")
+    tables = extract(csv_folder, get_csv_to_table_mapping(), PUBLIC_HOLIDAYS_FIXTURES_URL)
+    load(tables, engine)
+    cache = QueryResultCache(str(tmp_path / "cache"))
+    run_queries(engine, cache=cache)
+
+    tables["olist_order_items"]["freight_value"] *= 2
+    load(tables, engine)
+
+    expected = run_queries(engine)
+    for query_name, df in run_queries(engine, cache=cache).items():
+        assert_frame_equal(df, expected[query_name])
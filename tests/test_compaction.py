@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from sqlalchemy import create_engine
+
+from src.compaction import compact_frame, compact_frames
+from src.config import PUBLIC_HOLIDAYS_FIXTURES_URL, get_csv_to_table_mapping
+from src.extract import extract
+from src.load import load
+from src.synthetic import generate_dataset
+from src.transform import run_queries
+
+
+def _hex_ids(n: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    return [f"{value:032x}" for value in rng.integers(0, 2**62, n)]
+
+
+def test_compact_frames_shares_surrogate_keys_across_tables():
+    """Test that an ID gets the same code in every table and decodes back to the string."""
+    product_ids = _hex_ids(50, seed=1)
+    products = pd.DataFrame({"product_id": product_ids, "product_weight_g": np.arange(50.0)})
+    items = pd.DataFrame(
+        {
+            "product_id": pd.Categorical([product_ids[i] for i in range(49, -1, -7)]),
+            "order_item_id": np.arange(8, dtype=np.int64),
+        }
+    )
+
+    compacted, _, keys = compact_frames({"products": products, "items": items})
+
+    assert compacted["products"]["product_id"].dtype == np.int32
+    assert compacted["items"]["product_id"].dtype == np.int32
+    merged = compacted["items"].merge(compacted["products"], on="product_id")
+    expected = items.astype({"product_id": object}).merge(products, on="product_id")
+    assert merged["product_weight_g"].tolist() == expected["product_weight_g"].tolist()
+    assert keys.decode("product_id", compacted["items"]["product_id"]).tolist() == list(
+        items["product_id"]
+    )
+
+
+def test_compact_frame_categoricals_and_downcasts():
+    """Test the dtypes chosen for low-cardinality strings, integers and floats."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "order_status": rng.choice(["delivered", "shipped", "canceled"], 1_000),
+            "review_comment_message": [f"comment {i}" for i in range(1_000)],
+            "payment_installments": rng.integers(1, 24, 1_000).astype(np.int64),
+            "zip_code_prefix": pd.array(rng.integers(1_000, 99_999, 1_000), dtype="Int64"),
+            "payment_value": rng.integers(1, 100_000, 1_000) / 4,
+            "price": rng.random(1_000),
+        }
+    )
+    df.loc[3, "zip_code_prefix"] = pd.NA
+
+    compacted = compact_frame(df)
+
+    assert isinstance(compacted["order_status"].dtype, pd.CategoricalDtype)
+    assert compacted["review_comment_message"].dtype == object
+    assert compacted["payment_installments"].dtype == np.int8
+    assert compacted["zip_code_prefix"].dtype == "Int32"
+    # Quarters are exact in float32; arbitrary doubles are not and keep float64
+    assert compacted["payment_value"].dtype == np.float32
+    assert compacted["price"].dtype == np.float64
+    pd.testing.assert_frame_equal(compacted.astype(df.dtypes.to_dict()), df)
+
+
+def test_compaction_report_measures_bytes_saved():
+    """Test the report, with the key dictionary shared by two tables counted once."""
+    rng = np.random.default_rng(2)
+    order_ids = _hex_ids(2_000, seed=3)
+    orders = pd.DataFrame({"order_id": order_ids})
+    items = pd.DataFrame(
+        {
+            "order_id": rng.choice(order_ids, 20_000),
+            "order_status": rng.choice(["delivered", "shipped", "canceled"], 20_000),
+        }
+    )
+
+    _, report, keys = compact_frames({"olist_orders": orders, "olist_order_items": items})
+
+    report = report.set_index("table")
+    assert report["rows"].tolist() == [2_000, 20_000]
+    assert (report["bytes_saved"] == report["bytes_before"] - report["bytes_after"]).all()
+    # olist_orders holds the dictionary of its unique IDs; olist_order_items only the codes
+    assert report.loc["olist_orders", "ratio"] < 1.5
+    assert report.loc["olist_order_items", "ratio"] > 5
+    assert len(keys) == 2_000
+
+
+def test_compacted_extract_gives_the_same_query_results(tmp_path):
+    """Test that loading extract(compact=True) stores the same IDs and query results."""
+    csv_folder = str(tmp_path / "dataset")
+    generate_dataset(csv_folder, 300, seed=7)
+    expected_engine = create_engine("sqlite://")
+    csv_table_mapping = get_csv_to_table_mapping()
+    load(extract(csv_folder, csv_table_mapping, PUBLIC_HOLIDAYS_FIXTURES_URL), expected_engine)
+    compact_engine = create_engine("sqlite://")
+    tables = extract(csv_folder, csv_table_mapping, PUBLIC_HOLIDAYS_FIXTURES_URL, compact=True)
+    assert isinstance(tables["olist_order_items"]["order_id"].dtype, pd.CategoricalDtype)
+    load(tables, compact_engine, mode="incremental")
+
+    expected = run_queries(expected_engine)
+    for query_name, df in run_queries(compact_engine).items():
+        assert_frame_equal(df, expected[query_name])
+
+
+def test_incremental_load_rejects_surrogate_keys():
+    """Test that integer surrogate keys, which change between runs, cannot be upserted."""
+    orders = pd.DataFrame({"order_id": _hex_ids(3, seed=4)})
+    compacted, _, _ = compact_frames({"olist_orders": orders})
+
+    with pytest.raises(ValueError):
+        load(compacted, create_engine("sqlite://"), mode="incremental")
@@ -0,0 +1,60 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from src.downsample import lttb, reservoir_sample
+from src.plots import plot_freight_value_weight_relationship, plot_order_amount_per_day_with_holidays
+
+
+def test_reservoir_sample_is_bounded_and_chunk_independent():
+    """Test that sampling a DataFrame or its chunks keeps the same n rows in order."""
+    df = pd.DataFrame({"value": np.arange(10_000)})
+
+    sample = reservoir_sample(df, 500, seed=3)
+    chunked = reservoir_sample((df.iloc[i : i + 700] for i in range(0, len(df), 700)), 500, seed=3)
+
+    assert len(sample) == 500 and sample["value"].is_monotonic_increasing
+    assert sample["value"].tolist() == chunked["value"].tolist()
+    assert len(reservoir_sample(df.head(10), 500)) == 10
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """Test that LTTB keeps the first and last points and an isolated spike."""
+    y = np.zeros(10_000)
+    y[4321] = 100
+    x = pd.date_range("2017-01-01", periods=len(y), freq="h").values
+
+    kept = lttb(x, y, 200)
+
+    assert len(kept) == 200 and kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert 4321 in kept
+
+
+def test_large_plot_inputs_are_aggregated():
+    """Test that large inputs are binned or downsampled and holidays are one collection."""
+    rng = np.random.default_rng(0)
+    freight = pd.DataFrame(
+        {"product_weight_g": rng.lognormal(7, 1, 50_000), "freight_value": rng.lognormal(3, 0.5, 50_000)}
+    )
+    fig = plot_freight_value_weight_relationship(freight, show=False, max_points=1_000)
+    # A hexbin is a single collection instead of one marker per order
+    assert len(fig.axes[0].collections) == 1
+    plt.close(fig)
+
+    days = pd.DataFrame(
+        {
+            "date": pd.date_range("2017-01-01", periods=20_000, freq="h"),
+            "order_count": rng.integers(0, 300, 20_000),
+            "holiday": np.arange(20_000) % 1_000 == 0,
+        }
+    )
+    fig = plot_order_amount_per_day_with_holidays(days, show=False, max_points=500)
+    ax = fig.axes[0]
+    assert len(ax.lines[0].get_xdata()) == 500
+    assert len(ax.collections) == 1 and len(ax.collections[0].get_segments()) == 20
+    plt.close(fig)
@@ -1,5 +1,22 @@
-from src.config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, get_csv_to_table_mapping
-from src.extract import extract, get_public_holidays
+from pandas.testing import assert_frame_equal
+from sqlalchemy import create_engine
+
+from src.config import (
+    DATASET_ROOT_PATH,
+    PUBLIC_HOLIDAYS_FIXTURES_URL,
+    PUBLIC_HOLIDAYS_URL,
+    get_csv_to_table_mapping,
+)
+from src.extract import (
+    extract,
+    extract_stream,
+    get_public_holidays,
+    get_public_holidays_for_years,
+    read_table_csv,
+)
+from src.load import load, load_stream
+from src.synthetic import generate_dataset
+from src.transform import run_queries
 
 
 def test_get_public_holidays():
@@ -17,7 +34,8 @@ def test_extract():
     public_holidays_url = PUBLIC_HOLIDAYS_URL
     dataframes = extract(csv_folder, csv_table_mapping, public_holidays_url)
     assert len(dataframes) == len(csv_table_mapping) + 1
-    assert dataframes["public_holidays"].shape == (14, 7)
+    # Holidays are fetched for every purchase year found in olist_orders (2016-2018)
+    assert dataframes["public_holidays"].shape == (42, 7)
     assert dataframes["olist_customers"].shape == (99441, 5)
     assert dataframes["olist_geolocation"].shape == (1000163, 5)
     assert dataframes["olist_order_items"].shape == (112650, 7)
@@ -27,3 +45,66 @@ def test_extract():
     assert dataframes["olist_products"].shape == (32951, 9)
     assert dataframes["olist_sellers"].shape == (3095, 4)
     assert dataframes["product_category_name_translation"].shape == (71, 2)
+
+
+def test_read_table_csv():
+    """Test that read_table_csv applies the registered schema."""
+    for engine in ("c", "pyarrow"):
+        products = read_table_csv(
+            f"{DATASET_ROOT_PATH}/olist_products_dataset.csv", "olist_products", engine
+        )
+        assert products.shape == (32951, 9)
+        assert products["product_category_name"].dtype == "category"
+        assert products["product_weight_g"].dtype == "float64"
+        assert products["product_height_cm"].dtype == "float32"
+
+        sellers = read_table_csv(
+            f"{DATASET_ROOT_PATH}/olist_sellers_dataset.csv", "olist_sellers", engine
+        )
+        assert sellers.shape == (3095, 4)
+        assert sellers["seller_zip_code_prefix"].dtype == "int32"
+        assert sellers["seller_state"].dtype == "category"
+
+
+def test_get_public_holidays_for_years():
+    """Test that several years are fetched and concatenated in year order."""
+    public_holidays = get_public_holidays_for_years(PUBLIC_HOLIDAYS_URL, ["2018", "2016", "2017"])
+    assert public_holidays.shape == (42, 7)
+    assert public_holidays["date"].is_monotonic_increasing
+    assert sorted(public_holidays["date"].dt.year.unique()) == [2016, 2017, 2018]
+
+
+def test_extract_stream_and_load_stream_match_extract_and_load(tmp_path):
+    """Test that a chunked extract and load stores the same tables and query results."""
+    csv_folder = str(tmp_path / "dataset")
+    generate_dataset(csv_folder, 300, seed=11)
+    csv_table_mapping = get_csv_to_table_mapping()
+
+    chunks = list(
+        extract_stream(csv_folder, csv_table_mapping, PUBLIC_HOLIDAYS_FIXTURES_URL, chunksize=37)
+    )
+    # Categoricals are built per chunk, so the chunks of a table have different categories
+    order_statuses = [
+        tuple(chunk["order_status"].cat.categories)
+        for table_name, chunk in chunks
+        if table_name == "olist_orders"
+    ]
+    assert len(order_statuses) > 1 and len(set(order_statuses)) > 1
+
+    streamed = create_engine(f"sqlite:///{tmp_path / 'streamed.db'}")
+    load_stream(iter(chunks), streamed)
+    expected = create_engine(f"sqlite:///{tmp_path / 'expected.db'}")
+    load(extract(csv_folder, csv_table_mapping, PUBLIC_HOLIDAYS_FIXTURES_URL), expected)
+
+    for table_name in list(csv_table_mapping.values()) + ["public_holidays"]:
+        # The table schema of the stream comes from its first chunk
+        schema = f'PRAGMA table_info("{table_name}")'
+        assert streamed.execute(schema).fetchall() == expected.execute(schema).fetchall()
+        rows = f'SELECT * FROM "{table_name}"'
+        assert sorted(streamed.execute(rows).fetchall(), key=repr) == sorted(
+            expected.execute(rows).fetchall(), key=repr
+        )
+
+    expected_results = run_queries(expected, max_workers=1)
+    for query_name, df in run_queries(streamed, max_workers=1).items():
+        assert_frame_equal(df, expected_results[query_name])
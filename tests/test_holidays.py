@@ -0,0 +1,65 @@
+import json
+import os
+import time
+
+from src.config import PUBLIC_HOLIDAYS_FIXTURES_URL
+from src.holidays import HOLIDAY_COLUMNS, HolidaysProvider
+
+# Nothing listens on the discard port, so every request fails immediately
+UNREACHABLE_URL = "http://127.0.0.1:9/api/v3/publicholidays"
+
+HOLIDAY = {
+    "date": "2017-01-01",
+    "localName": "Confraternização Universal",
+    "name": "New Year's Day",
+    "countryCode": "BR",
+    "fixed": False,
+    "global": True,
+    "counties": None,
+    "launchYear": None,
+    "types": ["Public"],
+}
+
+
+def test_fresh_cache_is_used_without_network(tmp_path):
+    """Test that a cached response within the TTL is returned without a request."""
+    (tmp_path / "BR_2017.json").write_text(json.dumps([HOLIDAY]))
+    provider = HolidaysProvider(UNREACHABLE_URL, cache_path=str(tmp_path), retries=0)
+
+    public_holidays = provider.fetch("2017")
+    assert public_holidays.shape == (1, 7)
+    assert public_holidays["date"].dtype == "datetime64[ns]"
+
+
+def test_stale_cache_is_used_when_request_fails(tmp_path):
+    """Test that an expired cache entry is the fallback when the API is unreachable."""
+    cache_file = tmp_path / "BR_2017.json"
+    cache_file.write_text(json.dumps([HOLIDAY]))
+    expired = time.time() - 3600
+    os.utime(cache_file, (expired, expired))
+    provider = HolidaysProvider(
+        UNREACHABLE_URL, cache_path=str(tmp_path), ttl_seconds=60, retries=0
+    )
+
+    assert provider.fetch("2017").shape == (1, 7)
+    assert provider.fetch_raw("2017") == [HOLIDAY]
+
+
+def test_empty_response_gives_an_empty_frame():
+    """Test that a year without holidays gives an empty frame with the usual columns."""
+    public_holidays = HolidaysProvider.to_dataframe([])
+
+    assert public_holidays.empty
+    assert list(public_holidays.columns) == HOLIDAY_COLUMNS
+    assert public_holidays["date"].dtype == "datetime64[ns]"
+
+
+def test_offline_years_without_fixture_are_skipped(tmp_path):
+    """Test that offline, a year missing from the fixtures is skipped instead of failing."""
+    provider = HolidaysProvider(PUBLIC_HOLIDAYS_FIXTURES_URL, cache_path=str(tmp_path))
+
+    public_holidays = provider.fetch_many(["2017", "2031"])
+
+    assert not public_holidays.empty
+    assert set(public_holidays["date"].dt.year) == {2017}
+    assert provider.fetch_many(["2031"]).empty
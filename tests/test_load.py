@@ -0,0 +1,293 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src.indexes import create_indexes
+from src.load import LOAD_METADATA_TABLE, add_timestamp_columns, load
+
+
+def orders_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "order_id": ["a", "b", "c"],
+            "customer_id": ["x", "y", "z"],
+            "order_status": pd.Categorical(["delivered", "shipped", "delivered"]),
+            "order_purchase_timestamp": pd.to_datetime(
+                ["2017-01-01 10:00:00", "2017-01-02 11:00:00", "2017-01-03 12:00:00"]
+            ),
+            "order_delivered_customer_date": pd.to_datetime(
+                ["2017-01-05 10:00:00", None, "2017-01-09 08:30:00"]
+            ),
+        }
+    )
+
+
+def test_bulk_load_matches_replace():
+    """Test that the bulk mode stores the same rows as the replace mode."""
+    replace_engine = create_engine("sqlite://")
+    bulk_engine = create_engine("sqlite://")
+    load({"olist_orders": orders_frame()}, replace_engine)
+    load({"olist_orders": orders_frame()}, bulk_engine, mode="bulk", batch_size=2)
+
+    query = "SELECT * FROM olist_orders ORDER BY order_id"
+    assert (
+        replace_engine.execute(query).fetchall() == bulk_engine.execute(query).fetchall()
+    )
+
+
+@pytest.mark.parametrize("journal_mode", ["WAL", "DELETE", "MEMORY"])
+def test_bulk_load_is_atomic(tmp_path, journal_mode):
+    """Test that when one table fails in the bulk mode, no table of the load is saved."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'olist.db'}")
+    load({"olist_orders": orders_frame()}, engine, mode="bulk")
+
+    changed = orders_frame().head(1)
+    broken = pd.DataFrame({"order_id": ["a"], "payment_value": [{"not": "bindable"}]})
+    load(
+        {"olist_orders": changed, "olist_order_payments": broken},
+        engine,
+        mode="bulk",
+        journal_mode=journal_mode,
+    )
+
+    assert engine.execute("SELECT COUNT(*) FROM olist_orders").scalar() == 3
+    assert not engine.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'olist_order_payments'"
+    ).fetchone()
+
+
+def test_load_rejects_unsafe_journal_mode():
+    """Test that journal_mode=OFF, which cannot roll back, and unknown modes are rejected."""
+    for journal_mode in ("OFF", "WAL; DROP TABLE olist_orders"):
+        with pytest.raises(ValueError):
+            load(
+                {"olist_orders": orders_frame()},
+                create_engine("sqlite://"),
+                mode="bulk",
+                journal_mode=journal_mode,
+            )
+
+
+def test_incremental_load_upserts_changed_rows():
+    """Test that the incremental mode upserts on the primary key and tracks the watermark."""
+    engine = create_engine("sqlite://")
+    orders = orders_frame()
+    load({"olist_orders": orders}, engine, mode="incremental")
+
+    orders["order_status"] = orders["order_status"].astype(str)
+    orders.loc[2, "order_status"] = "canceled"
+    new_order = pd.DataFrame(
+        {
+            "order_id": ["d"],
+            "customer_id": ["w"],
+            "order_status": ["delivered"],
+            "order_purchase_timestamp": pd.to_datetime(["2017-02-01 09:00:00"]),
+            "order_delivered_customer_date": pd.to_datetime([None]),
+        }
+    )
+    load({"olist_orders": pd.concat([orders, new_order], ignore_index=True)}, engine, mode="incremental")
+
+    rows = engine.execute(
+        "SELECT order_id, order_status FROM olist_orders ORDER BY order_id"
+    ).fetchall()
+    assert rows == [("a", "delivered"), ("b", "shipped"), ("c", "canceled"), ("d", "delivered")]
+
+    metadata = engine.execute(
+        f"SELECT high_water_mark, row_count FROM {LOAD_METADATA_TABLE} WHERE table_name = 'olist_orders'"
+    ).fetchone()
+    assert tuple(metadata) == ("2017-02-01 09:00:00", 4)
+
+
+def test_incremental_load_updates_older_rows_and_deletes_missing_ones():
+    """Test that a changed row below the watermark is upserted and removed rows are deleted."""
+    engine = create_engine("sqlite://")
+    frames = summary_source_frames()
+    load(frames, engine, mode="incremental")
+
+    # "a" is the oldest order: its update must not be filtered out by the watermark
+    frames["olist_orders"].loc[0, "order_status"] = "canceled"
+    frames["olist_order_payments"] = frames["olist_order_payments"].drop(index=1)
+    load(frames, engine, mode="incremental")
+    # A later load with nothing changed keeps the update
+    load(frames, engine, mode="incremental")
+
+    rows = engine.execute(
+        "SELECT order_id, order_status FROM olist_orders ORDER BY order_id"
+    ).fetchall()
+    assert rows == [("a", "canceled"), ("b", "shipped"), ("c", "delivered")]
+    payments = engine.execute(
+        "SELECT order_id, payment_sequential FROM olist_order_payments ORDER BY 1, 2"
+    ).fetchall()
+    assert payments == [("a", 1), ("b", 1), ("c", 1)]
+
+    expected_engine = create_engine("sqlite://")
+    load(frames, expected_engine)
+    for summary in ("summary_orders", "summary_daily_orders", "summary_category_revenue"):
+        query = f"SELECT * FROM {summary} ORDER BY 1, 2"
+        assert engine.execute(query).fetchall() == expected_engine.execute(query).fetchall()
+
+
+def test_incremental_load_keeps_the_last_row_of_duplicate_keys():
+    """Test that repeated primary keys upsert their last row on every incremental load."""
+    engine = create_engine("sqlite://")
+    orders = orders_frame()
+    orders["order_status"] = orders["order_status"].astype(str)
+    orders.loc[1, "order_id"] = "a"
+    load({"olist_orders": orders}, engine, mode="incremental")
+
+    orders.loc[2, "order_status"] = "canceled"
+    load({"olist_orders": orders}, engine, mode="incremental")
+
+    rows = engine.execute(
+        "SELECT order_id, order_status FROM olist_orders ORDER BY order_id"
+    ).fetchall()
+    assert rows == [("a", "shipped"), ("c", "canceled")]
+
+
+def test_load_creates_indexes_idempotently():
+    """Test that the declared indexes exist after every load mode and are not duplicated."""
+    engine = create_engine("sqlite://")
+    for mode in ("replace", "incremental", "incremental", "bulk"):
+        load({"olist_orders": orders_frame()}, engine, mode=mode)
+        names = [
+            row[0]
+            for row in engine.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%' ORDER BY name"
+            )
+        ]
+        assert names == [
+            "ix_olist_orders_customer_id",
+            "ix_olist_orders_delivered",
+            "ix_olist_orders_order_id",
+        ]
+
+
+def test_create_indexes_keeps_unmanaged_indexes():
+    """Test that only indexes named "ix_..." are managed, not any name starting with "ix"."""
+    engine = create_engine("sqlite://")
+    load({"olist_orders": orders_frame()}, engine)
+    engine.execute("CREATE INDEX ixa_orders_status ON olist_orders (order_status)")
+
+    create_indexes(engine)
+
+    assert engine.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'ixa_orders_status'"
+    ).fetchone()
+
+
+def test_load_stores_timestamp_columns():
+    """Test that every datetime column is stored with its epoch and year/month/day columns."""
+    engine = create_engine("sqlite://")
+    load({"olist_orders": orders_frame()}, engine, mode="bulk", julian_days=True)
+
+    rows = engine.execute(
+        """
+        SELECT
+            order_delivered_customer_date_epoch,
+            order_delivered_customer_date_year,
+            order_delivered_customer_date_month,
+            order_delivered_customer_date_day,
+            order_delivered_customer_date_julian - julianday(order_delivered_customer_date)
+        FROM olist_orders
+        ORDER BY order_id
+        """
+    ).fetchall()
+    assert rows[0] == (1483610400, 2017, 1, 5, 0.0)
+    assert rows[1] == (None, None, None, None, None)
+
+    assert add_timestamp_columns(orders_frame()).shape[1] == 5 + 2 * 4
+
+
+def test_load_derives_only_declared_timestamp_columns():
+    """Test that other datetime columns get derived columns only when they are requested."""
+    items = pd.DataFrame(
+        {
+            "order_id": ["a"],
+            "order_item_id": [1],
+            "shipping_limit_date": pd.to_datetime(["2017-01-02 10:00:00"]),
+        }
+    )
+    engine = create_engine("sqlite://")
+    load({"olist_order_items": items}, engine, summaries=False)
+    columns = [row[1] for row in engine.execute("PRAGMA table_info(olist_order_items)")]
+    assert columns == ["order_id", "order_item_id", "shipping_limit_date"]
+
+    load(
+        {"olist_order_items": items},
+        engine,
+        summaries=False,
+        timestamp_columns={"olist_order_items": ["shipping_limit_date"]},
+    )
+    assert engine.execute("SELECT shipping_limit_date_year FROM olist_order_items").scalar() == 2017
+
+
+def summary_source_frames() -> dict:
+    orders = orders_frame()
+    orders["order_status"] = orders["order_status"].astype(str)
+    orders["order_estimated_delivery_date"] = pd.to_datetime(
+        ["2017-01-10", "2017-01-12", "2017-01-08"]
+    )
+    return {
+        "olist_orders": orders,
+        "olist_order_payments": pd.DataFrame(
+            {
+                "order_id": ["a", "a", "b", "c"],
+                "payment_sequential": [1, 2, 1, 1],
+                "payment_value": [10.0, 5.0, 7.5, 20.0],
+            }
+        ),
+        "olist_customers": pd.DataFrame(
+            {"customer_id": ["x", "y", "z"], "customer_state": ["SP", "RJ", "MG"]}
+        ),
+        "olist_order_items": pd.DataFrame(
+            {
+                "order_id": ["a", "a", "a", "c"],
+                "order_item_id": [1, 2, 3, 1],
+                "product_id": ["p1", "p1", "p2", "p1"],
+                "price": [10.0, 10.0, 30.0, 40.0],
+            }
+        ),
+        "olist_products": pd.DataFrame(
+            {"product_id": ["p1", "p2"], "product_category_name": ["beleza", "moveis"]}
+        ),
+        "product_category_name_translation": pd.DataFrame(
+            {
+                "product_category_name": ["beleza", "moveis"],
+                "product_category_name_english": ["health_beauty", "furniture"],
+            }
+        ),
+    }
+
+
+def test_incremental_load_refreshes_summaries():
+    """Test that refreshing the summary tables incrementally matches a full rebuild."""
+    engine = create_engine("sqlite://")
+    frames = summary_source_frames()
+    load(frames, engine, mode="incremental")
+
+    frames["olist_order_payments"].loc[3, "payment_value"] = 25.0
+    frames["olist_customers"].loc[2, "customer_state"] = "BA"
+    new_order = frames["olist_orders"].tail(1).copy()
+    new_order["order_id"] = "d"
+    new_order["order_purchase_timestamp"] = pd.Timestamp("2017-02-01 09:00:00")
+    frames["olist_orders"] = pd.concat([frames["olist_orders"], new_order], ignore_index=True)
+    frames["olist_products"].loc[1, "product_category_name"] = "beleza"
+    frames["olist_order_items"].loc[3, "price"] = 55.0
+    load(frames, engine, mode="incremental")
+
+    expected_engine = create_engine("sqlite://")
+    load(frames, expected_engine)
+
+    for summary in (
+        "summary_orders",
+        "summary_daily_orders",
+        "summary_order_categories",
+        "summary_category_revenue",
+    ):
+        query = f"SELECT * FROM {summary} ORDER BY 1, 2"
+        assert engine.execute(query).fetchall() == expected_engine.execute(query).fetchall()
+
+    row = engine.execute(
+        "SELECT customer_state, payment_total, payment_value FROM summary_orders WHERE order_id = 'c'"
+    ).fetchone()
+    assert tuple(row) == ("BA", 25.0, 25.0)
@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from pandas.testing import assert_frame_equal
+from sqlalchemy import create_engine
+
+from src import pipeline
+from src.artifacts import ArtifactStore
+from src.cache import QueryResultCache
+from src.config import (
+    PUBLIC_HOLIDAYS_FIXTURES_URL,
+    get_csv_to_table_mapping,
+    get_query_tables,
+    get_summary_tables,
+)
+from src.extract import extract
+from src.load import load
+from src.synthetic import generate_dataset
+from src.transform import run_queries
+
+
+def test_table_and_query_tasks_match_the_monolithic_pipeline(tmp_path, monkeypatch):
+    """Test that running the DAG tasks one by one gives the results of extract, load and run_queries."""
+    monkeypatch.setattr(
+        pipeline, "ArtifactStore", lambda run_id: ArtifactStore(run_id, str(tmp_path / "artifacts"))
+    )
+    csv_folder, database_path = str(tmp_path / "dataset"), str(tmp_path / "olist.db")
+    generate_dataset(csv_folder, 400, seed=3)
+
+    for csv_file, table_name in get_csv_to_table_mapping().items():
+        assert pipeline.extract_load_table(table_name, csv_file, csv_folder, database_path)["rows"] > 0
+    pipeline.extract_load_holidays(PUBLIC_HOLIDAYS_FIXTURES_URL, database_path)
+    for summary_name in get_summary_tables():
+        pipeline.refresh_summary(summary_name, database_path)
+    cache_path = str(tmp_path / "cache")
+    manifest = {
+        query_name: pipeline.run_query(query_name, "test_run", database_path, cache_path)
+        for query_name in get_query_tables()
+    }
+
+    expected_engine = create_engine(f"sqlite:///{tmp_path / 'expected.db'}")
+    load(extract(csv_folder, get_csv_to_table_mapping(), PUBLIC_HOLIDAYS_FIXTURES_URL), expected_engine)
+    expected = run_queries(expected_engine, max_workers=1)
+
+    results = ArtifactStore.get_many(manifest)
+    assert set(results) == set(expected)
+    for query_name, df in expected.items():
+        assert_frame_equal(results[query_name], df, check_dtype=False)
+
+
+def test_daily_run_without_new_data_is_served_from_the_cache(tmp_path, monkeypatch):
+    """Test that rerunning the table, summary and query tasks on unchanged CSVs runs no query."""
+    monkeypatch.setattr(
+        pipeline, "ArtifactStore", lambda run_id: ArtifactStore(run_id, str(tmp_path / "artifacts"))
+    )
+    csv_folder, database_path = str(tmp_path / "dataset"), str(tmp_path / "olist.db")
+    cache_path = str(tmp_path / "cache")
+    generate_dataset(csv_folder, 200, seed=4)
+
+    def daily_run(run_id):
+        for csv_file, table_name in get_csv_to_table_mapping().items():
+            pipeline.extract_load_table(table_name, csv_file, csv_folder, database_path)
+        pipeline.extract_load_holidays(PUBLIC_HOLIDAYS_FIXTURES_URL, database_path)
+        for summary_name in get_summary_tables():
+            pipeline.refresh_summary(summary_name, database_path)
+        return {
+            query_name: pipeline.run_query(query_name, run_id, database_path, cache_path)
+            for query_name in get_query_tables()
+        }
+
+    first = ArtifactStore.get_many(daily_run("day_1"))
+    # A query that is executed stores its result in the cache
+    stored = []
+    monkeypatch.setattr(QueryResultCache, "put", lambda self, key, query_name, *args: stored.append(query_name))
+    second = ArtifactStore.get_many(daily_run("day_2"))
+
+    assert stored == []
+    for query_name, df in first.items():
+        assert_frame_equal(second[query_name], df)
+
+
+def test_failed_table_task_raises(tmp_path):
+    """Test that a table task fails (so Airflow retries it) when its CSV cannot be read."""
+    with pytest.raises(Exception):
+        pipeline.extract_load_table(
+            "olist_orders", "missing.csv", str(tmp_path), os.path.join(tmp_path, "olist.db")
+        )
+
+
+def test_importing_src_facade_is_lightweight():
+    """Test that the DAG-time imports (src and src.config) load no pandas, SQLAlchemy or plotting."""
+    code = (
+        "import sys, src\n"
+        "from src.config import get_csv_to_table_mapping, get_query_tables, get_summary_tables\n"
+        "heavy = {'pandas', 'sqlalchemy', 'matplotlib', 'plotly', 'pyarrow'} & set(sys.modules)\n"
+        "assert not heavy, heavy\n"
+        "assert src.run_query.__module__ == 'src.pipeline'\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.render import CHARTS, render_plots
+
+
+def status_and_delivery_results() -> dict:
+    return {
+        "global_ammount_order_status": pd.DataFrame(
+            {"order_status": ["delivered", "shipped", "canceled"], "Ammount": [90, 7, 3]}
+        ),
+        "delivery_date_difference": pd.DataFrame(
+            {"State": ["SP", "RJ", "MG"], "Delivery_Difference": [10, 12, 11]}
+        ),
+    }
+
+
+def test_render_plots_skips_unchanged_inputs(tmp_path):
+    """Test that charts are written, skipped while their input is unchanged and redrawn after."""
+    results = status_and_delivery_results()
+
+    first = render_plots(results, str(tmp_path), formats=("png", "svg", "html"), max_workers=0)
+    assert set(first) == {"global_amount_order_status", "delivery_date_difference"}
+    for report in first.values():
+        assert not report["skipped"]
+        assert sorted(os.path.splitext(path)[1] for path in report["files"]) == [".html", ".png", ".svg"]
+        assert all(os.path.getsize(path) > 0 for path in report["files"])
+
+    second = render_plots(results, str(tmp_path), formats=("png", "svg", "html"), max_workers=0)
+    assert all(report["skipped"] for report in second.values())
+
+    results["delivery_date_difference"].loc[0, "Delivery_Difference"] = 20
+    third = render_plots(results, str(tmp_path), formats=("png", "svg", "html"), max_workers=0)
+    assert third["global_amount_order_status"]["skipped"]
+    assert not third["delivery_date_difference"]["skipped"]
+
+
+def test_render_plots_in_worker_processes(tmp_path):
+    """Test that the process pool writes the charts and leaves no figure open in the caller."""
+    import matplotlib.pyplot as plt
+
+    report = render_plots(status_and_delivery_results(), str(tmp_path), formats=("png",), max_workers=2)
+
+    assert [os.path.basename(path) for path in report["delivery_date_difference"]["files"]] == [
+        "delivery_date_difference.png"
+    ]
+    assert plt.get_fignums() == []
+
+
+def test_render_plots_keeps_manifest_of_rendered_charts_on_failure(tmp_path):
+    """Test that a failing chart raises without discarding the manifest of the others."""
+    results = status_and_delivery_results()
+    results["delivery_date_difference"] = pd.DataFrame({"unexpected": [1, 2]})
+
+    with pytest.raises(ValueError):
+        render_plots(results, str(tmp_path), formats=("png",), max_workers=0)
+
+    results["delivery_date_difference"] = status_and_delivery_results()["delivery_date_difference"]
+    report = render_plots(results, str(tmp_path), formats=("png",), max_workers=0)
+    assert report["global_amount_order_status"]["skipped"]
+    assert not report["delivery_date_difference"]["skipped"]
+
+
+def test_chart_kwargs_default_is_read_only():
+    """Test that charts without arguments do not share a mutable kwargs dictionary."""
+    with pytest.raises(TypeError):
+        CHARTS["global_amount_order_status"].kwargs["year"] = 2018
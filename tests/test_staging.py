@@ -0,0 +1,55 @@
+import pandas as pd
+
+from src.staging import read_staged_table, stage
+
+ORDERS_CSV = "olist_orders_dataset.csv"
+
+
+def write_orders_csv(folder, statuses):
+    pd.DataFrame(
+        {
+            "order_id": ["a", "b", "c"],
+            "customer_id": ["x", "y", "z"],
+            "order_status": statuses,
+            "order_purchase_timestamp": ["2017-01-01 10:00:00", "2017-02-02 11:00:00", "2018-01-03 12:00:00"],
+            "order_approved_at": [None, None, None],
+            "order_delivered_carrier_date": [None, None, None],
+            "order_delivered_customer_date": ["2017-01-05 10:00:00", None, None],
+            "order_estimated_delivery_date": ["2017-01-10", "2017-02-12", "2018-01-08"],
+        }
+    ).to_csv(folder / ORDERS_CSV, index=False)
+
+
+def test_stage_converts_only_changed_csv(tmp_path):
+    """Test that a CSV is converted again only when its content changes."""
+    staging_folder = str(tmp_path / "staging")
+    mapping = {ORDERS_CSV: "olist_orders"}
+    write_orders_csv(tmp_path, ["delivered", "shipped", "delivered"])
+
+    assert stage(str(tmp_path), mapping, staging_folder) == ["olist_orders"]
+    assert stage(str(tmp_path), mapping, staging_folder) == []
+    assert (tmp_path / "staging" / "olist_orders" / "purchase_year=2018").is_dir()
+
+    write_orders_csv(tmp_path, ["delivered", "shipped", "canceled"])
+    assert stage(str(tmp_path), mapping, staging_folder) == ["olist_orders"]
+    orders = read_staged_table("olist_orders", staging_folder).sort_values("order_id")
+    assert orders["order_status"].tolist() == ["delivered", "shipped", "canceled"]
+    assert "purchase_year" not in orders.columns
+
+
+def test_read_staged_table_prunes_columns_and_partitions(tmp_path):
+    """Test that only the requested columns and partitions are read."""
+    staging_folder = str(tmp_path / "staging")
+    write_orders_csv(tmp_path, ["delivered", "shipped", "delivered"])
+    stage(str(tmp_path), {ORDERS_CSV: "olist_orders"}, staging_folder)
+
+    orders = read_staged_table(
+        "olist_orders",
+        staging_folder,
+        columns=["order_id", "order_purchase_timestamp"],
+        filters=[("purchase_year", "=", 2017), ("purchase_month", "=", 2)],
+    )
+
+    assert list(orders.columns) == ["order_id", "order_purchase_timestamp"]
+    assert orders["order_id"].tolist() == ["b"]
+    assert orders["order_purchase_timestamp"].dtype == "datetime64[ns]"
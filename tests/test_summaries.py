@@ -0,0 +1,93 @@
+import math
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src import summaries
+from src.load import load, refresh_summary_tables
+from src.transform import pivot_years, query_revenue_categories
+from tests.test_load import summary_source_frames
+
+
+def test_category_revenue_is_allocated_by_item_price():
+    """Test that category revenue splits each order's payments by the price of its items."""
+    engine = create_engine("sqlite://")
+    load(summary_source_frames(), engine)
+
+    # Order "a" pays 15.0 for two health_beauty items (20.0) and one furniture item
+    # (30.0), order "c" pays 20.0 for one health_beauty item.
+    top = query_revenue_categories(engine, 10)
+    assert top.query == "top_10_categories_by_revenue"
+    assert top.result["Category"].tolist() == ["health_beauty", "furniture"]
+    assert top.result["Num_order"].tolist() == [2, 1]
+    assert top.result["Revenue"].tolist() == pytest.approx([26.0, 9.0])
+    assert top.result["Revenue"].sum() == pytest.approx(15.0 + 20.0)
+
+    per_item = query_revenue_categories(engine, 10, allocated=False)
+    assert per_item.query == "top_10_categories_by_item_revenue"
+    assert per_item.result["Revenue"].tolist() == [50.0, 15.0]
+
+    bottom = query_revenue_categories(engine, 1, ascending=True)
+    assert bottom.query == "bottom_1_categories_by_revenue"
+    assert bottom.result["Category"].tolist() == ["furniture"]
+
+
+def test_pivot_years_adds_a_column_per_year_present():
+    """Test that the year pivot adds the years of the data to the historical ones."""
+    long = pd.DataFrame(
+        {
+            "year": [2018, 2019, 2019],
+            "month": [1, 1, 3],
+            "real_time": [10.0, 8.0, 6.0],
+            "estimated_time": [20.0, 18.0, 16.0],
+        }
+    )
+    wide = pivot_years(long, {"real_time": "_real_time", "estimated_time": "_estimated_time"})
+    assert list(wide.columns) == [
+        "month_no",
+        "month",
+        "Year2016_real_time",
+        "Year2017_real_time",
+        "Year2018_real_time",
+        "Year2019_real_time",
+        "Year2016_estimated_time",
+        "Year2017_estimated_time",
+        "Year2018_estimated_time",
+        "Year2019_estimated_time",
+    ]
+    assert wide["month_no"].tolist()[:3] == ["01", "02", "03"]
+    assert wide["Year2019_real_time"].tolist()[:3][::2] == [8.0, 6.0]
+    assert math.isnan(wide.loc[1, "Year2019_real_time"])
+
+    revenue = pivot_years(long.rename(columns={"real_time": "Revenue"}), {"Revenue": ""}, 0)
+    assert revenue["Year2019"].sum() == 14.0
+
+
+def test_pivot_years_keeps_historical_years_without_data():
+    """Test that empty input still has the Year2016..Year2018 columns, filled."""
+    long = pd.DataFrame(
+        {
+            "year": pd.Series(dtype=int),
+            "month": pd.Series(dtype=int),
+            "Revenue": pd.Series(dtype=float),
+        }
+    )
+
+    revenue = pivot_years(long, {"Revenue": ""}, fill_value=0)
+
+    assert list(revenue.columns) == ["month_no", "month", "Year2016", "Year2017", "Year2018"]
+    assert revenue["Year2017"].tolist() == [0] * 12
+
+
+def test_failed_summary_rebuild_keeps_the_previous_table(tmp_path, monkeypatch):
+    """Test that a rebuild whose query fails rolls back the DROP of the summary table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'olist.db'}")
+    load(summary_source_frames(), engine)
+    rows = engine.execute("SELECT COUNT(*) FROM summary_orders").scalar()
+
+    monkeypatch.setattr(summaries, "read_summary_query", lambda name: "SELECT * FROM missing_table")
+    with pytest.raises(Exception):
+        refresh_summary_tables(engine, ["summary_orders"])
+
+    assert engine.execute("SELECT COUNT(*) FROM summary_orders").scalar() == rows
@@ -0,0 +1,46 @@
+from src.config import get_csv_to_table_mapping
+from src.extract import read_table_csv
+from src.synthetic import generate_dataset
+
+
+def read_dataset(folder) -> dict:
+    return {
+        table_name: read_table_csv(str(folder / csv_file), table_name)
+        for csv_file, table_name in get_csv_to_table_mapping().items()
+    }
+
+
+def test_generate_dataset_is_seeded(tmp_path):
+    """Test that the same seed writes the same files and another seed does not."""
+    generate_dataset(str(tmp_path / "a"), 500, seed=1, chunksize=120)
+    generate_dataset(str(tmp_path / "b"), 500, seed=1, chunksize=120)
+    generate_dataset(str(tmp_path / "c"), 500, seed=2, chunksize=120)
+
+    for csv_file in get_csv_to_table_mapping():
+        assert (tmp_path / "a" / csv_file).read_bytes() == (tmp_path / "b" / csv_file).read_bytes()
+    orders = "olist_orders_dataset.csv"
+    assert (tmp_path / "a" / orders).read_bytes() != (tmp_path / "c" / orders).read_bytes()
+
+
+def test_generate_dataset_is_referentially_consistent(tmp_path):
+    """Test that every chunk references rows that exist and payments match the items."""
+    rows = generate_dataset(str(tmp_path), 1000, chunksize=300)
+    data = read_dataset(tmp_path)
+
+    assert {table_name: len(df) for table_name, df in data.items()} == rows
+    orders, items, payments = data["olist_orders"], data["olist_order_items"], data["olist_order_payments"]
+    assert len(orders) == 1000 and orders["order_id"].is_unique
+    assert orders["customer_id"].isin(data["olist_customers"]["customer_id"]).all()
+    assert items["order_id"].isin(orders["order_id"]).all()
+    assert items["product_id"].isin(data["olist_products"]["product_id"]).all()
+    assert items["seller_id"].isin(data["olist_sellers"]["seller_id"]).all()
+    assert payments["order_id"].isin(orders["order_id"]).all()
+    assert data["olist_order_reviews"]["order_id"].isin(orders["order_id"]).all()
+    assert data["olist_products"]["product_category_name"].dropna().isin(
+        data["product_category_name_translation"]["product_category_name"]
+    ).all()
+    assert not items.duplicated(["order_id", "order_item_id"]).any()
+
+    item_totals = (items["price"] + items["freight_value"]).groupby(items["order_id"]).sum()
+    payment_totals = payments.groupby("order_id")["payment_value"].sum()
+    assert (item_totals - payment_totals.reindex(item_totals.index)).abs().max() < 0.05
@@ -0,0 +1,70 @@
+import json
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.load import load
+from src import telemetry as telemetry_module
+from src.telemetry import TELEMETRY, Telemetry
+from src.transform import query_delivery_date_difference
+from tests.test_load import summary_source_frames
+
+
+def test_instrument_records_stage_metrics(tmp_path):
+    """Test that an instrumented function is logged as JSON and exported to Prometheus."""
+    log_path, prometheus_path = tmp_path / "telemetry.jsonl", tmp_path / "metrics.prom"
+    telemetry = Telemetry(log_path=str(log_path), prometheus_path=str(prometheus_path))
+
+    @telemetry.instrument()
+    def double(df: pd.DataFrame) -> pd.DataFrame:
+        return pd.concat([df, df])
+
+    double(pd.DataFrame({"a": [1, 2, 3]}))
+
+    record = json.loads(log_path.read_text().splitlines()[-1])
+    assert record["stage"] == "double"
+    assert (record["rows_in"], record["rows_out"], record["status"]) == (3, 6, "ok")
+    for metric in ("wall_seconds", "cpu_seconds", "peak_rss_delta_bytes"):
+        assert record[metric] >= 0
+    assert 'olist_stage_rows_out{stage="double"} 6' in prometheus_path.read_text()
+
+
+def test_nested_stages_share_one_memory_sampler(monkeypatch):
+    """Test that only the top-level stage starts a memory sampler thread."""
+    started = []
+    monkeypatch.setattr(
+        telemetry_module.PeakMemorySampler, "start", lambda self: started.append(self) or None
+    )
+    monkeypatch.setattr(telemetry_module.PeakMemorySampler, "stop", lambda self: 0)
+    telemetry = Telemetry(log_path=None, prometheus_path=None)
+
+    @telemetry.instrument()
+    def inner():
+        return None
+
+    @telemetry.instrument()
+    def outer():
+        inner()
+        inner()
+
+    outer()
+
+    assert len(started) == 1
+    inner_record, _, outer_record = telemetry.records
+    assert inner_record["parent_stage"] == "outer"
+    assert inner_record["peak_rss_delta_bytes"] is None
+    assert outer_record["peak_rss_delta_bytes"] == 0
+
+
+def test_query_functions_capture_query_plan(monkeypatch):
+    """Test that a query function records the SQLite EXPLAIN QUERY PLAN of its SQL on request."""
+    engine = create_engine("sqlite://")
+    load(summary_source_frames(), engine)
+    monkeypatch.setattr(TELEMETRY, "enabled", True)
+    monkeypatch.setattr(TELEMETRY, "explain", True)
+
+    query_delivery_date_difference(engine)
+
+    record = TELEMETRY.records[-1]
+    assert record["stage"] == "query_delivery_date_difference"
+    assert any("summary_orders" in step["detail"] for step in record["query_plans"][0])
@@ -1,6 +1,8 @@
 import pandas as pd
-from pytest import fixture
+from pandas.testing import assert_frame_equal
+from pytest import fixture, raises
 from src.config import QUERY_RESULTS_ROOT_PATH, DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL
+from src.config import PUBLIC_HOLIDAYS_FIXTURES_URL
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
 import json
@@ -19,7 +21,8 @@ from src.transform import (
 from src.load import load
 from src.extract import extract
 from src.config import get_csv_to_table_mapping
-from src.transform import QueryResult
+from src.transform import QueryResult, run_queries
+from src.synthetic import generate_dataset
 
 TOLERANCE = 0.1
 
@@ -206,3 +209,24 @@ def test_query_get_freight_value_weight_relationship(database: Engine):
     actual: QueryResult = query_freight_value_weight_relationship(database)
     expected = read_query_result(query_name)
     assert pandas_to_json_object(actual.result) == expected
+
+
+def test_run_queries_concurrently_matches_sequential(tmp_path):
+    """Test that threads and processes on a file database give the sequential results."""
+    csv_folder = str(tmp_path / "dataset")
+    generate_dataset(csv_folder, 300, seed=5)
+    engine = create_engine(f"sqlite:///{tmp_path / 'olist.db'}")
+    load(extract(csv_folder, get_csv_to_table_mapping(), PUBLIC_HOLIDAYS_FIXTURES_URL), engine)
+    engine.execute("PRAGMA journal_mode=DELETE")
+
+    expected = run_queries(engine, max_workers=1)
+    for use_processes in (False, True):
+        results = run_queries(engine, max_workers=4, use_processes=use_processes)
+        assert list(results) == list(expected)
+        for query_name, df in expected.items():
+            assert_frame_equal(results[query_name], df)
+
+    # Reading does not leave the database file in WAL mode
+    assert engine.execute("PRAGMA journal_mode").scalar() == "delete"
+    with raises(ValueError):
+        run_queries(engine, max_workers=0)